@@ -0,0 +1,200 @@
+"""
+Benchmark - Ejecuta juegos en lote, sin supervisión, para comparar perfiles
+"""
+import json
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from core.launch_timing import LaunchTimer
+
+
+class BatchBenchmark:
+    """
+    Lanza cada juego seleccionado con cada perfil durante un tiempo fijo y
+    recoge métricas del supervisor y la salida del emulador.
+
+    Un perfil es un dict con claves opcionales:
+        config          Sobrescribe la configuración del juego
+        launch_profile  Afinidad/prioridad/entorno (ver launch_profile.py)
+        flags           Opciones de PCSX2 ('batch', 'nogui', 'fullscreen'...)
+    """
+
+    DEFAULT_FLAGS = ['batch', 'fullscreen']
+    SAMPLE_INTERVAL = 1.0
+    MAX_OUTPUT_LINES = 200
+    EMULOG_TAIL_BYTES = 64 * 1024
+
+    def __init__(self, emulator, game_info=None, output_dir: str = None, logger=None):
+        self.emulator = emulator
+        self.game_info = game_info
+        self.output_dir = Path(output_dir) if output_dir else emulator.base_path / "logs" / "benchmarks"
+        self.logger = logger
+        self._stop = False
+
+    def _log(self, message: str, level: str = "info"):
+        """Helper para logging"""
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(f"[{level.upper()}] {message}")
+
+    @staticmethod
+    def load_profiles(path: str) -> Dict[str, Dict]:
+        """Carga perfiles desde un JSON {nombre: perfil}"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def stop(self):
+        """Detiene el lote tras el juego en curso"""
+        self._stop = True
+
+    def _game_config(self, game: Dict, profile: Dict) -> Dict:
+        """Configuración del juego con las sobrescrituras del perfil"""
+        config = dict(self.game_info.get_optimal_config(game['id'])) if self.game_info else {}
+        config.update(profile.get('config') or {})
+        if profile.get('launch_profile'):
+            launch_profile = dict(config.get('launch_profile') or {})
+            launch_profile.update(profile['launch_profile'])
+            config['launch_profile'] = launch_profile
+        return config
+
+    def run_game(self, game: Dict, profile_name: str, profile: Dict, duration: float) -> Dict:
+        """Ejecuta un juego con un perfil y retorna su resultado"""
+        result = {
+            'game_id': game['id'],
+            'name': game.get('name'),
+            'path': game['path'],
+            'profile': profile_name,
+            'launched': False,
+            'crashed': False,
+            'error': None,
+            'launch_ms': None,
+            'metrics': {},
+            'telemetry': None,
+            'output_tail': [],
+            'emulog_tail': [],
+        }
+
+        output = deque(maxlen=self.MAX_OUTPUT_LINES)
+        timer = LaunchTimer()
+        emulog_path = self.emulator.get_emulog_path()
+        flags = profile.get('flags', self.DEFAULT_FLAGS)
+
+        self._log(f"Benchmark [{profile_name}] {game.get('name', game['id'])}: {duration:.0f}s")
+        # Con `config` el perfil solo compara algo si llega al INI del juego
+        launched = self.emulator.launch_game(
+            game['path'], self._game_config(game, profile),
+            timer=timer, flags=flags, use_cache=False, game_id=game['id'],
+            record_session=False, require_profile=bool(profile.get('config'))
+        )
+        supervisor = self.emulator.supervisor
+        if not launched or not supervisor:
+            if profile.get('config') and not self.emulator.profile_applied:
+                result['error'] = "configuración del perfil no aplicada (¿falta el INI del juego?)"
+                self._log(f"Benchmark [{profile_name}] {game['id']}: {result['error']}", "error")
+            return result
+        result['launched'] = True
+        supervisor.add_output_callback(output.append)
+
+        try:
+            deadline = time.perf_counter() + duration
+            while time.perf_counter() < deadline and supervisor.is_running():
+                supervisor.sample_metrics()
+                time.sleep(min(self.SAMPLE_INTERVAL, max(0.0, deadline - time.perf_counter())))
+            result['crashed'] = not supervisor.is_running() and supervisor.process.returncode != 0
+        finally:
+            supervisor.terminate()
+
+        result['launch_ms'] = timer.total_ms()
+        result['metrics'] = dict(supervisor.metrics)
+        result['telemetry'] = self.emulator.telemetry_session.summary()
+        result['output_tail'] = list(output)
+        result['emulog_tail'] = self._read_emulog_tail(emulog_path)
+        return result
+
+    def _read_emulog_tail(self, emulog_path: Optional[Path]) -> List[str]:
+        """Últimas líneas de emulog.txt"""
+        if not emulog_path or not emulog_path.exists():
+            return []
+        try:
+            with open(emulog_path, 'rb') as f:
+                f.seek(0, 2)
+                size = f.tell()
+                f.seek(max(0, size - self.EMULOG_TAIL_BYTES))
+                data = f.read().decode('utf-8', errors='replace')
+        except OSError:
+            return []
+        return data.splitlines()[-self.MAX_OUTPUT_LINES:]
+
+    def run(self, games: List[Dict], profiles: Dict[str, Dict], duration: float) -> Path:
+        """Ejecuta todos los juegos con todos los perfiles y escribe el informe"""
+        run_dir = self.output_dir / datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        run_dir.mkdir(parents=True, exist_ok=True)
+        self._stop = False
+
+        results: Dict[str, List[Dict]] = {}
+        for profile_name, profile in profiles.items():
+            results[profile_name] = []
+            for game in games:
+                if self._stop:
+                    break
+                result = self.run_game(game, profile_name, profile, duration)
+                results[profile_name].append(result)
+            with open(run_dir / f"{profile_name}.json", 'w', encoding='utf-8') as f:
+                json.dump({'profile': profile, 'duration': duration,
+                           'results': results[profile_name]}, f, indent=2)
+
+        report = self.format_comparison(results)
+        (run_dir / "comparison.txt").write_text(report, encoding='utf-8')
+        self._log(f"Informe de benchmark: {run_dir}")
+        return run_dir
+
+    @staticmethod
+    def _result_cells(result: Dict) -> Dict[str, str]:
+        """Celdas de la tabla comparativa para un resultado"""
+        metrics = result['metrics']
+        if result.get('error'):
+            status = "SIN PERFIL"
+        elif not result['launched']:
+            status = "NO LANZÓ"
+        elif result['crashed']:
+            status = f"ERROR ({metrics.get('exit_code')})"
+        else:
+            status = "OK"
+        launch_ms = result['launch_ms']
+        telemetry = result.get('telemetry') or {}
+        speed = telemetry.get('speed')
+        fps = telemetry.get('fps')
+        return {
+            'Estado': status,
+            'Inicio': f"{launch_ms:.0f} ms" if launch_ms is not None else "--",
+            'Velocidad': f"{speed['avg']:.1f}%" if speed else "--",
+            'Vel. p5': f"{speed['p5']:.1f}%" if speed else "--",
+            'FPS': f"{fps['avg']:.1f}" if fps else "--",
+            'CPU': f"{metrics.get('cpu_seconds', 0):.1f} s",
+            'RAM pico': f"{metrics.get('peak_rss_kb', 0) / 1024:.0f} MB",
+        }
+
+    def format_comparison(self, results: Dict[str, List[Dict]]) -> str:
+        """Tabla de texto juego x perfil"""
+        lines = [f"Benchmark {datetime.now().strftime('%Y-%m-%d %H:%M')}", ""]
+        games = {}
+        for profile_results in results.values():
+            for result in profile_results:
+                games.setdefault(result['path'], result)
+
+        for path, first in games.items():
+            lines.append(f"{first['name'] or first['game_id']} ({first['game_id']})")
+            for profile_name, profile_results in results.items():
+                result = next((r for r in profile_results if r['path'] == path), None)
+                if not result:
+                    continue
+                cells = self._result_cells(result)
+                lines.append(
+                    f"  {profile_name:20} " + "  ".join(f"{k}: {v:>10}" for k, v in cells.items())
+                )
+            lines.append("")
+        return "\n".join(lines)
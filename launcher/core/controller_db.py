@@ -0,0 +1,241 @@
+"""
+Controller DB - Identificación de mandos por GUID de SDL y VID:PID (gamecontrollerdb.txt)
+"""
+import json
+import os
+import platform
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.gamepad_detector import ControllerType
+
+
+# Mandos conocidos por VID:PID
+KNOWN_CONTROLLERS = {
+    (0x054c, 0x0ce6): ControllerType.PS5_DUALSENSE,
+    (0x054c, 0x0df2): ControllerType.PS5_DUALSENSE,   # DualSense Edge
+    (0x054c, 0x05c4): ControllerType.PS4_DUALSHOCK,
+    (0x054c, 0x09cc): ControllerType.PS4_DUALSHOCK,
+    (0x054c, 0x0ba0): ControllerType.PS4_DUALSHOCK,   # Adaptador inalámbrico
+    (0x045e, 0x028e): ControllerType.XBOX_360,
+    (0x045e, 0x028f): ControllerType.XBOX_360,
+    (0x045e, 0x0719): ControllerType.XBOX_360,        # Receptor inalámbrico
+    (0x045e, 0x02d1): ControllerType.XBOX_ONE,
+    (0x045e, 0x02dd): ControllerType.XBOX_ONE,
+    (0x045e, 0x02e0): ControllerType.XBOX_ONE,
+    (0x045e, 0x02ea): ControllerType.XBOX_ONE,
+    (0x045e, 0x02fd): ControllerType.XBOX_ONE,
+    (0x045e, 0x0b00): ControllerType.XBOX_ONE,        # Elite Series 2
+    (0x045e, 0x0b12): ControllerType.XBOX_SERIES,
+    (0x045e, 0x0b13): ControllerType.XBOX_SERIES,
+    (0x057e, 0x2009): ControllerType.NINTENDO_SWITCH_PRO,
+}
+
+# Nombres de la base de datos (normalizados por SDL) -> tipo
+DB_NAME_TYPES = [
+    ("ps5", ControllerType.PS5_DUALSENSE),
+    ("ps4", ControllerType.PS4_DUALSHOCK),
+    ("xbox series", ControllerType.XBOX_SERIES),
+    ("xbox one", ControllerType.XBOX_ONE),
+    ("xbox 360", ControllerType.XBOX_360),
+    ("xinput", ControllerType.XBOX_360),
+    ("switch pro", ControllerType.NINTENDO_SWITCH_PRO),
+]
+
+# Plataforma de SDL para este sistema
+SDL_PLATFORMS = {"Windows": "Windows", "Linux": "Linux", "Darwin": "Mac OS X"}
+
+
+def guid_vid_pid(guid: str) -> Optional[Tuple[int, int]]:
+    """VID y PID codificados en un GUID de SDL (None si no los lleva)"""
+    guid = guid.lower()
+    if len(guid) != 32:
+        return None
+    try:
+        if guid.endswith("504944564944"):
+            # Formato antiguo de DirectInput: VIDPID + "PIDVID"
+            return int(guid[2:4] + guid[0:2], 16), int(guid[6:8] + guid[4:6], 16)
+        if guid[12:16] == "0000" and guid[20:24] == "0000":
+            vendor = int(guid[10:12] + guid[8:10], 16)
+            product = int(guid[18:20] + guid[16:18], 16)
+            if vendor:
+                return vendor, product
+    except ValueError:
+        pass
+    return None
+
+
+def normalize_guid(guid: str) -> str:
+    """GUID sin CRC del nombre ni bytes de driver (SDL 2.26+ los agrega)"""
+    guid = guid.lower()
+    if len(guid) != 32 or guid_vid_pid(guid) is None or guid.endswith("504944564944"):
+        return guid
+    return guid[:4] + "0000" + guid[8:28] + "0000"
+
+
+def parse_mapping(mapping: str) -> Dict[str, str]:
+    """'a:b0,b:b1,...' -> {'a': 'b0', 'b': 'b1', ...}"""
+    layout = {}
+    for field in mapping.split(','):
+        key, _, value = field.partition(':')
+        if key and value and key != 'platform':
+            layout[key.strip()] = value.strip()
+    return layout
+
+
+class ControllerDB:
+    """
+    Índice de gamecontrollerdb.txt por GUID y por VID:PID.
+
+    El archivo se parsea una vez y el índice compilado se guarda en disco
+    junto con la huella (mtime/tamaño) de cada fuente; mientras las fuentes
+    no cambien, arrancar solo cuesta leer el JSON.
+    """
+
+    def __init__(self, sources: List[str], cache_file: str = None, logger=None):
+        self.sources = [Path(p) for p in sources if p]
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.logger = logger
+        self.platform = SDL_PLATFORMS.get(platform.system(), platform.system())
+        self.by_guid: Dict[str, List[str]] = {}
+        self.by_vid_pid: Dict[str, List[str]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _log(self, message: str, level: str = "info"):
+        """Helper para logging"""
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(f"[{level.upper()}] {message}")
+
+    @staticmethod
+    def default_sources(base_path, pcsx2_path=None) -> List[Path]:
+        """Ubicaciones habituales: config/ del launcher, PCSX2 y SDL"""
+        sources = [Path(base_path) / "config" / "gamecontrollerdb.txt"]
+        if pcsx2_path:
+            sources.append(Path(pcsx2_path).parent / "resources" / "game_controller_db.txt")
+        if os.environ.get('SDL_GAMECONTROLLERCONFIG_FILE'):
+            sources.append(Path(os.environ['SDL_GAMECONTROLLERCONFIG_FILE']))
+        return sources
+
+    def _fingerprint(self) -> List:
+        result = []
+        for path in self.sources:
+            try:
+                stat = path.stat()
+                result.append([str(path), stat.st_mtime_ns, stat.st_size])
+            except OSError:
+                continue
+        return result
+
+    def load(self):
+        """Carga el índice (desde la caché si las fuentes no cambiaron)"""
+        with self._lock:
+            if self._loaded:
+                return
+            fingerprint = self._fingerprint()
+            if not self._load_cache(fingerprint):
+                self._compile()
+                self._save_cache(fingerprint)
+            self._loaded = True
+
+    def _load_cache(self, fingerprint: List) -> bool:
+        if not self.cache_file or not self.cache_file.exists():
+            return False
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if cache.get('sources') != fingerprint or cache.get('platform') != self.platform:
+            return False
+        self.by_guid = cache['by_guid']
+        self.by_vid_pid = cache['by_vid_pid']
+        return True
+
+    def _save_cache(self, fingerprint: List):
+        if not self.cache_file:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'sources': fingerprint,
+                'platform': self.platform,
+                'by_guid': self.by_guid,
+                'by_vid_pid': self.by_vid_pid,
+            }, f)
+        os.replace(tmp_file, self.cache_file)
+
+    def _compile(self):
+        """Parsea las fuentes; las de esta plataforma tienen prioridad"""
+        self.by_guid = {}
+        self.by_vid_pid = {}
+        entries = 0
+        for path in self.sources:
+            try:
+                lines = path.read_text(encoding='utf-8', errors='replace').splitlines()
+            except OSError:
+                continue
+            for line in lines:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                parts = line.split(',', 2)
+                if len(parts) < 3:
+                    continue
+                guid, name, mapping = parts[0].lower(), parts[1], parts[2]
+                entry_platform = ""
+                for field in mapping.split(','):
+                    if field.startswith('platform:'):
+                        entry_platform = field[len('platform:'):]
+                native = entry_platform in ("", self.platform)
+                entry = [name, mapping, entry_platform]
+                entries += 1
+                for index, key in ((self.by_guid, normalize_guid(guid)),
+                                   (self.by_vid_pid, self._vid_pid_key(guid))):
+                    if key and (native or key not in index):
+                        index[key] = entry
+        if entries:
+            self._log(f"Base de mandos: {entries} entradas, {len(self.by_guid)} GUID, "
+                      f"{len(self.by_vid_pid)} VID:PID")
+
+    @staticmethod
+    def _vid_pid_key(guid: str) -> Optional[str]:
+        ids = guid_vid_pid(guid)
+        return f"{ids[0]:04x}:{ids[1]:04x}" if ids else None
+
+    def lookup(self, guid: str = "", name: str = "") -> Dict:
+        """
+        Identifica un mando. Retorna {'name', 'controller_type', 'layout',
+        'vendor_id', 'product_id', 'source'} donde source es 'guid',
+        'vid_pid' o 'name' (solo patrón de nombre: mando desconocido).
+        """
+        self.load()
+        guid = (guid or "").lower()
+        ids = guid_vid_pid(guid) if guid else None
+        entry, source = None, 'name'
+        if guid:
+            entry = self.by_guid.get(normalize_guid(guid))
+            source = 'guid' if entry else source
+        if entry is None and ids:
+            entry = self.by_vid_pid.get(f"{ids[0]:04x}:{ids[1]:04x}")
+            source = 'vid_pid' if entry else source
+
+        controller_type = KNOWN_CONTROLLERS.get(ids) if ids else None
+        if controller_type and source == 'name':
+            source = 'vid_pid'
+        if controller_type is None and entry:
+            db_name = entry[0].lower()
+            controller_type = next((t for pattern, t in DB_NAME_TYPES if pattern in db_name),
+                                   ControllerType.GENERIC)
+        return {
+            'name': entry[0] if entry else name,
+            'controller_type': controller_type,
+            'layout': parse_mapping(entry[1]) if entry else {},
+            'vendor_id': ids[0] if ids else 0,
+            'product_id': ids[1] if ids else 0,
+            'source': source,
+        }
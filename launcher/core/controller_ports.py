@@ -0,0 +1,124 @@
+"""
+Controller Ports - Asignación estable de mandos a los puertos Pad1..Pad8 de PCSX2
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class ControllerPorts:
+    """
+    Asigna a cada mando conectado un puerto (1-8) y lo recuerda por GUID,
+    así el orden de los jugadores sobrevive a desconectar y reconectar.
+    Varios mandos iguales (mismo GUID) se distinguen por orden de conexión.
+
+    Puertos de PCSX2: Pad1 y Pad2 son los puertos físicos; Pad3-Pad5 son
+    el multitap del puerto 1 y Pad6-Pad8 el del puerto 2.
+    """
+
+    MAX_PORTS = 8
+    MULTITAP1_PORTS = (3, 4, 5)
+    MULTITAP2_PORTS = (6, 7, 8)
+
+    def __init__(self, state_file: str = None, logger=None):
+        self.state_file = Path(state_file) if state_file else None
+        self.logger = logger
+        # clave (GUID o nombre) -> puertos recordados, por orden de conexión
+        self.remembered: Dict[str, List[int]] = {}
+        self.assignment: Dict[int, object] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _log(self, message: str, level: str = "info"):
+        """Helper para logging"""
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(f"[{level.upper()}] {message}")
+
+    def _load(self):
+        """Carga los puertos recordados"""
+        if self.state_file and self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    self.remembered = json.load(f)
+            except Exception:
+                pass
+
+    def _save(self):
+        """Guarda los puertos recordados (llamar con el lock tomado)"""
+        if not self.state_file:
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self.remembered, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    @staticmethod
+    def _key(gamepad) -> str:
+        return (gamepad.guid or gamepad.name).lower()
+
+    def assign(self, gamepads: List) -> Dict[int, object]:
+        """Puerto -> GamepadInfo para los mandos conectados"""
+        ordered = sorted(gamepads, key=lambda g: g.instance_id)
+        with self._lock:
+            result: Dict[int, object] = {}
+            occurrence: Dict[int, int] = {}
+            pending = []
+            seen: Dict[str, int] = {}
+            for gamepad in ordered:
+                key = self._key(gamepad)
+                index = seen.get(key, 0)
+                seen[key] = index + 1
+                occurrence[id(gamepad)] = index
+                ports = self.remembered.get(key, [])
+                if index < len(ports) and ports[index] and ports[index] not in result:
+                    result[ports[index]] = gamepad
+                else:
+                    pending.append(gamepad)
+
+            # Los mandos nuevos ocupan el primer puerto libre
+            for gamepad in pending:
+                free = [p for p in range(1, self.MAX_PORTS + 1) if p not in result]
+                if not free:
+                    self._log(f"Sin puerto libre para {gamepad.name}", "warning")
+                    continue
+                port = free[0]
+                result[port] = gamepad
+                key = self._key(gamepad)
+                ports = self.remembered.setdefault(key, [])
+                index = occurrence[id(gamepad)]
+                while len(ports) <= index:
+                    ports.append(0)
+                ports[index] = port
+            if pending:
+                self._save()
+            # Con uno o dos jugadores bastan los puertos físicos: sin multitap.
+            # El puerto recordado no se toca (vuelve a usarse con más jugadores)
+            if len(result) <= 2:
+                physical = [p for p in (1, 2) if p not in result]
+                for port in sorted(p for p in result if p > 2):
+                    result[physical.pop(0)] = result.pop(port)
+            self.assignment = dict(sorted(result.items()))
+            return self.assignment
+
+    def get_port(self, gamepad) -> Optional[int]:
+        """Puerto asignado a un mando en la última asignación"""
+        for port, assigned in self.assignment.items():
+            if assigned is gamepad:
+                return port
+        return None
+
+    @classmethod
+    def multitap_settings(cls, ports) -> Dict[str, bool]:
+        """Claves de [Pad] necesarias para los puertos usados (multitap solo con más de dos)"""
+        ports = set(ports)
+        if len(ports) <= 2:
+            ports = set()
+        return {
+            'MultitapPort1': bool(ports & set(cls.MULTITAP1_PORTS)),
+            'MultitapPort2': bool(ports & set(cls.MULTITAP2_PORTS)),
+        }
@@ -5,9 +5,19 @@ import os
 import subprocess
 import json
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 import configparser
 
+from core.iso_cache import ISOCache
+from core.launch_profile import resolve_launch_profile
+from core.launch_timing import LaunchStats, LaunchTimer
+from core.telemetry import TelemetrySession, TelemetryStore
+from core.pcsx2_discovery import PCSX2Discovery, executable_command, get_capabilities
+from core.process_supervisor import ProcessSupervisor
+from core.ini_file import add_write_listener, find_pcsx2_ini
+from core.ini_snapshots import IniSnapshots
+from core.pcsx2_profile import ProfileApplier, find_game_settings
+
 
 class EmulatorManager:
     """Gestiona la integración con PCSX2"""
@@ -21,7 +31,27 @@ class EmulatorManager:
         self.pcsx2_config_dir = None
         self.settings = {}
         self.logger = logger
+        self.supervisor = None
+        self.running_rom: Optional[Path] = None
+        # Si la configuración del último lanzamiento llegó a un INI
+        self.profile_applied = False
+        self.discovery = PCSX2Discovery(self.base_path, logger=logger)
         self._load_settings()
+        self.iso_cache = ISOCache(
+            cache_dir=self.settings.get('iso_cache_dir') or self.base_path / "cache" / "isos",
+            state_file=self.config_path / "iso_cache.json",
+            max_size_gb=self.settings.get('iso_cache_max_gb'),
+            logger=logger,
+            in_use=self._rom_in_use
+        )
+        self.launch_stats = LaunchStats(self.config_path / "launch_stats.json")
+        self.telemetry = TelemetryStore(self.config_path / "telemetry.json")
+        self.telemetry_session = None
+        self._session_listeners = []
+        # Toda escritura de INI del launcher queda en el historial
+        self.ini_snapshots = IniSnapshots(self.config_path / "ini_snapshots", logger=logger)
+        add_write_listener(self.ini_snapshots.record)
+        self.profile_applier = ProfileApplier(logger=logger)
         
     def _log(self, message: str, level: str = "info"):
         """Helper para logging"""
@@ -55,40 +85,51 @@ class EmulatorManager:
             
     def detect_pcsx2(self) -> Optional[Path]:
         """Detecta la instalación de PCSX2"""
-        possible_paths = [
-            # Portable en el proyecto
-            self.base_path / "pcsx2" / "pcsx2-qt.exe",
-            self.base_path / "pcsx2" / "pcsx2.exe",
-            # Instalación típica
-            Path("C:/Program Files/PCSX2/pcsx2-qt.exe"),
-            Path("C:/Program Files/PCSX2/pcsx2.exe"),
-            Path("C:/Program Files (x86)/PCSX2/pcsx2-qt.exe"),
-            Path(os.environ.get('LOCALAPPDATA', '')) / "PCSX2" / "pcsx2-qt.exe",
-        ]
+        path = self.discovery.discover()
+        if not path:
+            return None
         
-        for path in possible_paths:
-            if path.exists():
-                self.pcsx2_path = path
-                self._detect_pcsx2_config_dir()
-                self.save_settings()
-                self._log(f"PCSX2 detectado: {path}")
-                return path
-                
-        return None
+        if self.pcsx2_path and Path(self.pcsx2_path) == path and self.is_configured():
+            # Misma instalación y sin cambios: no reescribir settings.json
+            return path
+        
+        self._set_pcsx2_installation(path)
+        self._log(f"PCSX2 detectado: {path}")
+        return path
+    
+    def _set_pcsx2_installation(self, path: Path):
+        """Registra una instalación: huella, versión y carpeta de config"""
+        self.pcsx2_path = path
+        self.settings['pcsx2_fingerprint'] = self.discovery.fingerprint(path)
+        version = self.discovery.probe_version(path)
+        self.settings['pcsx2_version'] = list(version) if version else None
+        if version:
+            self._log(f"Versión de PCSX2: {'.'.join(map(str, version))}")
+        self._detect_pcsx2_config_dir()
+        self.save_settings()
     
     def _detect_pcsx2_config_dir(self):
         """Detecta el directorio de configuración de PCSX2"""
-        possible_dirs = [
-            # PCSX2 2.0+ Qt
-            Path(os.environ.get('APPDATA', '')) / "PCSX2",
-            Path(os.environ.get('LOCALAPPDATA', '')) / "PCSX2",
-            # Portable
-            self.pcsx2_path.parent / "inis" if self.pcsx2_path else None,
-            self.pcsx2_path.parent if self.pcsx2_path else None,
+        home = Path.home()
+        possible_dirs = []
+        for env_var in ('APPDATA', 'LOCALAPPDATA'):
+            # PCSX2 2.0+ Qt (Windows)
+            if os.environ.get(env_var):
+                possible_dirs.append(Path(os.environ[env_var]) / "PCSX2")
+        possible_dirs += [
+            # Linux nativo / AppImage y Flatpak
+            Path(os.environ.get('XDG_CONFIG_HOME', home / ".config")) / "PCSX2",
+            home / ".var" / "app" / "net.pcsx2.PCSX2" / "config" / "PCSX2",
         ]
+        if self.pcsx2_path:
+            # Portable (marcado con portable.ini / portable.txt)
+            pcsx2_dir = Path(self.pcsx2_path).parent
+            possible_dirs.append(pcsx2_dir / "inis")
+            if (pcsx2_dir / "portable.ini").exists() or (pcsx2_dir / "portable.txt").exists():
+                possible_dirs.append(pcsx2_dir)
         
         for dir_path in possible_dirs:
-            if dir_path and dir_path.exists():
+            if dir_path.exists():
                 self.pcsx2_config_dir = dir_path
                 self._log(f"Directorio config PCSX2: {dir_path}")
                 return dir_path
@@ -98,19 +139,80 @@ class EmulatorManager:
     def set_pcsx2_path(self, path: str) -> bool:
         """Establece la ruta de PCSX2 manualmente"""
         path = Path(path)
-        if path.exists() and path.suffix == '.exe':
-            self.pcsx2_path = path
-            self._detect_pcsx2_config_dir()
-            self.save_settings()
+        if self.discovery.probe(path) is None:
+            return False
+        if os.name == 'nt' and path.suffix.lower() != '.exe':
+            return False
+        if self.pcsx2_path and Path(self.pcsx2_path) == path and self.is_configured():
             return True
-        return False
+        self._set_pcsx2_installation(path)
+        return True
     
     def is_configured(self) -> bool:
-        """Verifica si PCSX2 está configurado"""
-        return self.pcsx2_path is not None and Path(self.pcsx2_path).exists()
+        """
+        Verifica si PCSX2 está configurado. Un solo stat() compara la huella
+        guardada; si el ejecutable cambió (actualización) se vuelve a
+        consultar su versión.
+        """
+        if self.pcsx2_path is None:
+            return False
+        fingerprint = self.discovery.fingerprint(self.pcsx2_path)
+        if fingerprint is None:
+            return False
+        if fingerprint != self.settings.get('pcsx2_fingerprint'):
+            self._log("El ejecutable de PCSX2 cambió, actualizando versión")
+            self._set_pcsx2_installation(Path(self.pcsx2_path))
+        return True
+    
+    @property
+    def pcsx2_version(self) -> Optional[Tuple[int, int, int]]:
+        """Versión detectada de PCSX2"""
+        version = self.settings.get('pcsx2_version')
+        return tuple(version) if version else None
+    
+    def get_capabilities(self) -> Dict:
+        """Capacidades de línea de comandos de la versión instalada"""
+        return get_capabilities(self.pcsx2_version)
+    
+    def get_launch_flags(self, *options: str) -> List[str]:
+        """
+        Traduce opciones ('batch', 'nogui', 'fullscreen', 'bigpicture')
+        a los flags que entiende la versión instalada
+        """
+        capabilities = self.get_capabilities()
+        return [
+            f"{capabilities['flag_prefix']}{option}"
+            for option in options
+            if capabilities.get(option)
+        ]
     
-    def launch_game(self, rom_path: str, config: Dict = None) -> bool:
-        """Lanza un juego con PCSX2"""
+    def get_ini_path(self) -> Optional[Path]:
+        """Ruta de PCSX2.ini de la instalación configurada"""
+        return find_pcsx2_ini(self.pcsx2_config_dir)
+
+    def get_emulog_path(self) -> Optional[Path]:
+        """Ruta del emulog.txt que escribe PCSX2"""
+        if not self.pcsx2_config_dir:
+            return None
+        config_dir = Path(self.pcsx2_config_dir)
+        for candidate in (config_dir / "logs" / "emulog.txt", config_dir / "emulog.txt"):
+            if candidate.exists():
+                return candidate
+        return config_dir / "logs" / "emulog.txt"
+    
+    def launch_game(self, rom_path: str, config: Dict = None, timer: LaunchTimer = None,
+                    flags: List[str] = None, use_cache: bool = True, game_id: str = None,
+                    record_session: bool = True, require_profile: bool = False) -> bool:
+        """
+        Lanza un juego con PCSX2.
+        `flags` son opciones genéricas ('batch', 'fullscreen'...) que se
+        traducen según la versión instalada. Los tiempos solo se guardan si
+        el `timer` identifica al juego, y la telemetría si se da `game_id`
+        y `record_session`. Con `require_profile` no se lanza si `config`
+        no se pudo escribir en ningún INI.
+        """
+        timer = timer or LaunchTimer()
+        self.profile_applied = False
         if not self.is_configured():
             if not self.detect_pcsx2():
                 self._log("PCSX2 no configurado", "error")
@@ -120,6 +222,10 @@ class EmulatorManager:
         if not rom_path.exists():
             self._log(f"ROM no encontrada: {rom_path}", "error")
             return False
+        
+        # Usar la copia local si el juego está en la caché rápida
+        if use_cache and self.settings.get('iso_cache_enabled', True):
+            rom_path = self.iso_cache.resolve(str(rom_path))
             
         try:
             pcsx2_exe = str(self.pcsx2_path)
@@ -129,25 +235,39 @@ class EmulatorManager:
             self._log(f"PCSX2: {pcsx2_exe}")
             self._log(f"ROM: {rom_file}")
             
-            # Usar shell=True en Windows para manejar espacios en rutas
-            import platform
-            if platform.system() == 'Windows':
-                # Escapar rutas con comillas para manejar espacios
-                cmd = f'"{pcsx2_exe}" "{rom_file}"'
-                self._log(f"Comando: {cmd}")
-                
-                # Usar subprocess.Popen con shell para Windows
-                process = subprocess.Popen(
-                    cmd,
-                    shell=True,
-                    cwd=pcsx2_dir,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
-                self._log(f"Proceso iniciado con PID: {process.pid}")
-            else:
-                # Linux/Mac
-                subprocess.Popen([pcsx2_exe, rom_file], cwd=str(self.pcsx2_path.parent))
+            # Escribir la configuración del juego en su INI por juego (sin
+            # tocar el archivo si ya la tiene)
+            if config and self.settings.get('apply_game_profile', True):
+                self.profile_applied = self._apply_game_profile(
+                    config, game_id, label=f"lanzamiento {game_id or rom_path.name}")
+            if config and require_profile and not self.profile_applied:
+                self._log(f"Configuración de {game_id or rom_path.name} no aplicada: "
+                          f"no se lanza", "error")
+                return False
+            timer.mark('ini')
+            
+            # Lista de argumentos sin shell: las rutas con espacios se pasan
+            # tal cual y el PID es el del emulador (necesario para el perfil)
+            cmd = executable_command(pcsx2_exe) + self.get_launch_flags(*(flags or [])) + [rom_file]
+            self._log(f"Comando: {subprocess.list2cmdline(cmd)}")
+            
+            profile = resolve_launch_profile(
+                self.settings.get('launch_profile'),
+                (config or {}).get('launch_profile')
+            )
+            self.supervisor = ProcessSupervisor(cmd, cwd=pcsx2_dir, profile=profile, logger=self.logger)
+            self.running_rom = Path(rom_file)
+            self.telemetry_session = TelemetrySession(
+                game_id if record_session else None,
+                internal_resolution=(config or {}).get('internal_resolution') if self.profile_applied else None
+            )
+            self.supervisor.add_output_callback(timer.on_output)
+            self.supervisor.add_output_callback(self.telemetry_session.on_output)
+            self.supervisor.start()
+            timer.mark('spawn')
+            emulog_path = self.get_emulog_path()
+            timer.watch(self.supervisor, emulog_path, self._on_launch_measured)
+            self.telemetry_session.watch(self.supervisor, emulog_path, self._on_session_finished)
             
             return True
             
@@ -163,6 +283,57 @@ class EmulatorManager:
             self._log(traceback.format_exc(), "error")
             return False
     
+    def _rom_in_use(self, path: Path) -> bool:
+        """True si PCSX2 sigue corriendo con esta imagen abierta (caché ISO)"""
+        return (self.supervisor is not None and self.supervisor.is_running()
+                and self.running_rom == path)
+
+    def _apply_game_profile(self, config: Dict, game_id: str, label: str) -> bool:
+        """
+        El perfil va a los INI por juego de PCSX2 (gamesettings/<SERIAL>_<CRC>.ini),
+        solo con lo que difiere del global. El PCSX2.ini global solo se
+        modifica si el usuario lo pidió ('apply_game_profile_global'):
+        cambiaría el renderizador y los speedhacks de todos los juegos.
+        Retorna True si la configuración quedó (o ya estaba) en un INI.
+        """
+        ini_path = self.get_ini_path()
+        targets = {}
+        if game_id and self.pcsx2_config_dir:
+            targets = {str(path): config for path in find_game_settings(self.pcsx2_config_dir, game_id)}
+        if targets:
+            self.profile_applier.apply_batch(ini_path, targets, label=label)
+            return True
+        if self.settings.get('apply_game_profile_global', False) and ini_path:
+            self.profile_applier.apply(ini_path, config, label=label)
+            return True
+        self._log(f"Sin INI por juego para {game_id or 'el juego'}: perfil no aplicado "
+                  f"(se crea desde las propiedades del juego en PCSX2)")
+        return False
+    
+    def _on_launch_measured(self, timer: LaunchTimer):
+        """Guarda los tiempos de un lanzamiento (hilo del monitor)"""
+        self._log(timer.describe())
+        self.launch_stats.record(timer)
+    
+    def _on_session_finished(self, session: TelemetrySession):
+        """Guarda la telemetría al cerrar el emulador (hilo del monitor)"""
+        summary = session.summary()
+        if summary.get('speed'):
+            self._log(
+                f"Sesión terminada: velocidad media {summary['speed']['avg']:.1f}%, "
+                f"mínima {summary['speed']['min']:.1f}%, {summary['shader_stalls']} tirones de shader"
+            )
+        if self.telemetry.record(session.game_id, summary):
+            for listener in self._session_listeners:
+                try:
+                    listener(session.game_id, summary)
+                except Exception as e:
+                    self._log(f"Error procesando sesión: {e}", "error")
+    
+    def add_session_listener(self, listener):
+        """Registra un callback(game_id, resumen) para cada sesión guardada"""
+        self._session_listeners.append(listener)
+    
     def get_download_instructions(self) -> str:
         """Retorna instrucciones para descargar PCSX2"""
         return f"""
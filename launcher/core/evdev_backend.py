@@ -0,0 +1,478 @@
+"""
+Evdev Backend - Detección de mandos en Linux sin pygame (/dev/input + inotify)
+"""
+import ctypes
+import ctypes.util
+import fcntl
+import os
+import re
+import select
+import stat
+import struct
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.gamepad_detector import ControllerType, GamepadInfo, InputEvent
+
+
+# ioctl de evdev (linux/input.h)
+_IOC_WRITE = 1
+_IOC_READ = 2
+
+
+def _ioc_read(nr: int, size: int) -> int:
+    return (_IOC_READ << 30) | (size << 16) | (ord('E') << 8) | nr
+
+
+def _ioc_write(nr: int, size: int) -> int:
+    return (_IOC_WRITE << 30) | (size << 16) | (ord('E') << 8) | nr
+
+
+EV_KEY = 0x01
+EV_ABS = 0x03
+KEY_MAX = 0x2ff
+ABS_MAX = 0x3f
+EVIOCGID = _ioc_read(0x02, 8)
+EVIOCSCLOCKID = _ioc_write(0xa0, 4)
+CLOCK_MONOTONIC = 1
+# struct input_event: timeval (sec, usec), type, code, value
+_INPUT_EVENT = struct.Struct('llHHi')
+
+
+def EVIOCGNAME(length: int) -> int:
+    return _ioc_read(0x06, length)
+
+
+def EVIOCGBIT(event_type: int, length: int) -> int:
+    return _ioc_read(0x20 + event_type, length)
+
+
+# struct input_absinfo: value, minimum, maximum, fuzz, flat, resolution
+_ABSINFO = struct.Struct('iiiiii')
+
+
+def EVIOCGABS(code: int) -> int:
+    return _ioc_read(0x40 + code, _ABSINFO.size)
+
+
+# Rangos de códigos (linux/input-event-codes.h)
+BTN_MISC = 0x100
+BTN_JOYSTICK = 0x120
+BTN_THUMBR = 0x13e
+ABS_HAT0X = 0x10
+ABS_HAT3Y = 0x17
+ABS_MT_FIRST = 0x2f
+
+# inotify (linux/inotify.h)
+IN_ATTRIB = 0x00000004
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_INOTIFY_EVENT = struct.Struct('iIII')
+
+EVENT_NODE_PATTERN = re.compile(r'^event(\d+)$')
+_LONG_BITS = struct.calcsize('L') * 8
+
+
+def _parse_bitmap(words: str) -> int:
+    """Bitmap de /proc/bus/input/devices ("B: KEY=...", palabra más alta primero)"""
+    value = 0
+    for index, word in enumerate(reversed(words.split())):
+        value |= int(word, 16) << (_LONG_BITS * index)
+    return value
+
+
+def _bits_in_range(bitmap: int, first: int, last: int) -> int:
+    """Cantidad de bits activos entre dos códigos (incluidos)"""
+    mask = ((1 << (last - first + 1)) - 1) << first
+    return bin(bitmap & mask).count('1')
+
+
+def sdl_guid(bus: int, vendor: int, product: int, version: int) -> str:
+    """GUID de SDL para un dispositivo evdev (bus, vendor, product, version)"""
+    return struct.pack('<HHHHHHHH', bus, 0, vendor, 0, product, 0, version, 0).hex()
+
+
+class EvdevBackend:
+    """
+    Backend de detección para Linux sin pygame.
+
+    Enumera /dev/input/event* y /proc/bus/input/devices; el nombre y los
+    IDs se leen con ioctl cuando el nodo se puede abrir, y si no, de /proc.
+    Los cambios en /dev/input se reciben con inotify (o sondeo si no hay
+    inotify). Las rutas son configurables para usar un /dev/input falso
+    (ver tools/fake_input.py).
+
+    En modo diagnóstico (`set_input_events`) también lee los struct
+    input_event de cada mando; con EVIOCSCLOCKID las marcas de tiempo son
+    las del kernel en CLOCK_MONOTONIC, el mismo reloj que perf_counter_ns.
+    Los ejes se normalizan a -1..1 con el rango del dispositivo, como SDL.
+    """
+
+    name = "evdev"
+    WAIT_TIMEOUT = 0.25
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, input_dir: str = "/dev/input", proc_devices: str = "/proc/bus/input/devices"):
+        self.input_dir = Path(input_dir)
+        self.proc_devices = Path(proc_devices)
+        self._known: Dict[str, int] = {}  # nodo -> instance_id
+        self._ignored: set = set()  # nodos que no son mandos
+        self._next_instance = 0
+        self._inotify_fd: Optional[int] = None
+        self._libc = None
+        self._next_poll = 0.0
+        self._wake_pipe: Optional[Tuple[int, int]] = None
+        self._input_events = False
+        self._input_nodes: Dict[str, int] = {}  # nodo -> fd abierto para leer eventos
+        self._input_fds: Dict[int, Tuple[int, bool]] = {}  # fd -> (instance_id, reloj del kernel)
+        self._axis_ranges: Dict[int, Dict[int, Tuple[int, int]]] = {}  # fd -> código -> (mín, máx)
+
+    def is_supported(self) -> bool:
+        """True si existe la carpeta de dispositivos configurada"""
+        return self.input_dir.is_dir()
+
+    def initialize(self):
+        """Prepara inotify sobre la carpeta de dispositivos"""
+        if not self.input_dir.is_dir():
+            raise OSError(f"No existe {self.input_dir}")
+        libc_name = ctypes.util.find_library('c')
+        try:
+            self._libc = ctypes.CDLL(libc_name, use_errno=True)
+            fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1")
+            mask = IN_CREATE | IN_DELETE | IN_ATTRIB | IN_MOVED_TO | IN_MOVED_FROM
+            if self._libc.inotify_add_watch(fd, str(self.input_dir).encode(), mask) < 0:
+                os.close(fd)
+                raise OSError(ctypes.get_errno(), "inotify_add_watch")
+            self._inotify_fd = fd
+        except (OSError, AttributeError, TypeError):
+            # Sin inotify: sondeo ligero del directorio
+            self._inotify_fd = None
+        self._next_poll = time.monotonic() + self.POLL_INTERVAL
+        self._wake_pipe = os.pipe()
+        os.set_blocking(self._wake_pipe[0], False)
+        os.set_blocking(self._wake_pipe[1], False)
+
+    def wake(self):
+        """Interrumpe wait_events desde otro hilo"""
+        if self._wake_pipe:
+            try:
+                os.write(self._wake_pipe[1], b'\0')
+            except OSError:
+                pass
+
+    def set_input_events(self, enabled: bool):
+        """
+        Activa el modo diagnóstico: wait_events también retorna
+        ('input', InputEvent). Se aplica en el hilo que espera eventos.
+        """
+        self._input_events = enabled
+
+    def _sync_input_fds(self):
+        """Abre/cierra los nodos de los mandos según el modo diagnóstico"""
+        wanted = self._known if self._input_events else {}
+        for node in [n for n in self._input_nodes if n not in wanted]:
+            self._close_input(node)
+        for node, instance_id in wanted.items():
+            if node not in self._input_nodes:
+                self._open_input(node, instance_id)
+
+    def _open_input(self, node: str, instance_id: int):
+        try:
+            fd = os.open(self.input_dir / node, os.O_RDONLY | os.O_NONBLOCK)
+        except OSError:
+            return
+        if not stat.S_ISCHR(os.fstat(fd).st_mode):
+            # Nodo falso (archivo normal): no hay eventos que leer
+            os.close(fd)
+            return
+        try:
+            fcntl.ioctl(fd, EVIOCSCLOCKID, struct.pack('i', CLOCK_MONOTONIC))
+            kernel_clock = True
+        except OSError:
+            kernel_clock = False
+        self._input_nodes[node] = fd
+        self._input_fds[fd] = (instance_id, kernel_clock)
+        self._axis_ranges[fd] = {code: (minimum, maximum) for code, (_, minimum, maximum)
+                                 in self._read_absinfo(fd).items()}
+
+    @staticmethod
+    def _read_absinfo(fd: int) -> Dict[int, Tuple[int, int, int]]:
+        """Valor actual y rango de cada eje: código -> (valor, mín, máx)"""
+        axes = {}
+        abs_bits = bytearray(ABS_MAX // 8 + 1)
+        try:
+            fcntl.ioctl(fd, EVIOCGBIT(EV_ABS, len(abs_bits)), abs_bits, True)
+        except OSError:
+            return axes
+        bits = int.from_bytes(bytes(abs_bits), 'little')
+        for code in range(ABS_MT_FIRST):
+            if not bits >> code & 1:
+                continue
+            info = bytearray(_ABSINFO.size)
+            try:
+                fcntl.ioctl(fd, EVIOCGABS(code), info, True)
+            except OSError:
+                continue
+            value, minimum, maximum, _, _, _ = _ABSINFO.unpack(bytes(info))
+            if maximum > minimum:
+                axes[code] = (value, minimum, maximum)
+        return axes
+
+    def axis_values(self, instance_id: int) -> Dict[int, float]:
+        """Posición actual de los ejes de un mando, normalizada a -1..1"""
+        node = next((n for n, i in self._known.items() if i == instance_id), None)
+        if node is None:
+            return {}
+        try:
+            fd = os.open(self.input_dir / node, os.O_RDONLY | os.O_NONBLOCK)
+        except OSError:
+            return {}
+        try:
+            return {code: (value - minimum) * 2.0 / (maximum - minimum) - 1.0
+                    for code, (value, minimum, maximum) in self._read_absinfo(fd).items()
+                    if not ABS_HAT0X <= code <= ABS_HAT3Y}
+        finally:
+            os.close(fd)
+
+    def _close_input(self, node: str):
+        fd = self._input_nodes.pop(node, None)
+        if fd is not None:
+            self._input_fds.pop(fd, None)
+            self._axis_ranges.pop(fd, None)
+            os.close(fd)
+
+    def _read_input(self, fd: int) -> List[Tuple[str, object]]:
+        """Eventos de botones, ejes y crucetas pendientes en un nodo"""
+        instance_id, kernel_clock = self._input_fds[fd]
+        try:
+            data = os.read(fd, _INPUT_EVENT.size * 64)
+        except BlockingIOError:
+            return []
+        except OSError:
+            # ENODEV: el mando se desconectó; inotify avisará la baja
+            node = next((n for n, f in self._input_nodes.items() if f == fd), None)
+            if node:
+                self._close_input(node)
+            return []
+        now = time.perf_counter_ns()
+        ranges = self._axis_ranges.get(fd, {})
+        events = []
+        for offset in range(0, len(data) - _INPUT_EVENT.size + 1, _INPUT_EVENT.size):
+            sec, usec, event_type, code, value = _INPUT_EVENT.unpack_from(data, offset)
+            if event_type == EV_KEY and code >= BTN_MISC:
+                kind = 'button'
+            elif event_type == EV_ABS and code < ABS_MT_FIRST:
+                kind = 'hat' if ABS_HAT0X <= code <= ABS_HAT3Y else 'axis'
+            else:
+                continue
+            t_ns = sec * 1_000_000_000 + usec * 1000 if kernel_clock else now
+            if kind == 'axis' and code in ranges:
+                minimum, maximum = ranges[code]
+                value = (value - minimum) * 2.0 / (maximum - minimum) - 1.0
+            events.append(('input', InputEvent(t_ns, instance_id, kind, code, float(value))))
+        return events
+
+    def _read_proc(self) -> Dict[str, Dict]:
+        """Dispositivos de /proc/bus/input/devices indexados por nodo eventN"""
+        try:
+            text = self.proc_devices.read_text(encoding='utf-8', errors='replace')
+        except OSError:
+            return {}
+        devices = {}
+        for block in text.split("\n\n"):
+            info = {'key_bits': 0, 'abs_bits': 0}
+            handlers = []
+            for line in block.splitlines():
+                if line.startswith("I:"):
+                    for field in line[2:].split():
+                        key, _, value = field.partition('=')
+                        info[key.lower()] = int(value, 16)
+                elif line.startswith("N: Name="):
+                    info['name'] = line[len("N: Name="):].strip().strip('"')
+                elif line.startswith("H: Handlers="):
+                    handlers = line[len("H: Handlers="):].split()
+                elif line.startswith("B: KEY="):
+                    info['key_bits'] = _parse_bitmap(line[len("B: KEY="):])
+                elif line.startswith("B: ABS="):
+                    info['abs_bits'] = _parse_bitmap(line[len("B: ABS="):])
+            for handler in handlers:
+                if EVENT_NODE_PATTERN.match(handler):
+                    devices[handler] = info
+        return devices
+
+    def _read_ioctl(self, path: Path) -> Optional[Dict]:
+        """Nombre, IDs y capacidades con ioctl (None si el nodo no se puede abrir)"""
+        try:
+            fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        except OSError:
+            return None
+        try:
+            name = bytearray(256)
+            fcntl.ioctl(fd, EVIOCGNAME(len(name)), name, True)
+            input_id = bytearray(8)
+            fcntl.ioctl(fd, EVIOCGID, input_id, True)
+            key_bits = bytearray(KEY_MAX // 8 + 1)
+            fcntl.ioctl(fd, EVIOCGBIT(EV_KEY, len(key_bits)), key_bits, True)
+            abs_bits = bytearray(ABS_MAX // 8 + 1)
+            fcntl.ioctl(fd, EVIOCGBIT(EV_ABS, len(abs_bits)), abs_bits, True)
+        except OSError:
+            return None
+        finally:
+            os.close(fd)
+        bus, vendor, product, version = struct.unpack('<HHHH', bytes(input_id))
+        return {
+            'name': bytes(name).split(b'\0', 1)[0].decode('utf-8', errors='replace'),
+            'bus': bus,
+            'vendor': vendor,
+            'product': product,
+            'version': version,
+            'key_bits': int.from_bytes(bytes(key_bits), 'little'),
+            'abs_bits': int.from_bytes(bytes(abs_bits), 'little'),
+        }
+
+    def _probe(self, node: str, proc: Dict[str, Dict] = None) -> Optional[GamepadInfo]:
+        """Información de un nodo eventN si es un mando"""
+        match = EVENT_NODE_PATTERN.match(node)
+        if not match:
+            return None
+        info = self._read_ioctl(self.input_dir / node)
+        if info is None:
+            info = (proc if proc is not None else self._read_proc()).get(node)
+        if not info or 'name' not in info:
+            return None
+        key_bits = info['key_bits']
+        abs_bits = info['abs_bits']
+        # Un mando tiene botones de joystick/gamepad (BTN_JOYSTICK..BTN_THUMBR)
+        if not _bits_in_range(key_bits, BTN_JOYSTICK, BTN_THUMBR):
+            return None
+
+        hats = _bits_in_range(abs_bits, ABS_HAT0X, ABS_HAT3Y)
+        axes = bin(abs_bits & ((1 << ABS_MT_FIRST) - 1)).count('1') - hats
+        if node not in self._known:
+            self._known[node] = self._next_instance
+            self._next_instance += 1
+        return GamepadInfo(
+            id=int(match.group(1)),
+            name=info['name'],
+            controller_type=ControllerType.UNKNOWN,
+            num_axes=axes,
+            num_buttons=_bits_in_range(key_bits, BTN_MISC, KEY_MAX),
+            num_hats=(hats + 1) // 2,
+            guid=sdl_guid(info.get('bus', 0), info.get('vendor', 0),
+                          info.get('product', 0), info.get('version', 0)),
+            instance_id=self._known[node],
+        )
+
+    def _nodes(self) -> List[str]:
+        try:
+            return sorted(n for n in os.listdir(self.input_dir) if EVENT_NODE_PATTERN.match(n))
+        except OSError:
+            return []
+
+    def enumerate(self) -> List[GamepadInfo]:
+        """Mandos conectados ahora mismo"""
+        proc = self._read_proc()
+        devices = []
+        for node in self._nodes():
+            gamepad = self._probe(node, proc)
+            if gamepad:
+                devices.append(gamepad)
+            else:
+                self._ignored.add(node)
+        return devices
+
+    def _read_inotify(self) -> Tuple[set, set]:
+        """Nodos creados/cambiados y borrados según inotify"""
+        touched, removed = set(), set()
+        while True:
+            try:
+                data = os.read(self._inotify_fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + _INOTIFY_EVENT.size <= len(data):
+                _, mask, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+                offset += _INOTIFY_EVENT.size
+                name = data[offset:offset + length].split(b'\0', 1)[0].decode(errors='replace')
+                offset += length
+                if mask & (IN_DELETE | IN_MOVED_FROM):
+                    removed.add(name)
+                    touched.discard(name)
+                else:
+                    touched.add(name)
+                    removed.discard(name)
+        return touched, removed
+
+    def wait_events(self) -> List[Tuple[str, object]]:
+        """
+        Espera cambios (hasta WAIT_TIMEOUT). Retorna ('added', GamepadInfo)
+        o ('removed', instance_id), y ('input', InputEvent) en modo diagnóstico.
+        """
+        self._sync_input_fds()
+        watch = list(self._input_fds) + [self._wake_pipe[0]]
+        if self._inotify_fd is not None:
+            watch.append(self._inotify_fd)
+            timeout = self.WAIT_TIMEOUT
+        else:
+            timeout = max(0.0, self._next_poll - time.monotonic())
+        ready, _, _ = select.select(watch, [], [], timeout)
+        if self._wake_pipe[0] in ready:
+            try:
+                os.read(self._wake_pipe[0], 4096)
+            except BlockingIOError:
+                pass
+
+        changes = []
+        for fd in ready:
+            if fd in self._input_fds:
+                changes.extend(self._read_input(fd))
+
+        touched, removed = set(), set()
+        if self._inotify_fd is not None:
+            if self._inotify_fd in ready:
+                touched, removed = self._read_inotify()
+        elif time.monotonic() >= self._next_poll:
+            self._next_poll = time.monotonic() + self.POLL_INTERVAL
+            current = set(self._nodes())
+            previous = set(self._known) | self._ignored
+            touched, removed = current - previous, previous - current
+
+        for node in removed:
+            self._ignored.discard(node)
+            if node in self._known:
+                changes.append(('removed', self._known.pop(node)))
+        # IN_ATTRIB: udev ajusta permisos después de crear el nodo
+        proc = self._read_proc() if touched else None
+        for node in touched:
+            if node in self._known or not EVENT_NODE_PATTERN.match(node):
+                continue
+            gamepad = self._probe(node, proc)
+            if gamepad:
+                self._ignored.discard(node)
+                changes.append(('added', gamepad))
+            else:
+                self._ignored.add(node)
+        return changes
+
+    def shutdown(self):
+        """Cierra inotify y los nodos abiertos para diagnóstico"""
+        for node in list(self._input_nodes):
+            self._close_input(node)
+        if self._inotify_fd is not None:
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
+        if self._wake_pipe:
+            for fd in self._wake_pipe:
+                os.close(fd)
+            self._wake_pipe = None
+        self._known.clear()
+        self._ignored.clear()
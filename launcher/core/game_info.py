@@ -285,6 +285,9 @@ class GameInfo:
     
     def __init__(self):
         self.database = GAMES_DATABASE
+        # ID -> entrada de la base (o None): la búsqueda flexible recorre toda la base
+        self._info_cache = {}
+        self._flexible_ids = None
         self.custom_configs = {}
         self._load_custom_configs()
         
@@ -307,39 +310,56 @@ class GameInfo:
         
         with open(config_path / "game_configs.json", 'w') as f:
             json.dump(self.custom_configs, f, indent=2)
+            
+    def update_custom_config(self, game_id: str, overrides: Dict):
+        """
+        Agrega claves a la configuración personalizada de un juego. Solo se
+        guarda lo que el usuario (o el ajuste automático) cambió: el resto
+        sigue saliendo de la base de datos.
+        """
+        self.save_custom_config(game_id, {**self.custom_configs.get(game_id, {}), **overrides})
         
     def get_game_info(self, game_id: str) -> Dict:
         """Obtiene info del juego por su ID"""
+        if game_id in self._info_cache:
+            return self._info_cache[game_id]
+        info = self._find_game_info(game_id)
+        self._info_cache[game_id] = info
+        return info
+    
+    def _find_game_info(self, game_id: str) -> Dict:
         # Normalizar ID (reemplazar - por _ y viceversa)
         normalized_id = game_id.replace('-', '_').replace('.', '.')
         
         if normalized_id in self.database:
             return self.database[normalized_id]
         
-        # Intentar con variaciones del ID
-        for db_id, info in self.database.items():
-            if self._ids_match(game_id, db_id):
-                return info
-                
-        return None
+        # Intentar con variaciones del ID (índice de IDs normalizados, una vez)
+        if self._flexible_ids is None:
+            self._flexible_ids = {}
+            for db_id, info in self.database.items():
+                self._flexible_ids.setdefault(self._normalize_id(db_id), info)
+        return self._flexible_ids.get(self._normalize_id(game_id))
+    
+    @staticmethod
+    def _normalize_id(game_id: str) -> str:
+        return game_id.replace('-', '').replace('_', '').replace('.', '').upper()
     
     def _ids_match(self, id1: str, id2: str) -> bool:
         """Compara dos Game IDs de forma flexible"""
-        # Normalizar ambos IDs
-        norm1 = id1.replace('-', '').replace('_', '').replace('.', '').upper()
-        norm2 = id2.replace('-', '').replace('_', '').replace('.', '').upper()
-        return norm1 == norm2
+        return self._normalize_id(id1) == self._normalize_id(id2)
     
     def get_optimal_config(self, game_id: str) -> Dict:
         """Obtiene la configuración óptima para un juego"""
-        # Primero revisar configuraciones personalizadas
-        if game_id in self.custom_configs:
-            return self.custom_configs[game_id]
-            
         game_info = self.get_game_info(game_id)
         if game_info and 'config' in game_info:
-            return game_info['config']
-        return DEFAULT_CONFIG.copy()
+            config = game_info['config']
+        else:
+            config = DEFAULT_CONFIG.copy()
+        # Las claves personalizadas se aplican sobre la base de datos
+        if game_id in self.custom_configs:
+            return {**config, **self.custom_configs[game_id]}
+        return config
     
     def get_game_name(self, game_id: str, fallback: str = None) -> str:
         """Obtiene el nombre del juego"""
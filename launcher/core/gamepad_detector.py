@@ -1,20 +1,36 @@
 """
 Gamepad Detector - Detecta y mapea mandos conectados
 """
+import importlib.util
 import json
+import os
+import queue
+import sys
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from dataclasses import dataclass, field, replace
 from enum import Enum
 import threading
 import time
 
-# Intentar importar pygame para detección de gamepads
-try:
-    import pygame
-    PYGAME_AVAILABLE = True
-except ImportError:
-    PYGAME_AVAILABLE = False
+from core.controller_ports import ControllerPorts
+from core.ini_file import find_pcsx2_ini, load_ini, patch_ini
+from core.stick_calibration import StickCalibration
+
+# pygame (SDL) tarda en cargar: aquí solo se comprueba que esté instalado
+# y se importa al crear el backend, ya en el hilo de entrada
+PYGAME_AVAILABLE = importlib.util.find_spec("pygame") is not None
+pygame = None
+
+
+def _import_pygame():
+    """Importa pygame la primera vez que se usa"""
+    global pygame
+    if pygame is None:
+        import pygame as module
+        pygame = module
+    return pygame
 
 
 class ControllerType(Enum):
@@ -29,9 +45,9 @@ class ControllerType(Enum):
     GENERIC = "generic"
 
 
-@dataclass
+@dataclass(frozen=True)
 class GamepadInfo:
-    """Información de un gamepad detectado"""
+    """Información de un gamepad detectado (inmutable: se publica entre hilos)"""
     id: int
     name: str
     controller_type: ControllerType
@@ -39,12 +55,27 @@ class GamepadInfo:
     num_buttons: int
     num_hats: int
     guid: str = ""
+    # Identificador estable mientras el dispositivo siga conectado
+    instance_id: int = -1
+    vendor_id: int = 0
+    product_id: int = 0
+    # Mapeo SDL real del mando ({'a': 'b0', 'leftx': 'a0', ...}) si se conoce
+    layout: Dict[str, str] = field(default_factory=dict)
+
+
+class InputEvent(NamedTuple):
+    """Evento de entrada de un mando (modo diagnóstico de los backends)"""
+    t_ns: int          # Marca de tiempo monotónica en ns (time.perf_counter_ns)
+    instance_id: int
+    kind: str          # 'axis', 'button' o 'hat'
+    code: int          # Índice del eje/botón/cruceta (o código evdev)
+    value: float       # En crucetas: (x + 1) * 3 + (y + 1), 4 = centro
 
 
 # Mapeo de nombres de controladores a tipos
 CONTROLLER_NAME_PATTERNS = {
     ControllerType.PS5_DUALSENSE: [
-        "dualsense", "ps5", "playstation 5", "wireless controller"
+        "dualsense", "ps5", "playstation 5"
     ],
     ControllerType.PS4_DUALSHOCK: [
         "dualshock", "ps4", "playstation 4", "sony interactive"
@@ -192,98 +223,486 @@ PS2_BUTTON_MAPPINGS[ControllerType.NINTENDO_SWITCH_PRO] = {
 }
 
 
+# Elementos SDL -> botón de PS2 (para mandos con mapeo conocido)
+SDL_TO_PS2 = {
+    'a': 'cross', 'b': 'circle', 'x': 'square', 'y': 'triangle',
+    'back': 'select', 'start': 'start',
+    'leftshoulder': 'l1', 'rightshoulder': 'r1',
+    'lefttrigger': 'l2', 'righttrigger': 'r2',
+    'leftstick': 'l3', 'rightstick': 'r3',
+    'dpup': 'up', 'dpdown': 'down', 'dpleft': 'left', 'dpright': 'right',
+    'leftx': 'left_x', 'lefty': 'left_y', 'rightx': 'right_x', 'righty': 'right_y',
+}
+
+
+def layout_to_ps2_mapping(layout: Dict[str, str]) -> Dict:
+    """Mapeo SDL del mando -> formato de PS2_BUTTON_MAPPINGS"""
+    mapping = {}
+    for element, ps2_name in SDL_TO_PS2.items():
+        binding = layout.get(element, '').lstrip('+-~')
+        if binding.startswith('b') and binding[1:].isdigit():
+            mapping[int(binding[1:])] = ps2_name
+        elif binding.startswith('a') and binding[1:].isdigit():
+            mapping[f"axis_{binding[1:]}"] = ps2_name
+    return mapping
+
+
+# Sección [PadN] de PCSX2.ini con el mapeo estándar SDL
+# (compatible con todos los mandos modernos)
+SDL_PAD_CONFIG = {
+    'Type': 'DualShock2',
+    'InvertL': 0,
+    'InvertR': 0,
+    'Deadzone': 0,
+    'AxisScale': 1.33,
+    'LargeMotorScale': 1,
+    'SmallMotorScale': 1,
+    'ButtonDeadzone': 0,
+    'PressureModifier': 0.5,
+    'Up': 'SDL-0/DPadUp',
+    'Right': 'SDL-0/DPadRight',
+    'Down': 'SDL-0/DPadDown',
+    'Left': 'SDL-0/DPadLeft',
+    'Triangle': 'SDL-0/FaceNorth',
+    'Circle': 'SDL-0/FaceEast',
+    'Cross': 'SDL-0/FaceSouth',
+    'Square': 'SDL-0/FaceWest',
+    'Select': 'SDL-0/Back',
+    'Start': 'SDL-0/Start',
+    'L1': 'SDL-0/LeftShoulder',
+    'L2': 'SDL-0/+LeftTrigger',
+    'R1': 'SDL-0/RightShoulder',
+    'R2': 'SDL-0/+RightTrigger',
+    'L3': 'SDL-0/LeftStick',
+    'R3': 'SDL-0/RightStick',
+    'LUp': 'SDL-0/-LeftY',
+    'LRight': 'SDL-0/+LeftX',
+    'LDown': 'SDL-0/+LeftY',
+    'LLeft': 'SDL-0/-LeftX',
+    'RUp': 'SDL-0/-RightY',
+    'RRight': 'SDL-0/+RightX',
+    'RDown': 'SDL-0/+RightY',
+    'RLeft': 'SDL-0/-RightX',
+    'Analog': 'SDL-0/Guide',
+    'LargeMotor': 'SDL-0/LargeMotor',
+    'SmallMotor': 'SDL-0/SmallMotor',
+}
+
+
+class PygameBackend:
+    """
+    Backend de detección con pygame/SDL. Los cambios llegan como eventos
+    JOYDEVICEADDED/JOYDEVICEREMOVED; solo se abre el dispositivo que cambió.
+    """
+    
+    name = "pygame"
+    WAIT_TIMEOUT_MS = 250
+    # pygame no expone la marca de tiempo de SDL: los eventos se marcan al vaciar la cola
+    precise_timestamps = False
+    # Mismo SDL que PCSX2: el orden de instance_id es el de sus índices SDL-N
+    sdl_device_order = True
+    
+    def __init__(self):
+        _import_pygame()
+        self._joysticks: Dict[int, object] = {}
+        self._input_events = False
+        self._input_applied = False
+        
+    def set_input_events(self, enabled: bool):
+        """
+        Activa el modo diagnóstico: wait_events también retorna
+        ('input', InputEvent). Se aplica en el hilo que espera eventos.
+        """
+        self._input_events = enabled
+        
+    def _apply_input_mode(self):
+        if self._input_applied == self._input_events:
+            return
+        input_types = [pygame.JOYAXISMOTION, pygame.JOYBUTTONDOWN,
+                       pygame.JOYBUTTONUP, pygame.JOYHATMOTION]
+        if self._input_events:
+            pygame.event.set_allowed(input_types)
+        else:
+            pygame.event.set_blocked(input_types)
+        self._input_applied = self._input_events
+        
+    def initialize(self):
+        """Inicializa SDL (joystick + cola de eventos, sin crear ventanas)"""
+        pygame.joystick.init()
+        try:
+            pygame.display.init()
+        except pygame.error:
+            # Sin servidor gráfico: la cola de eventos funciona igual con el driver dummy
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            pygame.display.init()
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED,
+                                  pygame.USEREVENT])
+        
+    def wake(self):
+        """Interrumpe wait_events desde otro hilo"""
+        try:
+            pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+        except pygame.error:
+            pass
+        
+    def _open(self, device_index: int) -> Optional[GamepadInfo]:
+        """Abre un dispositivo y retorna su información"""
+        joy = pygame.joystick.Joystick(device_index)
+        joy.init()
+        instance_id = joy.get_instance_id()
+        self._joysticks[instance_id] = joy
+        guid = ""
+        try:
+            guid = joy.get_guid()
+        except Exception:
+            pass
+        return GamepadInfo(
+            id=device_index,
+            name=joy.get_name(),
+            controller_type=ControllerType.UNKNOWN,
+            num_axes=joy.get_numaxes(),
+            num_buttons=joy.get_numbuttons(),
+            num_hats=joy.get_numhats(),
+            guid=guid,
+            instance_id=instance_id,
+        )
+        
+    def axis_values(self, instance_id: int) -> Dict[int, float]:
+        """Posición actual de los ejes de un mando (-1..1)"""
+        joy = self._joysticks.get(instance_id)
+        if joy is None:
+            return {}
+        return {axis: joy.get_axis(axis) for axis in range(joy.get_numaxes())}
+        
+    def enumerate(self) -> List[GamepadInfo]:
+        """Dispositivos conectados ahora mismo"""
+        devices = []
+        for index in range(pygame.joystick.get_count()):
+            devices.append(self._open(index))
+        return devices
+    
+    def wait_events(self) -> List[Tuple[str, object]]:
+        """
+        Espera cambios (hasta WAIT_TIMEOUT_MS). Retorna ('added', GamepadInfo)
+        o ('removed', instance_id), y ('input', InputEvent) en modo diagnóstico.
+        """
+        self._apply_input_mode()
+        changes = []
+        event = pygame.event.wait(self.WAIT_TIMEOUT_MS)
+        while event.type != pygame.NOEVENT:
+            if event.type == pygame.JOYAXISMOTION:
+                changes.append(('input', InputEvent(time.perf_counter_ns(), event.instance_id,
+                                                    'axis', event.axis, event.value)))
+            elif event.type in (pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP):
+                changes.append(('input', InputEvent(time.perf_counter_ns(), event.instance_id,
+                                                    'button', event.button,
+                                                    1.0 if event.type == pygame.JOYBUTTONDOWN else 0.0)))
+            elif event.type == pygame.JOYHATMOTION:
+                x, y = event.value
+                changes.append(('input', InputEvent(time.perf_counter_ns(), event.instance_id,
+                                                    'hat', event.hat, float((x + 1) * 3 + (y + 1)))))
+            elif event.type == pygame.JOYDEVICEADDED:
+                changes.append(('added', self._open(event.device_index)))
+            elif event.type == pygame.JOYDEVICEREMOVED:
+                joy = self._joysticks.pop(event.instance_id, None)
+                if joy is not None:
+                    joy.quit()
+                changes.append(('removed', event.instance_id))
+            event = pygame.event.poll()
+        return changes
+    
+    def shutdown(self):
+        """Libera SDL"""
+        self._joysticks.clear()
+        pygame.joystick.quit()
+
+
+def create_backend(preferred: str = None):
+    """
+    Backend disponible en este sistema (None si no hay ninguno).
+    `preferred` puede ser 'pygame' o 'evdev'; sin pygame se usa evdev en Linux.
+    'replay:<traza>' reproduce una traza grabada (ver input_trace.py).
+    """
+    if preferred and preferred.startswith('replay:'):
+        from core.input_trace import ReplayBackend
+        return ReplayBackend(preferred[len('replay:'):])
+    if preferred != 'evdev' and PYGAME_AVAILABLE:
+        return PygameBackend()
+    if not sys.platform.startswith('linux'):
+        return None
+    from core.evdev_backend import EvdevBackend
+    backend = EvdevBackend()
+    return backend if backend.is_supported() else None
+
+
+class GamepadSnapshot(NamedTuple):
+    """Estado publicado por el hilo de entrada (inmutable)"""
+    gamepads: Tuple[GamepadInfo, ...] = ()
+    active: Optional[GamepadInfo] = None
+
+
 class GamepadDetector:
-    """Detecta y gestiona gamepads conectados"""
+    """
+    Detecta y gestiona gamepads conectados.
+    
+    Un solo hilo de entrada es dueño del backend: lo inicializa, enumera,
+    espera sus eventos y lo cierra. El resto de los hilos solo lee
+    `snapshot`, una tupla inmutable que ese hilo reemplaza entera en cada
+    cambio, así que nunca ve un registro a medias ni espera un escaneo.
+    Las altas y bajas llegan a la interfaz por `poll_events()`, una cola
+    que la ventana vacía con after(); lo que haya que pedirle al backend
+    desde otro hilo se encola con `_call_in_input_thread`.
+    """
     
-    def __init__(self, logger=None):
+    EVENT_QUEUE_SIZE = 256
+    READY_TIMEOUT = 5.0
+    COMMAND_TIMEOUT = 1.0
+    # Errores de un listener de entrada antes de quitarlo
+    MAX_LISTENER_ERRORS = 20
+    
+    def __init__(self, logger=None, backend=None, controller_db=None, ports=None,
+                 calibration=None):
+        """
+        `backend` es un objeto backend o su nombre ('pygame', 'evdev').
+        `controller_db` (ver controller_db.py) identifica por GUID/VID:PID.
+        `ports` (ControllerPorts) recuerda el puerto de cada mando.
+        `calibration` (StickCalibration) aporta Deadzone/AxisScale por mando.
+        """
         self.logger = logger
-        self.gamepads: List[GamepadInfo] = []
-        self.active_gamepad: Optional[GamepadInfo] = None
+        self.controller_db = controller_db
+        self.ports = ports or ControllerPorts(logger=logger)
+        self.calibration = calibration or StickCalibration(logger=logger)
+        self.backend = None if isinstance(backend, str) else backend
+        self._backend_name = backend if isinstance(backend, str) else None
+        self.snapshot = GamepadSnapshot()
+        # Registro por instance_id: solo lo toca el hilo de entrada
+        self._devices: Dict[int, GamepadInfo] = {}
+        # Solo serializa a quienes publican un snapshot; leer no toma lock
+        self._publish_lock = threading.Lock()
+        self._commands: queue.Queue = queue.Queue()
+        self._events: queue.Queue = queue.Queue(maxsize=self.EVENT_QUEUE_SIZE)
         self._initialized = False
-        self._monitor_thread = None
-        self._stop_monitoring = False
+        self._thread = None
+        self._ready = threading.Event()
+        self._stop = False
         self._on_gamepad_connected = None
         self._on_gamepad_disconnected = None
+        self._input_listeners = []
+        self._listener_errors: Dict[object, int] = {}
+        self._pcsx2_ini = None
+        self._warned_not_sdl = False
+        self.diagnostics = None
+        
+    @property
+    def gamepads(self) -> Tuple[GamepadInfo, ...]:
+        """Mandos conectados (del último snapshot)"""
+        return self.snapshot.gamepads
+    
+    @property
+    def active_gamepad(self) -> Optional[GamepadInfo]:
+        return self.snapshot.active
         
     def initialize(self) -> bool:
-        """Inicializa el sistema de detección de gamepads"""
-        if not PYGAME_AVAILABLE:
-            if self.logger:
-                self.logger.warning("pygame no disponible - detección de mandos deshabilitada")
-            return False
+        """Arranca el hilo de entrada y espera a que el backend esté listo"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop = False
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._input_loop, name="gamepad-input",
+                                            daemon=True)
+            self._thread.start()
+        self._ready.wait(self.READY_TIMEOUT)
+        return self._initialized
             
+    def scan(self) -> Tuple[GamepadInfo, ...]:
+        """
+        Mandos conectados. El hilo de entrada enumera al arrancar y después
+        mantiene el registro con los eventos del backend.
+        """
+        if not self.initialize():
+            return ()
+        return self.snapshot.gamepads
+    
+    def _input_loop(self):
+        """Hilo de entrada: dueño del backend de principio a fin"""
+        if self.backend is None:
+            try:
+                self.backend = create_backend(self._backend_name)
+            except Exception as e:
+                self._log_error(f"Error creando el backend de mandos: {e}")
+        if self.backend is None:
+            if self.logger:
+                self.logger.warning("pygame/evdev no disponible - detección de mandos deshabilitada")
+            self._ready.set()
+            return
         try:
-            pygame.init()
-            pygame.joystick.init()
+            self.backend.initialize()
             self._initialized = True
-            self._log_info("Sistema de gamepads inicializado")
-            return True
+            self._log_info(f"Sistema de gamepads inicializado ({self.backend.name})")
+            devices = self.backend.enumerate()
         except Exception as e:
-            self._log_error(f"Error inicializando pygame: {e}")
-            return False
-            
-    def scan(self) -> List[GamepadInfo]:
-        """Escanea gamepads conectados"""
-        if not self._initialized:
-            if not self.initialize():
-                return []
-                
-        self.gamepads = []
+            self._log_error(f"Error inicializando {self.backend.name}: {e}")
+            self._initialized = False
+            self._ready.set()
+            return
+        for gamepad in devices:
+            self._add_device(gamepad)
+        self._ready.set()
         
+        while not self._stop:
+            self._run_commands()
+            try:
+                changes = self.backend.wait_events()
+            except Exception as e:
+                self._log_error(f"Error en monitoreo: {e}")
+                time.sleep(1)
+                continue
+                
+            for kind, value in changes:
+                if kind == 'input':
+                    for listener in self._input_listeners:
+                        try:
+                            listener(value)
+                        except Exception as e:
+                            self._listener_failed(listener, e)
+                elif kind == 'added':
+                    gamepad = self._add_device(value)
+                    if gamepad:
+                        self._notify('connected', gamepad, self._on_gamepad_connected)
+                elif kind == 'removed':
+                    gamepad = self._remove_device(value)
+                    if gamepad:
+                        self._notify('disconnected', gamepad, self._on_gamepad_disconnected)
+                        
+        self._run_commands()
         try:
-            pygame.joystick.quit()
-            pygame.joystick.init()
-            
-            count = pygame.joystick.get_count()
-            self._log_info(f"Gamepads detectados: {count}")
-            
-            for i in range(count):
-                try:
-                    joy = pygame.joystick.Joystick(i)
-                    joy.init()
-                    
-                    name = joy.get_name()
-                    controller_type = self._identify_controller_type(name)
-                    
-                    # Obtener GUID si está disponible
-                    guid = ""
-                    try:
-                        guid = joy.get_guid()
-                    except:
-                        pass
-                    
-                    gamepad = GamepadInfo(
-                        id=i,
-                        name=name,
-                        controller_type=controller_type,
-                        num_axes=joy.get_numaxes(),
-                        num_buttons=joy.get_numbuttons(),
-                        num_hats=joy.get_numhats(),
-                        guid=guid
-                    )
-                    
-                    self.gamepads.append(gamepad)
-                    self._log_info(
-                        f"Gamepad {i}: {name} "
-                        f"(Tipo: {controller_type.value}, "
-                        f"Botones: {gamepad.num_buttons}, "
-                        f"Ejes: {gamepad.num_axes})"
-                    )
-                    
-                except Exception as e:
-                    self._log_error(f"Error inicializando gamepad {i}: {e}")
-                    
+            self.backend.shutdown()
         except Exception as e:
-            self._log_error(f"Error escaneando gamepads: {e}")
-            
-        # Seleccionar el primer gamepad si no hay uno activo
-        if self.gamepads and not self.active_gamepad:
-            self.set_active_gamepad(0)
-            
-        return self.gamepads
+            self._log_error(f"Error cerrando {self.backend.name}: {e}")
+        self._devices.clear()
+        self._publish()
+        self._initialized = False
+    
+    def _publish(self):
+        """Publica un snapshot nuevo del registro (hilo de entrada)"""
+        with self._publish_lock:
+            active = self.snapshot.active
+            if active is None or self._devices.get(active.instance_id) is not active:
+                active = next(iter(self._devices.values()), None)
+            self.snapshot = GamepadSnapshot(tuple(self._devices.values()), active)
+    
+    def _listener_failed(self, listener, error: Exception):
+        """Un listener de entrada falló: se registra y, si insiste, se quita"""
+        errors = self._listener_errors.get(listener, 0) + 1
+        self._listener_errors[listener] = errors
+        if errors == 1:
+            self._log_error(f"Error en listener de entrada: {type(error).__name__}: {error}")
+        if errors >= self.MAX_LISTENER_ERRORS:
+            self._log_error(f"Listener de entrada quitado tras {errors} errores")
+            self._listener_errors.pop(listener, None)
+            self.remove_input_listener(listener)
+
+    def _notify(self, kind: str, gamepad: GamepadInfo, callback):
+        """Encola el cambio para la interfaz y avisa al callback, si hay"""
+        try:
+            self._events.put_nowait((kind, gamepad))
+        except queue.Full:
+            pass
+        if callback:
+            try:
+                callback(gamepad)
+            except Exception as e:
+                self._log_error(f"Error en callback de {kind}: {e}")
+    
+    def poll_events(self) -> List[Tuple[str, GamepadInfo]]:
+        """
+        Cambios pendientes: ('connected' | 'disconnected', GamepadInfo).
+        No bloquea; la interfaz lo llama desde after().
+        """
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+    
+    def _call_in_input_thread(self, func, *args):
+        """Ejecuta una llamada al backend en el hilo de entrada y espera el resultado"""
+        if threading.current_thread() is self._thread:
+            return func(*args)
+        if not (self._thread and self._thread.is_alive()):
+            raise RuntimeError("El hilo de entrada no está activo")
+        future = Future()
+        self._commands.put((future, func, args))
+        self._wake()
+        return future.result(self.COMMAND_TIMEOUT)
+    
+    def _run_commands(self):
+        while True:
+            try:
+                future, func, args = self._commands.get_nowait()
+            except queue.Empty:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                future.set_exception(e)
+    
+    def _wake(self):
+        """Despierta al hilo de entrada si está esperando eventos"""
+        wake = getattr(self.backend, 'wake', None)
+        if wake:
+            wake()
+    
+    def _add_device(self, gamepad: GamepadInfo) -> Optional[GamepadInfo]:
+        """Registra un dispositivo nuevo (hilo de entrada). None si ya estaba"""
+        if gamepad.instance_id in self._devices:
+            return None
+        gamepad = self._identify(gamepad)
+        self._devices[gamepad.instance_id] = gamepad
+        self._publish()
+        self._log_info(
+            f"Gamepad conectado: {gamepad.name} "
+            f"(Tipo: {gamepad.controller_type.value}, "
+            f"Botones: {gamepad.num_buttons}, "
+            f"Ejes: {gamepad.num_axes})"
+        )
+        return gamepad
+    
+    def _remove_device(self, instance_id: int) -> Optional[GamepadInfo]:
+        """Quita un dispositivo del registro (hilo de entrada)"""
+        gamepad = self._devices.pop(instance_id, None)
+        if gamepad is None:
+            return None
+        self._publish()
+        self._log_info(f"Gamepad desconectado: {gamepad.name}")
+        return gamepad
+    
+    def _identify(self, gamepad: GamepadInfo) -> GamepadInfo:
+        """
+        Tipo, IDs y mapeo real del mando: primero por GUID o VID:PID en la
+        base de mandos; el nombre solo se usa para mandos desconocidos.
+        """
+        match = None
+        if self.controller_db and gamepad.guid:
+            try:
+                match = self.controller_db.lookup(gamepad.guid, gamepad.name)
+            except Exception as e:
+                self._log_error(f"Error consultando la base de mandos: {e}")
+        changes = {}
+        if match:
+            changes.update(vendor_id=match['vendor_id'], product_id=match['product_id'],
+                           layout=match['layout'])
+        if match and match['controller_type']:
+            changes['controller_type'] = match['controller_type']
+        else:
+            changes['controller_type'] = self._identify_controller_type(gamepad.name)
+        return replace(gamepad, **changes)
     
     def _identify_controller_type(self, name: str) -> ControllerType:
-        """Identifica el tipo de controlador por su nombre"""
+        """Identifica el tipo de controlador por su nombre (mandos desconocidos)"""
         name_lower = name.lower()
         
         for controller_type, patterns in CONTROLLER_NAME_PATTERNS.items():
@@ -295,18 +714,24 @@ class GamepadDetector:
     
     def set_active_gamepad(self, gamepad_id: int) -> bool:
         """Establece el gamepad activo"""
-        for gamepad in self.gamepads:
-            if gamepad.id == gamepad_id:
-                self.active_gamepad = gamepad
-                self._log_info(f"Gamepad activo: {gamepad.name}")
-                return True
-        return False
+        with self._publish_lock:
+            snapshot = self.snapshot
+            for gamepad in snapshot.gamepads:
+                if gamepad.id == gamepad_id or gamepad.instance_id == gamepad_id:
+                    self.snapshot = snapshot._replace(active=gamepad)
+                    break
+            else:
+                return False
+        self._log_info(f"Gamepad activo: {gamepad.name}")
+        return True
     
     def get_button_mapping(self, gamepad: GamepadInfo = None) -> Dict:
         """Obtiene el mapeo de botones para el tipo de gamepad"""
         gamepad = gamepad or self.active_gamepad
         if not gamepad:
             return {}
+        if gamepad.layout:
+            return layout_to_ps2_mapping(gamepad.layout)
             
         return PS2_BUTTON_MAPPINGS.get(
             gamepad.controller_type,
@@ -319,137 +744,185 @@ class GamepadDetector:
         return mapping.get(button_index, f"button_{button_index}")
     
     def start_monitoring(self, on_connected=None, on_disconnected=None):
-        """Inicia el monitoreo de conexiones/desconexiones"""
-        if self._monitor_thread and self._monitor_thread.is_alive():
-            return
-            
-        self._on_gamepad_connected = on_connected
-        self._on_gamepad_disconnected = on_disconnected
-        self._stop_monitoring = False
-        
-        self._monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self._monitor_thread.start()
+        """
+        Inicia el hilo de entrada (si no estaba) con callbacks opcionales.
+        `on_connected(gamepad)` y `on_disconnected(gamepad)` se llaman desde
+        el hilo de entrada; la interfaz debe usar `poll_events()`.
+        """
+        if on_connected is not None:
+            self._on_gamepad_connected = on_connected
+        if on_disconnected is not None:
+            self._on_gamepad_disconnected = on_disconnected
+        self.initialize()
         
     def stop_monitoring(self):
-        """Detiene el monitoreo"""
-        self._stop_monitoring = True
-        if self._monitor_thread:
-            self._monitor_thread.join(timeout=1)
+        """Detiene el hilo de entrada (que cierra el backend)"""
+        self._stop = True
+        if self._thread and self._thread.is_alive():
+            self._wake()
+            self._thread.join(timeout=1)
+            
+    def add_input_listener(self, callback) -> bool:
+        """
+        Recibe los eventos de entrada (InputEvent) de todos los mandos desde
+        el hilo de entrada. El backend solo los entrega mientras haya
+        algún listener. Retorna False si el backend no lo permite.
+        """
+        if not self.initialize():
+            return False
+        if not hasattr(self.backend, 'set_input_events'):
+            self._log_error(f"El backend {self.backend.name} no entrega eventos de entrada")
+            return False
+        # Lista nueva en cada cambio: el hilo de entrada itera sin lock
+        self._input_listeners = self._input_listeners + [callback]
+        self.backend.set_input_events(True)
+        self._wake()
+        return True
+        
+    def remove_input_listener(self, callback):
+        self._input_listeners = [l for l in self._input_listeners if l != callback]
+        self._listener_errors.pop(callback, None)
+        if not self._input_listeners and self.backend is not None:
+            self.backend.set_input_events(False)
+            self._wake()
             
-    def _monitor_loop(self):
-        """Loop de monitoreo de gamepads"""
-        previous_count = len(self.gamepads)
+    def start_diagnostics(self, record: bool = False):
+        """
+        Empieza a medir la frecuencia de reporte y el jitter de los mandos
+        conectados (requiere el monitoreo activo). Con `record` también se
+        guardan los eventos para exportarlos como traza.
+        Retorna el InputDiagnostics que recibe los eventos.
+        """
+        from core.input_diagnostics import InputDiagnostics
+        diagnostics = InputDiagnostics(
+            record=record, approximate=not getattr(self.backend, 'precise_timestamps', True))
+        for gamepad in self.gamepads:
+            diagnostics.add_device(gamepad.instance_id, gamepad.name, gamepad.guid)
+        if not self.add_input_listener(diagnostics.feed):
+            return None
+        self.diagnostics = diagnostics
+        return diagnostics
         
-        while not self._stop_monitoring:
+    def stop_diagnostics(self) -> Optional[Dict]:
+        """Termina la medición y retorna el informe"""
+        diagnostics, self.diagnostics = self.diagnostics, None
+        if diagnostics is None:
+            return None
+        self.remove_input_listener(diagnostics.feed)
+        for gamepad in self.gamepads:
+            diagnostics.add_device(gamepad.instance_id, gamepad.name, gamepad.guid)
+        return diagnostics.report()
+    
+    def get_pad_config(self, gamepad: GamepadInfo, sdl_index: int) -> Dict:
+        """
+        Sección [PadN] para un mando (SDL-<índice>), con la zona muerta y la
+        escala de sticks de su calibración si la tiene.
+        """
+        source = f"SDL-{sdl_index}/"
+        config = {
+            key: value.replace("SDL-0/", source) if isinstance(value, str) else value
+            for key, value in SDL_PAD_CONFIG.items()
+        }
+        config.update(self.calibration.pad_settings(gamepad))
+        return config
+        
+    def start_calibration(self, gamepad: GamepadInfo = None):
+        """
+        Empieza a muestrear los sticks de un mando (CalibrationSampler).
+        El llamador pasa por las fases con `sampler.set_phase('rest')` y
+        `sampler.set_phase('sweep')` y termina con `finish_calibration`.
+        Retorna None si no se puede leer la entrada.
+        """
+        from core.stick_calibration import CalibrationSampler, default_stick_axes
+        gamepad = gamepad or self.active_gamepad
+        if gamepad is None:
+            return None
+        backend_name = self.backend.name if self.backend else 'pygame'
+        sampler = CalibrationSampler(gamepad.instance_id, default_stick_axes(gamepad, backend_name))
+        if not self.add_input_listener(sampler.feed):
+            return None
+        # Un stick quieto no genera eventos: se parte de su posición actual
+        if hasattr(self.backend, 'axis_values'):
             try:
-                current_gamepads = self.scan()
-                current_count = len(current_gamepads)
-                
-                if current_count > previous_count and self._on_gamepad_connected:
-                    # Nuevo gamepad conectado
-                    new_gamepad = current_gamepads[-1]
-                    self._on_gamepad_connected(new_gamepad)
-                elif current_count < previous_count and self._on_gamepad_disconnected:
-                    # Gamepad desconectado
-                    self._on_gamepad_disconnected()
-                    
-                previous_count = current_count
-                
-            except Exception as e:
-                self._log_error(f"Error en monitoreo: {e}")
-                
-            time.sleep(2)  # Revisar cada 2 segundos
+                sampler.values.update(
+                    self._call_in_input_thread(self.backend.axis_values, gamepad.instance_id))
+            except Exception:
+                pass
+        return sampler
+        
+    def finish_calibration(self, gamepad: GamepadInfo, sampler) -> Optional[Dict]:
+        """Analiza las muestras, guarda el resultado y actualiza PCSX2.ini"""
+        self.remove_input_listener(sampler.feed)
+        try:
+            result = sampler.analyze()
+        except ValueError:
+            result = {}
+        if not result:
+            self._log_error(f"Sin muestras de los sticks de {gamepad.name}")
+            return None
+        entry = self.calibration.save(gamepad, result)
+        if self._pcsx2_ini:
+            self.apply_pcsx2_config(self._pcsx2_ini)
+        return entry
     
     def apply_pcsx2_config(self, pcsx2_config_path: str = None) -> bool:
         """
-        Aplica la configuración del mando detectado a PCSX2 automáticamente.
-        Modifica PCSX2.ini para usar el mando como DualShock2.
+        Aplica la configuración de los mandos conectados a PCSX2.
+        Cada mando va a su puerto (ver controller_ports.py) como DualShock2,
+        los puertos que configuró el launcher y quedaron libres (Pad1 incluido,
+        y todos si no queda ningún mando) se desactivan y el multitap se
+        activa solo con más de dos jugadores. Todo en una sola escritura de
+        PCSX2.ini. Retorna True solo si el archivo cambió.
+        Trabaja sobre un snapshot: se llama desde la interfaz, nunca desde
+        el hilo de entrada.
         """
-        if not self.active_gamepad:
-            self._log_error("No hay gamepad activo para configurar")
-            return False
-        
-        # Buscar PCSX2.ini
-        import os
-        if pcsx2_config_path:
-            config_file = Path(pcsx2_config_path)
-        else:
-            # Buscar en ubicación por defecto
-            documents = Path(os.environ.get('USERPROFILE', '')) / 'Documents' / 'PCSX2' / 'inis' / 'PCSX2.ini'
-            if documents.exists():
-                config_file = documents
-            else:
-                self._log_error("No se encontró PCSX2.ini")
-                return False
+        snapshot = self.snapshot
         
+        config_file = Path(pcsx2_config_path) if pcsx2_config_path else find_pcsx2_ini()
+        if not config_file:
+            self._log_error("No se encontró PCSX2.ini")
+            return False
         if not config_file.exists():
             self._log_error(f"Archivo no encontrado: {config_file}")
             return False
+        self._pcsx2_ini = config_file
         
-        self._log_info(f"Configurando mando en PCSX2: {self.active_gamepad.name}")
+        if not getattr(self.backend, 'sdl_device_order', False):
+            # evdev no sabe qué SDL-N le dará PCSX2 a cada mando: mejor no
+            # escribir asignaciones que apunten al mando equivocado
+            if not self._warned_not_sdl:
+                self._warned_not_sdl = True
+                name = self.backend.name if self.backend else "ninguno"
+                self._log_warning(
+                    f"Backend de mandos {name}: PCSX2.ini no se modifica (índices SDL desconocidos)")
+            return False
         
-        # Mapeo estándar SDL para PCSX2 (compatible con todos los mandos modernos)
-        pad_config = """[Pad1]
-Type = DualShock2
-InvertL = 0
-InvertR = 0
-Deadzone = 0
-AxisScale = 1.33
-LargeMotorScale = 1
-SmallMotorScale = 1
-ButtonDeadzone = 0
-PressureModifier = 0.5
-Up = SDL-0/DPadUp
-Right = SDL-0/DPadRight
-Down = SDL-0/DPadDown
-Left = SDL-0/DPadLeft
-Triangle = SDL-0/FaceNorth
-Circle = SDL-0/FaceEast
-Cross = SDL-0/FaceSouth
-Square = SDL-0/FaceWest
-Select = SDL-0/Back
-Start = SDL-0/Start
-L1 = SDL-0/LeftShoulder
-L2 = SDL-0/+LeftTrigger
-R1 = SDL-0/RightShoulder
-R2 = SDL-0/+RightTrigger
-L3 = SDL-0/LeftStick
-R3 = SDL-0/RightStick
-LUp = SDL-0/-LeftY
-LRight = SDL-0/+LeftX
-LDown = SDL-0/+LeftY
-LLeft = SDL-0/-LeftX
-RUp = SDL-0/-RightY
-RRight = SDL-0/+RightX
-RDown = SDL-0/+RightY
-RLeft = SDL-0/-RightX
-Analog = SDL-0/Guide
-LargeMotor = SDL-0/LargeMotor
-SmallMotor = SDL-0/SmallMotor"""
+        # Dentro de un mismo SDL los índices siguen el orden de conexión, que
+        # es el de instance_id (PCSX2 usa el índice de jugador si SDL lo da)
+        connected = sorted(snapshot.gamepads, key=lambda g: g.instance_id)
+        sdl_index = {gamepad.instance_id: index for index, gamepad in enumerate(connected)}
+        assignment = self.ports.assign(connected)
         
         try:
-            # Leer el archivo
-            with open(config_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Reemplazar sección [Pad1]
-            import re
-            # Buscar desde [Pad1] hasta la siguiente sección [
-            pattern = r'\[Pad1\].*?(?=\n\n\[|\Z)'
-            
-            if re.search(pattern, content, re.DOTALL):
-                # Reemplazar la sección existente
-                new_content = re.sub(pattern, pad_config, content, flags=re.DOTALL)
-            else:
-                # Agregar al final si no existe
-                new_content = content + "\n\n" + pad_config
+            current = load_ini(config_file)
+            sections = {
+                f"Pad{port}": self.get_pad_config(gamepad, sdl_index[gamepad.instance_id])
+                for port, gamepad in assignment.items()
+            }
+            for port in range(1, ControllerPorts.MAX_PORTS + 1):
+                # Puertos que configuró el launcher y ya no tienen mando
+                if port not in assignment and \
+                        (current.get(f"Pad{port}", "Up") or "").startswith("SDL-"):
+                    sections[f"Pad{port}"] = {'Type': 'None'}
+            patches = {'Pad': ControllerPorts.multitap_settings(assignment)}
             
-            # Guardar el archivo
-            with open(config_file, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            players = ", ".join(f"Pad{port}: {gamepad.name}"
+                                for port, gamepad in assignment.items()) or "ninguno"
+            if not patch_ini(config_file, patches, sections, label=f"mandos ({players})"):
+                # Ya estaba configurado: no tocar el archivo
+                return False
             
-            self._log_info(f"Configuración de mando aplicada a PCSX2")
-            self._log_info(f"Tipo: {get_controller_type_display_name(self.active_gamepad.controller_type)}")
+            self._log_info(f"Configuración de mandos aplicada a PCSX2: {players}")
             return True
             
         except Exception as e:
@@ -457,10 +930,8 @@ SmallMotor = SDL-0/SmallMotor"""
             return False
     
     def cleanup(self):
-        """Limpia recursos"""
+        """Limpia recursos (el hilo de entrada cierra el backend al salir)"""
         self.stop_monitoring()
-        if self._initialized and PYGAME_AVAILABLE:
-            pygame.joystick.quit()
             
     def _log_info(self, message: str):
         """Log de información"""
@@ -469,6 +940,13 @@ SmallMotor = SDL-0/SmallMotor"""
         else:
             print(f"[INFO] {message}")
             
+    def _log_warning(self, message: str):
+        """Log de advertencia"""
+        if self.logger:
+            self.logger.warning(message)
+        else:
+            print(f"[WARNING] {message}")
+            
     def _log_error(self, message: str):
         """Log de error"""
         if self.logger:
@@ -0,0 +1,336 @@
+"""
+INI File - Modelo de INI de PCSX2 que conserva comentarios y orden
+"""
+import os
+import stat
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class IniDocument:
+    """
+    INI editable línea a línea. Las claves existentes se reescriben en su
+    sitio; las nuevas se agregan al final de su sección. Comentarios,
+    líneas en blanco y orden se conservan tal cual.
+    """
+
+    def __init__(self, text: str = ""):
+        self.newline = "\r\n" if "\r\n" in text else "\n"
+        self.trailing_newline = text.endswith(("\n", "\r\n")) or not text
+        self.lines: List[str] = text.splitlines()
+        # sección -> (línea de cabecera, {clave: línea})
+        self._index: Dict[str, Tuple[int, Dict[str, int]]] = {}
+        self._order: List[str] = []
+        self._reindex()
+
+    def copy(self) -> 'IniDocument':
+        """Copia independiente (sin volver a parsear)"""
+        doc = IniDocument.__new__(IniDocument)
+        doc.newline = self.newline
+        doc.trailing_newline = self.trailing_newline
+        doc.lines = list(self.lines)
+        doc._index = {name: (header, dict(keys)) for name, (header, keys) in self._index.items()}
+        doc._order = list(self._order)
+        return doc
+
+    def _reindex(self):
+        """Reconstruye el índice de secciones y claves"""
+        self._index = {}
+        self._order = []
+        # Las claves antes de la primera sección van en la sección ""
+        current = ""
+        self._index[current] = (-1, {})
+        for number, line in enumerate(self.lines):
+            stripped = line.strip()
+            if stripped.startswith('[') and stripped.endswith(']'):
+                current = stripped[1:-1].strip()
+                if current not in self._index:
+                    self._index[current] = (number, {})
+                    self._order.append(current)
+                continue
+            if not stripped or stripped[0] in ';#' or '=' not in stripped:
+                continue
+            key = stripped.split('=', 1)[0].strip()
+            self._index[current][1][key] = number
+
+    def sections(self) -> List[str]:
+        """Nombres de sección en orden"""
+        return list(self._order)
+
+    def has_section(self, section: str) -> bool:
+        return section in self._index and (section == "" or self._index[section][0] >= 0)
+
+    def items(self, section: str) -> Dict[str, str]:
+        """Claves y valores de una sección"""
+        if section not in self._index:
+            return {}
+        return {key: self._value_at(line) for key, line in self._index[section][1].items()}
+
+    def get(self, section: str, key: str, default: str = None) -> Optional[str]:
+        """Valor de una clave (como texto)"""
+        line = self._index.get(section, (None, {}))[1].get(key)
+        if line is None:
+            return default
+        return self._value_at(line)
+
+    def _value_at(self, line_number: int) -> str:
+        return self.lines[line_number].split('=', 1)[1].strip()
+
+    def set(self, section: str, key: str, value: Any) -> bool:
+        """Fija una clave; retorna True si el contenido cambió"""
+        text = format_ini_value(value)
+        keys = self._index.get(section, (None, {}))[1]
+        if key in keys:
+            line_number = keys[key]
+            if self._value_at(line_number) == text:
+                return False
+            self.lines[line_number] = f"{key} = {text}"
+            return True
+
+        insert_at = self._section_end(section)
+        self.lines.insert(insert_at, f"{key} = {text}")
+        self._reindex()
+        return True
+
+    def remove(self, section: str, key: str) -> bool:
+        """Elimina una clave; retorna True si existía"""
+        line_number = self._index.get(section, (None, {}))[1].get(key)
+        if line_number is None:
+            return False
+        del self.lines[line_number]
+        self._reindex()
+        return True
+
+    def replace_section(self, section: str, values: Dict[str, Any]) -> bool:
+        """
+        Deja la sección con exactamente estas claves, en este orden.
+        Retorna True si el contenido cambió.
+        """
+        new_body = [f"{key} = {format_ini_value(value)}" for key, value in values.items()]
+        if not self.has_section(section):
+            self._append_section(section, new_body)
+            return True
+
+        header = self._index[section][0]
+        end = self._section_end(section)
+        if self.lines[header + 1:end] == new_body:
+            return False
+        self.lines[header + 1:end] = new_body
+        self._reindex()
+        return True
+
+    def _append_section(self, section: str, body: List[str]):
+        if self.lines and self.lines[-1].strip():
+            self.lines.append("")
+        self.lines.append(f"[{section}]")
+        self.lines.extend(body)
+        self._reindex()
+
+    def _section_end(self, section: str) -> int:
+        """Índice tras la última línea no vacía de la sección (la crea si falta)"""
+        if not self.has_section(section):
+            self._append_section(section, [])
+        header = self._index[section][0]
+        following = [
+            h for name, (h, _) in self._index.items()
+            if name != section and h > header
+        ]
+        end = min(following) if following else len(self.lines)
+        while end - 1 > header and not self.lines[end - 1].strip():
+            end -= 1
+        return end
+
+    def apply(self, patches: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        Aplica parches {sección: {clave: valor}}. Un valor None elimina la
+        clave. Retorna True si algo cambió.
+        """
+        changed = False
+        for section, values in patches.items():
+            for key, value in values.items():
+                if value is None:
+                    changed |= self.remove(section, key)
+                else:
+                    changed |= self.set(section, key, value)
+        return changed
+
+    def render(self) -> str:
+        """Texto completo del INI"""
+        text = self.newline.join(self.lines)
+        if self.trailing_newline and self.lines:
+            text += self.newline
+        return text
+
+
+def format_ini_value(value: Any) -> str:
+    """Convierte un valor Python al formato de PCSX2.ini"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value)
+
+
+# Caché de parseo: ruta -> ((mtime_ns, tamaño), documento)
+_cache: Dict[str, Tuple[Tuple[int, int], IniDocument]] = {}
+_lock = threading.RLock()
+# Callbacks (ruta, texto anterior o None, texto nuevo, motivo) tras cada escritura
+_write_listeners: List[Callable[[Path, Optional[str], str, str], None]] = []
+
+
+def add_write_listener(callback: Callable[[Path, Optional[str], str, str], None]):
+    """Registra un callback que se llama tras cada escritura de un INI"""
+    with _lock:
+        if callback not in _write_listeners:
+            _write_listeners.append(callback)
+
+
+def remove_write_listener(callback):
+    """Elimina un callback registrado"""
+    with _lock:
+        if callback in _write_listeners:
+            _write_listeners.remove(callback)
+
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_ini(path) -> IniDocument:
+    """
+    Lee un INI usando la caché si el archivo no cambió (mtime y tamaño).
+    Retorna una copia que el llamador puede modificar libremente.
+    """
+    path = Path(path)
+    with _lock:
+        key = _stat_key(path)
+        cached = _cache.get(str(path))
+        if cached and key is not None and cached[0] == key:
+            return cached[1].copy()
+        if key is None:
+            return IniDocument()
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            doc = IniDocument(f.read())
+        _cache[str(path)] = (key, doc)
+        return doc.copy()
+
+
+# mkstemp crea el temporal con 0600; al reemplazar se restauran los permisos
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _file_mode(path: Path) -> int:
+    """Permisos actuales del archivo, o los de un archivo nuevo según la umask"""
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+def write_text_atomic(path, text: str):
+    """Escribe un archivo de forma atómica (temporal + os.replace)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    mode = _file_mode(path)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def save_ini(path, doc: IniDocument, label: str = "") -> bool:
+    """
+    Guarda un documento solo si el resultado difiere del archivo actual.
+    `label` describe el cambio para los listeners. Retorna True si se escribió.
+    """
+    return save_ini_text(path, doc.render(), label, doc)
+
+
+def save_ini_text(path, text: str, label: str = "", doc: IniDocument = None) -> bool:
+    """Como save_ini, pero con el texto exacto a escribir"""
+    path = Path(path)
+    with _lock:
+        try:
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                current = f.read()
+        except FileNotFoundError:
+            current = None
+        if current == text:
+            return False
+        write_text_atomic(path, text)
+        key = _stat_key(path)
+        if doc is not None and key is not None:
+            _cache[str(path)] = (key, doc.copy())
+        else:
+            _cache.pop(str(path), None)
+        listeners = list(_write_listeners)
+    for callback in listeners:
+        try:
+            callback(path, current, text, label)
+        except Exception:
+            pass
+    return True
+
+
+def patch_ini(path, patches: Dict[str, Dict[str, Any]] = None,
+              sections: Dict[str, Dict[str, Any]] = None, label: str = "") -> bool:
+    """
+    Aplica parches de clave y/o reemplaza secciones completas en un INI.
+    No escribe nada si el resultado es idéntico. Retorna True si escribió.
+    """
+    with _lock:
+        doc = load_ini(path)
+        changed = False
+        for section, values in (sections or {}).items():
+            changed |= doc.replace_section(section, values)
+        if patches:
+            changed |= doc.apply(patches)
+        if not changed:
+            return False
+        return save_ini(path, doc, label)
+
+
+def find_pcsx2_ini(config_dir=None) -> Optional[Path]:
+    """Busca PCSX2.ini en la carpeta de config de PCSX2 y ubicaciones típicas"""
+    candidates = []
+    if config_dir:
+        config_dir = Path(config_dir)
+        candidates += [config_dir / "inis" / "PCSX2.ini", config_dir / "PCSX2.ini"]
+    if os.environ.get('USERPROFILE'):
+        candidates.append(Path(os.environ['USERPROFILE']) / "Documents" / "PCSX2" / "inis" / "PCSX2.ini")
+    if os.environ.get('APPDATA'):
+        candidates.append(Path(os.environ['APPDATA']) / "PCSX2" / "inis" / "PCSX2.ini")
+    home = Path.home()
+    candidates += [
+        Path(os.environ.get('XDG_CONFIG_HOME', home / ".config")) / "PCSX2" / "inis" / "PCSX2.ini",
+        home / ".var" / "app" / "net.pcsx2.PCSX2" / "config" / "PCSX2" / "inis" / "PCSX2.ini",
+    ]
+    for candidate in candidates:
+        if candidate.exists():
+            return candidate
+    return None
+
+
+if __name__ == "__main__":
+    # Test
+    doc = IniDocument("; comentario\n[UI]\nTheme = dark\n\n[Pad1]\nType = None\n\n[Pad2]\nType = None\n")
+    doc.replace_section("Pad1", {"Type": "DualShock2", "Up": "SDL-0/DPadUp"})
+    doc.set("UI", "StartFullscreen", True)
+    print(doc.render())
@@ -0,0 +1,206 @@
+"""
+INI Snapshots - Historial de los INI de PCSX2 guardado por contenido para deshacer cambios
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from core.ini_file import save_ini_text, write_text_atomic
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def _file_lock(lock_path: Path):
+    """Lock exclusivo entre procesos (la interfaz y las herramientas comparten el historial)"""
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    # LK_LOCK reintenta durante ~10 s antes de fallar
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class IniSnapshots:
+    """
+    Almacén direccionado por contenido de los estados de los INI de PCSX2.
+
+    Cada estado distinto se guarda una sola vez en objects/<sha256> y la
+    línea de tiempo registra cada escritura del launcher o las herramientas
+    (ruta, hash anterior, hash nuevo, motivo). El espacio crece con el
+    número de estados distintos, no con el de escrituras.
+
+    Se conecta a ini_file con `add_write_listener(snapshots.record)`.
+    La interfaz y tools/optimize_pcsx2.py pueden escribir a la vez desde
+    procesos distintos: cada escritura relee timeline.json y guarda el
+    estado, agrega la entrada y poda dentro de un mismo lock de archivo.
+    """
+
+    MAX_TIMELINE = 500
+
+    def __init__(self, snapshot_dir: str, logger=None):
+        self.snapshot_dir = Path(snapshot_dir)
+        self.objects_dir = self.snapshot_dir / "objects"
+        self.timeline_file = self.snapshot_dir / "timeline.json"
+        self.lock_file = self.snapshot_dir / "timeline.lock"
+        self.logger = logger
+        self._lock = threading.Lock()
+
+    def _log(self, message: str, level: str = "info"):
+        """Helper para logging"""
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(f"[{level.upper()}] {message}")
+
+    @contextmanager
+    def _locked(self):
+        """Lock del hilo y del archivo: otro proceso puede estar escribiendo"""
+        with self._lock, _file_lock(self.lock_file):
+            yield
+
+    def _load_timeline(self) -> List[Dict]:
+        """Línea de tiempo tal como está en disco (otro proceso pudo cambiarla)"""
+        try:
+            with open(self.timeline_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _save_timeline(self, timeline: List[Dict]):
+        """Guarda la línea de tiempo (llamar con _locked)"""
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.timeline_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(timeline, f, indent=2)
+        os.replace(tmp_file, self.timeline_file)
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def put(self, text: str) -> str:
+        """
+        Guarda un estado (si no existe ya) y retorna su hash. Fuera de
+        `record` hay que tomar `_locked`: la poda borra los no referenciados.
+        """
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            write_text_atomic(path, text)
+        return digest
+
+    def read(self, digest: str) -> Optional[str]:
+        """Contenido de un estado"""
+        try:
+            with open(self._object_path(digest), 'r', encoding='utf-8', newline='') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def record(self, path, before: Optional[str], after: str, label: str = "") -> Dict:
+        """Registra una escritura (firma de listener de ini_file)"""
+        entry = {
+            'time': time.time(),
+            'path': str(Path(path).resolve()),
+            'label': label,
+        }
+        # Guardar, agregar y podar en una sola sección crítica: una poda de
+        # otro proceso no puede borrar un estado recién guardado
+        with self._locked():
+            entry['before'] = self.put(before) if before is not None else None
+            entry['after'] = self.put(after)
+            timeline = self._load_timeline()
+            entry['id'] = timeline[-1]['id'] + 1 if timeline else 1
+            timeline.append(entry)
+            if len(timeline) > self.MAX_TIMELINE:
+                del timeline[:-self.MAX_TIMELINE]
+                self._prune(timeline)
+            self._save_timeline(timeline)
+        return entry
+
+    def _prune(self, timeline: List[Dict]):
+        """Borra los estados que ya no aparecen en la línea de tiempo (llamar con _locked)"""
+        referenced = set()
+        for entry in timeline:
+            referenced.update(d for d in (entry['before'], entry['after']) if d)
+        if not self.objects_dir.exists():
+            return
+        for object_path in self.objects_dir.glob("*/*"):
+            if object_path.name not in referenced:
+                try:
+                    object_path.unlink()
+                except OSError:
+                    pass
+
+    def timeline(self, path=None) -> List[Dict]:
+        """Cambios registrados (de un INI o de todos), del más antiguo al más reciente"""
+        # timeline.json se reemplaza de forma atómica: leerlo no necesita lock
+        timeline = self._load_timeline()
+        if path is None:
+            return timeline
+        resolved = str(Path(path).resolve())
+        return [entry for entry in timeline if entry['path'] == resolved]
+
+    def restore(self, path, entry_id: int = None, state: str = 'before') -> bool:
+        """
+        Restaura el estado anterior (o posterior, con state='after') a un
+        cambio; por defecto deshace el último cambio del archivo. La
+        restauración es un reemplazo atómico y queda también en la línea de
+        tiempo, así que se puede deshacer.
+        """
+        path = Path(path)
+        entries = self.timeline(path)
+        if entry_id is not None:
+            entries = [entry for entry in entries if entry['id'] == entry_id]
+        if not entries:
+            self._log(f"No hay cambios registrados de {path}", "warning")
+            return False
+
+        entry = entries[-1]
+        digest = entry[state]
+        if digest is None:
+            self._log(f"El cambio {entry['id']} creó {path.name}: no hay estado anterior", "warning")
+            return False
+        text = self.read(digest)
+        if text is None:
+            self._log(f"Estado {digest[:12]} no encontrado", "error")
+            return False
+
+        if save_ini_text(path, text, f"restaurar cambio {entry['id']} ({state})"):
+            self._log(f"{path.name} restaurado al estado {digest[:12]}")
+        else:
+            self._log(f"{path.name} ya estaba en el estado {digest[:12]}")
+        return True
+
+    def get_stats(self) -> Dict:
+        """Cambios registrados y espacio usado"""
+        objects = list(self.objects_dir.glob("*/*")) if self.objects_dir.exists() else []
+        return {
+            'changes': len(self.timeline()),
+            'states': len(objects),
+            'size_bytes': sum(p.stat().st_size for p in objects),
+        }
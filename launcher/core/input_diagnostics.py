@@ -0,0 +1,266 @@
+"""
+Input Diagnostics - Frecuencia de reporte, latencia entre reportes y jitter de los mandos
+"""
+import bisect
+import json
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.gamepad_detector import InputEvent
+
+
+# Eventos a menos de esto pertenecen al mismo reporte USB/Bluetooth
+# (un reporte mueve varios ejes a la vez)
+REPORT_GROUP_NS = 300_000
+# Pausas más largas son el mando quieto, no su frecuencia de reporte
+IDLE_GAP_NS = 100_000_000
+MAX_INTERVALS = 20000
+MAX_RECORDED_EVENTS = 500_000
+MIN_REPORTS = 30
+
+# Límites superiores (ms) de las barras del histograma de intervalos
+HISTOGRAM_BUCKETS_MS = [0.5, 1, 2, 4, 8, 12, 16, 24, 33, 50, 100]
+
+BUS_USB = 0x0003
+BUS_BLUETOOTH = 0x0005
+LOW_RATE_HZ = 100
+BLUETOOTH_LOW_RATE_HZ = 200
+
+
+def guid_bus(guid: str) -> Optional[int]:
+    """Bus (USB 0x03, Bluetooth 0x05) codificado en un GUID de SDL"""
+    if not guid or len(guid) != 32:
+        return None
+    try:
+        return int(guid[2:4] + guid[0:2], 16)
+    except ValueError:
+        return None
+
+
+def _percentile(sorted_values: List[int], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class DeviceTiming:
+    """Intervalos entre reportes de un mando"""
+
+    def __init__(self, instance_id: int, name: str = "", guid: str = "", approximate: bool = False):
+        self.instance_id = instance_id
+        self.name = name
+        self.guid = guid
+        # Marcas tomadas al vaciar la cola de eventos, no al llegar el reporte
+        self.approximate = approximate
+        self.events = 0
+        self.reports = 0
+        self.idle_gaps = 0
+        self.first_ns: Optional[int] = None
+        self.last_ns: Optional[int] = None
+        self._report_ns: Optional[int] = None
+        self.intervals: deque = deque(maxlen=MAX_INTERVALS)
+        self.histogram = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+
+    def add(self, t_ns: int):
+        """Registra un evento; los del mismo reporte se agrupan"""
+        self.events += 1
+        if self.first_ns is None:
+            self.first_ns = t_ns
+        self.last_ns = t_ns
+        if self._report_ns is not None:
+            interval = t_ns - self._report_ns
+            if interval < REPORT_GROUP_NS:
+                return
+            if interval > IDLE_GAP_NS:
+                self.idle_gaps += 1
+            else:
+                self.intervals.append(interval)
+                self.histogram[bisect.bisect_left(HISTOGRAM_BUCKETS_MS, interval / 1e6)] += 1
+        self.reports += 1
+        self._report_ns = t_ns
+
+    def summary(self) -> Dict:
+        """Frecuencia, percentiles y avisos del mando"""
+        bus = guid_bus(self.guid)
+        result = {
+            'instance_id': self.instance_id,
+            'name': self.name,
+            'guid': self.guid,
+            'connection': {BUS_USB: 'usb', BUS_BLUETOOTH: 'bluetooth'}.get(bus, 'desconocida'),
+            'events': self.events,
+            'reports': self.reports,
+            'idle_gaps': self.idle_gaps,
+            'histogram_ms': dict(zip([str(b) for b in HISTOGRAM_BUCKETS_MS] + ['inf'],
+                                     self.histogram)),
+            'flags': [],
+        }
+        if self.approximate:
+            result['approximate'] = True
+            result['flags'].append('marcas_aproximadas')
+        if len(self.intervals) < MIN_REPORTS:
+            result['flags'].append('pocos_datos')
+            if not self.intervals:
+                return result
+
+        intervals = sorted(self.intervals)
+        p50 = _percentile(intervals, 0.50) / 1e6
+        p95 = _percentile(intervals, 0.95) / 1e6
+        p99 = _percentile(intervals, 0.99) / 1e6
+        rate = 1000.0 / p50 if p50 else 0.0
+        result.update({
+            'interval_ms': {
+                'min': round(intervals[0] / 1e6, 3),
+                'p50': round(p50, 3),
+                'p95': round(p95, 3),
+                'p99': round(p99, 3),
+                'max': round(intervals[-1] / 1e6, 3),
+            },
+            'jitter_ms': round(statistics.pstdev(intervals) / 1e6, 3),
+        })
+        if self.approximate:
+            # Los intervalos miden el bucle que vacía la cola: sin frecuencia del mando
+            return result
+        result['rate_hz'] = round(rate, 1)
+        if bus == BUS_BLUETOOTH and rate < BLUETOOTH_LOW_RATE_HZ:
+            result['flags'].append('bluetooth_lento')
+        elif rate < LOW_RATE_HZ:
+            result['flags'].append('frecuencia_baja')
+        # Reportes irregulares: la cola (p95) se aleja de la mediana
+        if p95 > 2 * p50 and p95 - p50 > 4:
+            result['flags'].append('jitter_alto')
+        return result
+
+
+class InputDiagnostics:
+    """
+    Mide la frecuencia de reporte de cada mando y la distribución de los
+    intervalos entre reportes a partir de eventos con marca de tiempo
+    (ver `GamepadDetector.start_diagnostics`), o de una traza grabada.
+
+    La frecuencia sale de la mediana de los intervalos: los eventos del
+    mismo reporte se agrupan y las pausas sin tocar el mando se descartan,
+    así que el resultado es fiable mientras se muevan los sticks.
+
+    Con `approximate` (backends sin marca de tiempo del evento, como
+    pygame) los intervalos son del hilo que lee la cola: el informe los
+    muestra como aproximados y no da la frecuencia del mando.
+    """
+
+    def __init__(self, record: bool = False, approximate: bool = False):
+        self.record = record
+        self.approximate = approximate
+        self.devices: Dict[int, DeviceTiming] = {}
+        self.recorded: List[InputEvent] = []
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def add_device(self, instance_id: int, name: str = "", guid: str = ""):
+        """Registra (o actualiza) los datos de un mando"""
+        with self._lock:
+            timing = self.devices.get(instance_id)
+            if timing is None:
+                timing = self.devices[instance_id] = DeviceTiming(
+                    instance_id, approximate=self.approximate)
+            timing.name = name
+            timing.guid = guid
+
+    def feed(self, event: InputEvent):
+        """Procesa un evento (se llama desde el hilo de monitoreo)"""
+        with self._lock:
+            timing = self.devices.get(event.instance_id)
+            if timing is None:
+                timing = self.devices[event.instance_id] = DeviceTiming(
+                    event.instance_id, approximate=self.approximate)
+            timing.add(event.t_ns)
+            if self.record and len(self.recorded) < MAX_RECORDED_EVENTS:
+                self.recorded.append(event)
+
+    def feed_all(self, events: Iterable[InputEvent]):
+        for event in events:
+            self.feed(event)
+
+    def report(self) -> Dict:
+        """Informe de todos los mandos medidos"""
+        with self._lock:
+            devices = [timing.summary() for timing in self.devices.values()]
+        return {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'duration_s': round(time.time() - self.started, 1),
+            'devices': devices,
+        }
+
+
+FLAG_MESSAGES = {
+    'pocos_datos': "pocos reportes: mueve los sticks durante la medición",
+    'bluetooth_lento': "Bluetooth a baja frecuencia: prueba por USB",
+    'frecuencia_baja': "frecuencia de reporte baja",
+    'jitter_alto': "intervalos irregulares (interferencia o concentrador USB)",
+    'marcas_aproximadas': "tiempos aproximados (al leer la cola de eventos): usa evdev para medir la frecuencia",
+}
+
+
+def format_report(report: Dict) -> str:
+    """Informe en texto para la consola o la ventana de configuración"""
+    if not report or not report.get('devices'):
+        return "Sin eventos de mandos"
+    lines = []
+    for device in report['devices']:
+        lines.append(f"{device['name'] or device['instance_id']} ({device['connection']})")
+        if 'interval_ms' in device:
+            interval = device['interval_ms']
+            rate = f"{device['rate_hz']:.0f} Hz · " if 'rate_hz' in device else ""
+            label = "intervalo aprox." if device.get('approximate') else "intervalo"
+            lines.append(f"  {rate}{label} p50 {interval['p50']:.2f} ms, "
+                         f"p95 {interval['p95']:.2f} ms, p99 {interval['p99']:.2f} ms · "
+                         f"jitter {device['jitter_ms']:.2f} ms")
+        lines.append(f"  {device['reports']} reportes, {device['events']} eventos")
+        for flag in device['flags']:
+            lines.append(f"  ! {FLAG_MESSAGES.get(flag, flag)}")
+    return "\n".join(lines)
+
+
+def save_report(report: Dict, output_dir) -> Path:
+    """Guarda el informe como JSON (logs/input_diagnostics/<fecha>.json)"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    tmp_file = path.with_suffix('.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, path)
+    return path
+
+
+def write_trace(path, gamepads: Iterable, events: Iterable[InputEvent]):
+    """
+    Guarda una traza JSONL: una línea {"device": ...} por mando y una
+    línea [t_ns, instance_id, kind, code, value] por evento.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        for gamepad in gamepads:
+            f.write(json.dumps({'device': {'instance_id': gamepad.instance_id,
+                                           'name': gamepad.name,
+                                           'guid': gamepad.guid}}) + "\n")
+        for event in events:
+            f.write(json.dumps(list(event)) + "\n")
+
+
+def read_trace(path) -> Tuple[List[Dict], List[InputEvent]]:
+    """Lee una traza JSONL: (mandos, eventos)"""
+    devices, events = [], []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            if isinstance(data, dict):
+                devices.append(data['device'])
+            else:
+                events.append(InputEvent(*data))
+    return devices, events
@@ -0,0 +1,329 @@
+"""
+Input Trace - Grabación binaria de mandos (metadatos, hotplug y entrada) y backend de reproducción
+"""
+import json
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.gamepad_detector import ControllerType, GamepadInfo, InputEvent
+
+
+MAGIC = b"PS2TRC"
+VERSION = 1
+
+# Registros: etiqueta (1 byte) + delta de tiempo en ns desde el anterior (u32)
+_HEADER = struct.Struct('<6sBx')
+_TAG = struct.Struct('<B')
+_TIME = struct.Struct('<Q')                  # T: tiempo absoluto (deltas > 4,2 s)
+_DEVICE = struct.Struct('<IH')               # P/A: delta, largo del JSON
+_REMOVED = struct.Struct('<Ii')              # R: delta, instance_id
+_INPUT = struct.Struct('<IiBHf')             # I: delta, instance_id, tipo, código, valor
+
+TAG_TIME, TAG_PRESENT, TAG_ADDED, TAG_REMOVED, TAG_INPUT = b"T"[0], b"P"[0], b"A"[0], b"R"[0], b"I"[0]
+KINDS = ('axis', 'button', 'hat')
+_KIND_CODES = {kind: index for index, kind in enumerate(KINDS)}
+_MAX_DELTA = 0xffffffff
+
+# Campos de GamepadInfo que se graban (el tipo se vuelve a identificar al reproducir)
+DEVICE_FIELDS = ('id', 'name', 'num_axes', 'num_buttons', 'num_hats', 'guid', 'instance_id')
+
+
+def _device_payload(gamepad: GamepadInfo) -> bytes:
+    return json.dumps({f: getattr(gamepad, f) for f in DEVICE_FIELDS},
+                      separators=(',', ':')).encode('utf-8')
+
+
+def _device_from_payload(payload: bytes) -> GamepadInfo:
+    data = json.loads(payload.decode('utf-8'))
+    return GamepadInfo(controller_type=ControllerType.UNKNOWN,
+                       **{f: data[f] for f in DEVICE_FIELDS if f in data})
+
+
+class TraceWriter:
+    """
+    Escribe una traza binaria: cabecera, los mandos presentes al empezar y
+    después cada cambio ('added', 'removed', 'input') con su tiempo. Una
+    entrada de mando ocupa 16 bytes.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'wb')
+        self._file.write(_HEADER.pack(MAGIC, VERSION))
+        self._last_ns: Optional[int] = None
+        self._lock = threading.Lock()
+        self.records = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _delta(self, t_ns: int) -> int:
+        """Delta desde el registro anterior (escribe T si no cabe en u32)"""
+        if self._last_ns is None or t_ns < self._last_ns or t_ns - self._last_ns > _MAX_DELTA:
+            self._file.write(_TAG.pack(TAG_TIME) + _TIME.pack(t_ns))
+            self._last_ns = t_ns
+        delta = t_ns - self._last_ns
+        self._last_ns = t_ns
+        return delta
+
+    def write_device(self, gamepad: GamepadInfo, t_ns: int = None, present: bool = False):
+        """Mando presente al empezar (present) o conectado durante la grabación"""
+        payload = _device_payload(gamepad)
+        with self._lock:
+            delta = self._delta(time.perf_counter_ns() if t_ns is None else t_ns)
+            self._file.write(_TAG.pack(TAG_PRESENT if present else TAG_ADDED)
+                             + _DEVICE.pack(delta, len(payload)) + payload)
+            self.records += 1
+
+    def write_removed(self, instance_id: int, t_ns: int = None):
+        with self._lock:
+            delta = self._delta(time.perf_counter_ns() if t_ns is None else t_ns)
+            self._file.write(_TAG.pack(TAG_REMOVED) + _REMOVED.pack(delta, instance_id))
+            self.records += 1
+
+    def write_input(self, event: InputEvent):
+        with self._lock:
+            delta = self._delta(event.t_ns)
+            self._file.write(_TAG.pack(TAG_INPUT) + _INPUT.pack(
+                delta, event.instance_id, _KIND_CODES[event.kind], event.code, event.value))
+            self.records += 1
+
+    def write_change(self, kind: str, value, t_ns: int = None):
+        """Un cambio con el formato de wait_events de los backends"""
+        if kind == 'input':
+            self.write_input(value)
+        elif kind == 'added':
+            self.write_device(value, t_ns)
+        elif kind == 'removed':
+            self.write_removed(value, t_ns)
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def read_trace(path) -> Tuple[List[GamepadInfo], List[Tuple[int, str, object]]]:
+    """
+    Lee una traza: (mandos presentes al empezar, cambios). Cada cambio es
+    (t_ns, 'added' | 'removed' | 'input', GamepadInfo | instance_id | InputEvent).
+    """
+    data = Path(path).read_bytes()
+    if len(data) < _HEADER.size:
+        raise ValueError("Traza vacía")
+    magic, version = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"No es una traza de entrada ({magic!r} v{version})")
+    present: List[GamepadInfo] = []
+    changes: List[Tuple[int, str, object]] = []
+    offset = _HEADER.size
+    now = 0
+    try:
+        while offset < len(data):
+            tag = data[offset]
+            offset += 1
+            if tag == TAG_TIME:
+                now, = _TIME.unpack_from(data, offset)
+                offset += _TIME.size
+            elif tag == TAG_INPUT:
+                delta, instance_id, kind, code, value = _INPUT.unpack_from(data, offset)
+                offset += _INPUT.size
+                now += delta
+                changes.append((now, 'input', InputEvent(now, instance_id, KINDS[kind], code, value)))
+            elif tag in (TAG_PRESENT, TAG_ADDED):
+                delta, length = _DEVICE.unpack_from(data, offset)
+                offset += _DEVICE.size
+                now += delta
+                gamepad = _device_from_payload(data[offset:offset + length])
+                offset += length
+                if tag == TAG_PRESENT:
+                    present.append(gamepad)
+                else:
+                    changes.append((now, 'added', gamepad))
+            elif tag == TAG_REMOVED:
+                delta, instance_id = _REMOVED.unpack_from(data, offset)
+                offset += _REMOVED.size
+                now += delta
+                changes.append((now, 'removed', instance_id))
+            else:
+                raise ValueError(f"Registro desconocido {tag:#x} en el byte {offset - 1}")
+    except struct.error:
+        # Traza cortada (grabación interrumpida): se usa lo que se leyó entero
+        pass
+    return present, changes
+
+
+class RecordingBackend:
+    """
+    Envoltorio de un backend que graba en una traza todo lo que entrega
+    al detector: los mandos presentes, el hotplug y la entrada (siempre
+    activa mientras se graba).
+    """
+
+    def __init__(self, inner, path):
+        self.inner = inner
+        self.name = f"{inner.name}+grabación"
+        self.writer = TraceWriter(path)
+        self._input_events = False
+
+    def initialize(self):
+        self.inner.initialize()
+        if hasattr(self.inner, 'set_input_events'):
+            self.inner.set_input_events(True)
+
+    def enumerate(self) -> List[GamepadInfo]:
+        devices = self.inner.enumerate()
+        now = time.perf_counter_ns()
+        for gamepad in devices:
+            self.writer.write_device(gamepad, now, present=True)
+        return devices
+
+    def set_input_events(self, enabled: bool):
+        self._input_events = enabled
+
+    def wait_events(self) -> List[Tuple[str, object]]:
+        changes = self.inner.wait_events()
+        now = time.perf_counter_ns()
+        for kind, value in changes:
+            self.writer.write_change(kind, value, now)
+        if changes:
+            self.writer.flush()
+        if self._input_events:
+            return changes
+        return [change for change in changes if change[0] != 'input']
+
+    def __getattr__(self, name):
+        # wake, axis_values...: los del backend real
+        return getattr(self.inner, name)
+
+    def shutdown(self):
+        self.writer.close()
+        self.inner.shutdown()
+
+
+class ReplayBackend:
+    """
+    Backend que reproduce una traza por la misma interfaz que pygame/evdev.
+
+    `speed` 1.0 respeta los tiempos grabados, 10 va diez veces más rápido
+    y 0 entrega todo sin esperar (benchmarks). La reproducción es
+    determinista: mismos cambios, mismo orden, mismas marcas de tiempo.
+    Con `loop` la traza vuelve a empezar (los mandos siguen conectados).
+    Con `paused` los mandos presentes aparecen al inicializar, pero la
+    reproducción espera a `start()` (para conectar listeners antes).
+    """
+
+    name = "replay"
+    WAIT_TIMEOUT = 0.25
+    # Las trazas se tratan como SDL (input_bench mide también la escritura de PCSX2.ini)
+    sdl_device_order = True
+    # Con speed=0, cambios entregados por llamada a wait_events
+    BATCH_SIZE = 4096
+
+    def __init__(self, path, speed: float = 1.0, loop: bool = False, paused: bool = False):
+        self.path = Path(path)
+        self.speed = speed
+        self.loop = loop
+        self.paused = paused
+        self.present: List[GamepadInfo] = []
+        self.changes: List[Tuple[int, str, object]] = []
+        self.position = 0
+        self.finished = threading.Event()
+        self._input_events = False
+        self._wake = threading.Event()
+        self._axis_values: Dict[int, Dict[int, float]] = {}
+        self._start_ns = 0
+        self._start_wall = 0.0
+
+    def initialize(self):
+        self.present, self.changes = read_trace(self.path)
+        self.position = 0
+        self.finished.clear()
+        self._restart()
+
+    def _restart(self):
+        self._start_ns = self.changes[0][0] if self.changes else 0
+        self._start_wall = time.perf_counter()
+
+    def start(self):
+        """Empieza (o reanuda desde el principio del reloj) la reproducción"""
+        self._restart()
+        self.paused = False
+        self._wake.set()
+
+    def enumerate(self) -> List[GamepadInfo]:
+        return list(self.present)
+
+    def set_input_events(self, enabled: bool):
+        self._input_events = enabled
+
+    def wake(self):
+        self._wake.set()
+
+    def axis_values(self, instance_id: int) -> Dict[int, float]:
+        return dict(self._axis_values.get(instance_id, {}))
+
+    def _due_time(self, t_ns: int) -> float:
+        """Momento (perf_counter) en que toca entregar un cambio"""
+        return self._start_wall + (t_ns - self._start_ns) / 1e9 / self.speed
+
+    def wait_events(self) -> List[Tuple[str, object]]:
+        if self.paused:
+            self._wake.wait(self.WAIT_TIMEOUT)
+            self._wake.clear()
+            return []
+        if self.position >= len(self.changes):
+            if self.loop and self.changes:
+                self.position = 0
+                self._restart()
+            else:
+                self.finished.set()
+                self._wake.wait(self.WAIT_TIMEOUT)
+                self._wake.clear()
+                return []
+
+        if self.speed > 0:
+            delay = self._due_time(self.changes[self.position][0]) - time.perf_counter()
+            if delay > 0:
+                self._wake.wait(min(delay, self.WAIT_TIMEOUT))
+                self._wake.clear()
+            limit = time.perf_counter()
+            end = len(self.changes)
+        else:
+            limit = None
+            end = min(len(self.changes), self.position + self.BATCH_SIZE)
+
+        result = []
+        while self.position < end:
+            t_ns, kind, value = self.changes[self.position]
+            if limit is not None and self._due_time(t_ns) > limit:
+                break
+            self.position += 1
+            if kind == 'input':
+                if value.kind == 'axis':
+                    self._axis_values.setdefault(value.instance_id, {})[value.code] = value.value
+                if not self._input_events:
+                    continue
+            result.append((kind, value))
+        return result
+
+    def shutdown(self):
+        self._wake.set()
+
+
+def iter_input_events(path) -> Iterator[InputEvent]:
+    """Eventos de entrada de una traza (para diagnósticos y calibración)"""
+    for _, kind, value in read_trace(path)[1]:
+        if kind == 'input':
+            yield value
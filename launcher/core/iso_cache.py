@@ -0,0 +1,344 @@
+"""
+ISO Cache - Caché local de imágenes en almacenamiento rápido
+"""
+import hashlib
+import json
+import os
+import shutil
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Callable, Dict
+
+
+class ISOCache:
+    """
+    Copia las imágenes más jugadas desde almacenamiento lento (NAS) a un
+    directorio local con tamaño máximo. Los CSO se descomprimen a ISO al
+    promocionarlos. La expulsión prioriza los juegos menos jugados y, a
+    igualdad, los usados hace más tiempo (LFU + LRU). `in_use` dice si
+    el emulador tiene abierta una ruta: esa copia nunca se expulsa.
+    """
+
+    DEFAULT_MAX_SIZE_GB = 64
+    PROMOTE_AFTER_PLAYS = 2
+    COPY_CHUNK_SIZE = 4 * 1024 * 1024
+    # Juegos con contador de partidas (los más viejos sin copia se olvidan)
+    MAX_TRACKED_PLAYS = 500
+
+    def __init__(self, cache_dir: str, state_file: str, max_size_gb: float = None,
+                 promote_after: int = None, logger=None,
+                 in_use: Callable[[Path], bool] = None):
+        self.cache_dir = Path(cache_dir)
+        self.state_file = Path(state_file)
+        self.max_size_bytes = int((max_size_gb or self.DEFAULT_MAX_SIZE_GB) * 1024 ** 3)
+        self.promote_after = promote_after or self.PROMOTE_AFTER_PLAYS
+        self.logger = logger
+        self.in_use = in_use
+        self._lock = threading.Lock()
+        self._pending = set()
+        # Bytes de las promociones en curso (aún no están en 'entries')
+        self._reserved = 0
+        self.state = {'entries': {}, 'plays': {}, 'hits': 0, 'misses': 0}
+        self._load_state()
+
+    def _log(self, message: str, level: str = "info"):
+        """Helper para logging"""
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(f"[{level.upper()}] {message}")
+
+    def _load_state(self):
+        """Carga el estado guardado de la caché"""
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    self.state.update(json.load(f))
+            except Exception:
+                pass
+
+    def _save_state(self):
+        """Guarda el estado de la caché (llamar con el lock tomado)"""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    @staticmethod
+    def _key(source: Path) -> str:
+        """Clave estable para una ruta de origen"""
+        return hashlib.sha1(str(source).encode('utf-8')).hexdigest()[:16]
+
+    def _same_device(self, source: Path) -> bool:
+        """True si la ROM ya está en el mismo disco que la caché"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            return source.stat().st_dev == self.cache_dir.stat().st_dev
+        except OSError:
+            return False
+
+    def resolve(self, rom_path: str) -> Path:
+        """
+        Registra una partida y retorna la ruta desde la que lanzar el juego:
+        la copia en caché si existe y es válida, o el original si no.
+        """
+        source = Path(rom_path).resolve()
+        key = self._key(source)
+        now = time.time()
+
+        try:
+            source_stat = source.stat()
+        except OSError:
+            return source
+
+        with self._lock:
+            if key not in self.state['plays']:
+                self._prune_plays(room_for=1)
+                self.state['plays'][key] = {'source': str(source), 'count': 0}
+            plays = self.state['plays'][key]
+            plays['count'] += 1
+            plays['last_played'] = now
+
+            entry = self.state['entries'].get(key)
+            if entry and self._is_valid(entry, source_stat):
+                entry['last_played'] = now
+                entry['plays'] = plays['count']
+                self.state['hits'] += 1
+                self._save_state()
+                cached = self.cache_dir / entry['file']
+                self._log(f"Caché ISO: usando copia local {cached.name}")
+                return cached
+
+            if entry:
+                # Copia desactualizada o corrupta
+                self._remove_entry(key)
+            self.state['misses'] += 1
+            should_promote = (
+                plays['count'] >= self.promote_after
+                and key not in self._pending
+                and source_stat.st_size <= self.max_size_bytes
+            )
+            if should_promote:
+                self._pending.add(key)
+            self._save_state()
+
+        if should_promote and not self._same_device(source):
+            threading.Thread(
+                target=self._promote, args=(key, source), daemon=True
+            ).start()
+        elif should_promote:
+            with self._lock:
+                self._pending.discard(key)
+
+        return source
+
+    def _is_valid(self, entry: Dict, source_stat: os.stat_result) -> bool:
+        """Verifica que la copia corresponda al original y esté completa"""
+        if entry.get('source_size') != source_stat.st_size:
+            return False
+        if entry.get('source_mtime') != int(source_stat.st_mtime):
+            return False
+        cached = self.cache_dir / entry['file']
+        try:
+            return cached.stat().st_size == entry['size']
+        except OSError:
+            return False
+
+    def _promote(self, key: str, source: Path):
+        """Copia (o descomprime) una imagen a la caché en segundo plano"""
+        is_cso = source.suffix.lower() == '.cso'
+        target_name = f"{key}.iso" if is_cso else f"{key}{source.suffix.lower()}"
+        target = self.cache_dir / target_name
+        partial = target.with_name(target.name + '.part')
+
+        reserved = 0
+        try:
+            source_stat = source.stat()
+            needed = self._cso_total_bytes(source) if is_cso else source_stat.st_size
+            if needed > self.max_size_bytes:
+                return
+
+            with self._lock:
+                if not self._evict_for(needed):
+                    self._log(f"Caché ISO: sin espacio para {source.name} "
+                              f"(copias en uso o promociones en curso)", "warning")
+                    return
+                self._reserved += needed
+                reserved = needed
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._log(f"Caché ISO: promocionando {source.name}")
+            start = time.perf_counter()
+            if is_cso:
+                self._decompress_cso(source, partial)
+            else:
+                self._copy_file(source, partial)
+            os.replace(partial, target)
+
+            with self._lock:
+                plays = self.state['plays'].get(key, {})
+                self.state['entries'][key] = {
+                    'source': str(source),
+                    'file': target_name,
+                    'size': target.stat().st_size,
+                    'source_size': source_stat.st_size,
+                    'source_mtime': int(source_stat.st_mtime),
+                    'plays': plays.get('count', 0),
+                    'last_played': plays.get('last_played', time.time()),
+                }
+                self._save_state()
+            self._log(
+                f"Caché ISO: {source.name} copiado en "
+                f"{time.perf_counter() - start:.1f}s"
+            )
+        except Exception as e:
+            self._log(f"Caché ISO: error promocionando {source.name}: {e}", "error")
+            try:
+                partial.unlink()
+            except OSError:
+                pass
+        finally:
+            with self._lock:
+                self._reserved -= reserved
+                self._pending.discard(key)
+
+    def _copy_file(self, source: Path, target: Path):
+        """Copia por bloques grandes (más eficiente en NAS)"""
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            shutil.copyfileobj(src, dst, self.COPY_CHUNK_SIZE)
+
+    @staticmethod
+    def _cso_total_bytes(source: Path) -> int:
+        """Tamaño descomprimido de un CSO según su cabecera"""
+        with open(source, 'rb') as f:
+            header = f.read(24)
+        if len(header) < 24 or header[:4] != b'CISO':
+            raise ValueError("Cabecera CSO inválida")
+        return struct.unpack_from('<Q', header, 8)[0]
+
+    def _decompress_cso(self, source: Path, target: Path):
+        """Descomprime un CSO (v1, deflate) a una ISO plana"""
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            header = src.read(24)
+            if len(header) < 24 or header[:4] != b'CISO':
+                raise ValueError("Cabecera CSO inválida")
+            total_bytes, block_size = struct.unpack_from('<QI', header, 8)
+            align = header[21]
+            num_blocks = (total_bytes + block_size - 1) // block_size
+
+            index = struct.unpack(f'<{num_blocks + 1}I', src.read(4 * (num_blocks + 1)))
+            for i in range(num_blocks):
+                plain = index[i] & 0x80000000
+                start = (index[i] & 0x7FFFFFFF) << align
+                end = (index[i + 1] & 0x7FFFFFFF) << align
+                src.seek(start)
+                data = src.read(end - start)
+                if plain:
+                    block = data[:block_size]
+                else:
+                    block = zlib.decompress(data, -15)
+                remaining = total_bytes - i * block_size
+                dst.write(block[:min(block_size, remaining)])
+
+    def _evict_for(self, needed: int) -> bool:
+        """
+        Expulsa entradas hasta que quepan `needed` bytes, contando las
+        promociones en curso (con el lock tomado). Retorna False si no
+        alcanza el espacio.
+        """
+        entries = self.state['entries']
+        used = sum(e['size'] for e in entries.values()) + self._reserved
+        victims = sorted(
+            ((key, entry) for key, entry in entries.items() if not self._entry_in_use(entry)),
+            key=lambda item: (item[1].get('plays', 0), item[1].get('last_played', 0))
+        )
+        if used - sum(entry['size'] for _, entry in victims) + needed > self.max_size_bytes:
+            # Ni expulsando todo lo posible cabe: no se borra nada
+            return False
+        for key, entry in victims:
+            if used + needed <= self.max_size_bytes:
+                break
+            used -= entry['size']
+            self._log(f"Caché ISO: expulsando {Path(entry['source']).name}")
+            self._remove_entry(key)
+        self._save_state()
+        return used + needed <= self.max_size_bytes
+
+    def _prune_plays(self, room_for: int = 0):
+        """Olvida los contadores más viejos de juegos sin copia (con el lock tomado)"""
+        plays = self.state['plays']
+        excess = len(plays) + room_for - self.MAX_TRACKED_PLAYS
+        if excess <= 0:
+            return
+        candidates = sorted(
+            (key for key in plays if key not in self.state['entries'] and key not in self._pending),
+            key=lambda key: plays[key].get('last_played', 0)
+        )
+        for key in candidates[:excess]:
+            del plays[key]
+
+    def _entry_in_use(self, entry: Dict) -> bool:
+        """True si el juego en ejecución se lanzó desde esta copia"""
+        if self.in_use is None:
+            return False
+        try:
+            return self.in_use((self.cache_dir / entry['file']).resolve())
+        except Exception:
+            # Ante la duda no se borra
+            return True
+
+    def _remove_entry(self, key: str):
+        """Borra una entrada y su archivo (con el lock tomado)"""
+        entry = self.state['entries'].pop(key, None)
+        if entry:
+            try:
+                (self.cache_dir / entry['file']).unlink()
+            except OSError:
+                pass
+
+    def clear(self):
+        """Vacía la caché"""
+        with self._lock:
+            for key, entry in list(self.state['entries'].items()):
+                if not self._entry_in_use(entry):
+                    self._remove_entry(key)
+            self.state['hits'] = 0
+            self.state['misses'] = 0
+            self._save_state()
+
+    def get_stats(self) -> Dict:
+        """Retorna estadísticas de uso de la caché"""
+        with self._lock:
+            hits = self.state['hits']
+            misses = self.state['misses']
+            return {
+                'entries': len(self.state['entries']),
+                'size': sum(e['size'] for e in self.state['entries'].values()),
+                'max_size': self.max_size_bytes,
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+                'pending': len(self._pending),
+            }
+
+    def get_stats_text(self) -> str:
+        """Resumen corto para mostrar en la interfaz"""
+        stats = self.get_stats()
+        size_gb = stats['size'] / 1024 ** 3
+        max_gb = stats['max_size'] / 1024 ** 3
+        text = f"Caché: {size_gb:.1f}/{max_gb:.0f} GB  {stats['hit_rate']:.0%} aciertos"
+        if stats['pending']:
+            text += f"  (copiando {stats['pending']})"
+        return text
+
+
+if __name__ == "__main__":
+    # Test
+    base = Path(__file__).parent.parent.parent
+    cache = ISOCache(base / "cache" / "isos", base / "config" / "iso_cache.json")
+    print(cache.get_stats())
+    print(cache.get_stats_text())
@@ -0,0 +1,83 @@
+"""
+Launch Profile - Afinidad de CPU, prioridad y entorno para lanzar PCSX2
+"""
+import os
+from typing import Dict, List, Optional
+
+
+# Perfil por defecto: no toca nada del proceso
+DEFAULT_LAUNCH_PROFILE = {
+    "cpu_affinity": [],     # Lista de CPUs, ej. [2, 3, 4, 5]. Vacío = todas
+    "nice": 0,              # -20 (máxima prioridad) a 19 (mínima)
+    "ionice_class": None,   # 1 = realtime, 2 = best-effort, 3 = idle (solo Linux)
+    "ionice_level": None,   # 0 (máxima) a 7 (mínima) para clases 1 y 2
+    "env": {},              # Variables de entorno extra
+}
+
+# Clases de ionice legibles para los logs
+IONICE_CLASS_NAMES = {
+    1: "realtime",
+    2: "best-effort",
+    3: "idle",
+}
+
+
+def resolve_launch_profile(global_profile: Optional[Dict] = None,
+                           game_profile: Optional[Dict] = None) -> Dict:
+    """
+    Resuelve el perfil de lanzamiento por capas, igual que las
+    configuraciones de juego: por defecto <- global (settings.json)
+    <- específico del juego (clave 'launch_profile' de su config).
+    Las variables de entorno se combinan en lugar de reemplazarse.
+    """
+    profile = {key: (value.copy() if isinstance(value, (dict, list)) else value)
+               for key, value in DEFAULT_LAUNCH_PROFILE.items()}
+
+    for layer in (global_profile, game_profile):
+        if not layer:
+            continue
+        for key, value in layer.items():
+            if key not in DEFAULT_LAUNCH_PROFILE:
+                continue
+            if key == "env":
+                profile["env"].update({str(k): str(v) for k, v in value.items()})
+            else:
+                profile[key] = value
+
+    profile["cpu_affinity"] = _valid_cpus(profile["cpu_affinity"])
+    return profile
+
+
+def _valid_cpus(cpus: List[int]) -> List[int]:
+    """Filtra CPUs que no existen en esta máquina"""
+    available = os.cpu_count() or 1
+    return sorted({int(cpu) for cpu in cpus or [] if 0 <= int(cpu) < available})
+
+
+def describe_launch_profile(applied: Dict) -> str:
+    """Resumen de una línea de lo que realmente se aplicó al proceso"""
+    parts = []
+    affinity = applied.get("cpu_affinity")
+    parts.append(f"afinidad={','.join(map(str, affinity)) if affinity else 'todas'}")
+    if applied.get("nice") is not None:
+        parts.append(f"nice={applied['nice']}")
+    if applied.get("priority_class"):
+        parts.append(f"prioridad={applied['priority_class']}")
+    if applied.get("ionice_class"):
+        class_name = IONICE_CLASS_NAMES.get(applied["ionice_class"], applied["ionice_class"])
+        parts.append(f"ionice={class_name}/{applied.get('ionice_level', 0)}")
+    env = applied.get("env") or {}
+    if env:
+        parts.append("env=" + " ".join(f"{k}={v}" for k, v in sorted(env.items())))
+    for error in applied.get("errors", []):
+        parts.append(f"[no aplicado: {error}]")
+    return "  ".join(parts)
+
+
+if __name__ == "__main__":
+    # Test
+    profile = resolve_launch_profile(
+        {"nice": 5, "env": {"MESA_GLTHREAD": "true"}},
+        {"cpu_affinity": [0, 1], "env": {"RADV_PERFTEST": "gpl"}}
+    )
+    print(profile)
@@ -0,0 +1,283 @@
+"""
+Launch Timing - Mide el tiempo desde el clic en JUGAR hasta que el emulador responde
+"""
+import bisect
+import json
+import os
+import platform
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+# Fases del lanzamiento en orden, con su nombre para mostrar
+LAUNCH_PHASES = [
+    ('click', 'Clic'),
+    ('config', 'Configuración'),
+    ('ini', 'Escritura INI'),
+    ('spawn', 'Proceso creado'),
+    ('first_output', 'Primera salida'),
+    ('window', 'Ventana'),
+]
+
+
+class LaunchTimer:
+    """Marca de tiempo de cada fase de un lanzamiento"""
+
+    FIRST_OUTPUT_TIMEOUT = 60.0
+    WINDOW_TIMEOUT = 60.0
+    POLL_INTERVAL = 0.02
+
+    def __init__(self, game_id: str = None, name: str = None):
+        self.game_id = game_id
+        self.name = name or game_id
+        self.marks: Dict[str, float] = {'click': time.perf_counter()}
+        self.first_output_source: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def mark(self, phase: str, source: str = None):
+        """Registra una fase (solo cuenta la primera vez)"""
+        now = time.perf_counter()
+        with self._lock:
+            if phase in self.marks:
+                return
+            self.marks[phase] = now
+            if phase == 'first_output':
+                self.first_output_source = source
+
+    def phases_ms(self) -> Dict[str, float]:
+        """Milisegundos desde el clic hasta cada fase registrada"""
+        click = self.marks['click']
+        return {
+            phase: round((self.marks[phase] - click) * 1000, 1)
+            for phase, _ in LAUNCH_PHASES
+            if phase in self.marks
+        }
+
+    def total_ms(self) -> Optional[float]:
+        """Clic -> primera salida del emulador (None si nunca respondió)"""
+        return self.phases_ms().get('first_output')
+
+    def on_output(self, line: str):
+        """Callback de salida del supervisor (registrar antes de start())"""
+        self.mark('first_output', 'stdout')
+
+    def watch(self, supervisor, emulog_path: Path = None,
+              on_finished: Callable[['LaunchTimer'], None] = None):
+        """
+        Vigila en segundo plano la primera escritura en emulog.txt y (si se
+        puede detectar) la primera ventana del proceso. Llama a
+        `on_finished` al terminar.
+        """
+        log_baseline = None
+        if emulog_path:
+            try:
+                stat = emulog_path.stat()
+                log_baseline = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                log_baseline = (0, 0)
+
+        def run():
+            pid = supervisor.process.pid
+            window_probe = _window_probe()
+            start = time.perf_counter()
+            next_window_check = 0.0
+
+            while True:
+                elapsed = time.perf_counter() - start
+                if emulog_path and 'first_output' not in self.marks:
+                    try:
+                        stat = emulog_path.stat()
+                        if (stat.st_mtime_ns, stat.st_size) != log_baseline:
+                            self.mark('first_output', 'emulog')
+                    except OSError:
+                        pass
+                if window_probe and 'window' not in self.marks and elapsed >= next_window_check:
+                    # La detección de ventanas es más cara: cada 100 ms
+                    next_window_check = elapsed + 0.1
+                    if window_probe(pid):
+                        self.mark('window')
+
+                output_done = 'first_output' in self.marks or elapsed > self.FIRST_OUTPUT_TIMEOUT
+                window_done = not window_probe or 'window' in self.marks or elapsed > self.WINDOW_TIMEOUT
+                if (output_done and window_done) or not supervisor.is_running():
+                    break
+                time.sleep(self.POLL_INTERVAL)
+
+            if on_finished:
+                on_finished(self)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def describe(self) -> str:
+        """Resumen de una línea para los logs"""
+        phases = self.phases_ms()
+        parts = [f"{label}: {phases[phase]:.0f} ms"
+                 for phase, label in LAUNCH_PHASES
+                 if phase in phases and phase != 'click']
+        total = self.total_ms()
+        total_text = f"{total:.0f} ms" if total is not None else "sin respuesta"
+        source = f" ({self.first_output_source})" if self.first_output_source else ""
+        return f"Tiempo de lanzamiento: {total_text}{source} | " + ", ".join(parts)
+
+
+def _window_probe() -> Optional[Callable[[int], bool]]:
+    """Retorna una función que detecta si un PID tiene ventana visible"""
+    if platform.system() == 'Windows':
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        enum_proc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+
+        def has_window(pid: int) -> bool:
+            found = []
+
+            def callback(hwnd, _):
+                owner = wintypes.DWORD()
+                user32.GetWindowThreadProcessId(hwnd, ctypes.byref(owner))
+                if owner.value == pid and user32.IsWindowVisible(hwnd):
+                    found.append(hwnd)
+                    return False
+                return True
+
+            user32.EnumWindows(enum_proc(callback), 0)
+            return bool(found)
+
+        return has_window
+
+    xdotool = shutil.which('xdotool')
+    if xdotool and os.environ.get('DISPLAY'):
+        def has_window(pid: int) -> bool:
+            result = subprocess.run(
+                [xdotool, 'search', '--onlyvisible', '--pid', str(pid)],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+            return bool(result.stdout.strip())
+
+        return has_window
+
+    return None
+
+
+class LaunchStats:
+    """Histograma persistente de tiempos de lanzamiento por juego"""
+
+    # Límite superior de cada cubeta en ms (la última es "más de 30 s")
+    BUCKETS_MS = [100, 150, 200, 300, 400, 500, 750, 1000, 1500, 2000, 3000, 4000, 6000, 8000, 12000, 20000, 30000]
+    MAX_SAMPLES = 50
+    # Lanzamientos medidos de un juego antes de buscar los lentos
+    MIN_OUTLIER_SAMPLES = 5
+    # Lento = supera el p95 de los demás por este factor y estos ms a la vez
+    # (con pocas muestras el p95 es casi el máximo)
+    OUTLIER_FACTOR = 1.25
+    OUTLIER_MIN_EXCESS_MS = 500
+
+    def __init__(self, stats_file: str):
+        self.stats_file = Path(stats_file)
+        self.games: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Carga las estadísticas guardadas"""
+        if self.stats_file.exists():
+            try:
+                with open(self.stats_file, 'r') as f:
+                    self.games = json.load(f)
+            except Exception:
+                pass
+
+    def _save(self):
+        """Guarda las estadísticas (llamar con el lock tomado)"""
+        self.stats_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.stats_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self.games, f, indent=2)
+        os.replace(tmp_file, self.stats_file)
+
+    def record(self, timer: LaunchTimer):
+        """Agrega un lanzamiento medido"""
+        if not timer.game_id:
+            return
+        total = timer.total_ms()
+        with self._lock:
+            game = self.games.setdefault(timer.game_id, {
+                'name': timer.name,
+                'histogram': [0] * (len(self.BUCKETS_MS) + 1),
+                'samples': [],
+            })
+            game['last_launch'] = time.time()
+            if total is not None:
+                game['histogram'][bisect.bisect_left(self.BUCKETS_MS, total)] += 1
+            game['samples'].append({
+                'time': game['last_launch'],
+                'total_ms': total,
+                'source': timer.first_output_source,
+                'phases': timer.phases_ms(),
+            })
+            game['samples'] = game['samples'][-self.MAX_SAMPLES:]
+            self._save()
+
+    def percentile(self, game_id: str, q: float) -> Optional[float]:
+        """Percentil aproximado (interpolado dentro de la cubeta), en ms"""
+        game = self.games.get(game_id)
+        if not game:
+            return None
+        histogram = game['histogram']
+        count = sum(histogram)
+        if not count:
+            return None
+
+        target = q * count
+        cumulative = 0
+        for i, bucket_count in enumerate(histogram):
+            if bucket_count and cumulative + bucket_count >= target:
+                lower = self.BUCKETS_MS[i - 1] if i > 0 else 0
+                upper = self.BUCKETS_MS[i] if i < len(self.BUCKETS_MS) else lower * 2
+                fraction = (target - cumulative) / bucket_count
+                return lower + (upper - lower) * fraction
+            cumulative += bucket_count
+        return float(self.BUCKETS_MS[-1])
+
+    def get_summary_text(self, game_id: str) -> Optional[str]:
+        """Texto corto con p50/p95 para el panel de detalles"""
+        p50 = self.percentile(game_id, 0.50)
+        if p50 is None:
+            return None
+        p95 = self.percentile(game_id, 0.95)
+        return f"p50 {p50 / 1000:.1f}s / p95 {p95 / 1000:.1f}s"
+
+    def last_launch(self, game_id: str) -> Optional[float]:
+        """Timestamp del último lanzamiento de un juego"""
+        game = self.games.get(game_id)
+        return game.get('last_launch') if game else None
+
+    def outliers(self, min_ms: float = 0) -> List[Dict]:
+        """
+        Lanzamientos sin respuesta, más lentos que min_ms o claramente más
+        lentos que el p95 de los demás lanzamientos de su juego (con margen
+        relativo y absoluto, y solo con MIN_OUTLIER_SAMPLES medidos: con
+        menos, cualquier variación parece un pico).
+        """
+        result = []
+        for game_id, game in self.games.items():
+            samples = game['samples']
+            timed = sum(1 for s in samples if s['total_ms'] is not None)
+            for index, sample in enumerate(samples):
+                total = sample['total_ms']
+                p95 = None
+                if total is not None and timed >= self.MIN_OUTLIER_SAMPLES:
+                    # p95 sin la propia muestra: un pico no sube su propio umbral
+                    others = sorted(s['total_ms'] for i, s in enumerate(samples)
+                                    if i != index and s['total_ms'] is not None)
+                    p95 = others[min(len(others) - 1, int(0.95 * len(others)))]
+                spike = (p95 is not None and total > p95 * self.OUTLIER_FACTOR
+                         and total - p95 >= self.OUTLIER_MIN_EXCESS_MS)
+                slow = total is None or spike or (min_ms and total >= min_ms)
+                if slow:
+                    result.append({'game_id': game_id, 'name': game.get('name'), 'p95': p95, **sample})
+        return sorted(result, key=lambda s: -(s['total_ms'] or float('inf')))
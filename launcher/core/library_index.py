@@ -0,0 +1,195 @@
+"""
+Library Index - Orden, filtros y agrupación por serie de la biblioteca de juegos
+
+Las claves de orden y los conjuntos por faceta (región, formato,
+verificado) se calculan una vez por escaneo; cambiar de orden o de
+filtro solo recorre índices ya calculados, sin tocar los datos de cada
+juego. Cada orden se calcula la primera vez que se pide y queda guardado.
+"""
+import re
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+
+SORT_KEYS = ('name', 'region', 'size', 'genre', 'year', 'last_played')
+SORT_LABELS = {
+    'name': "Nombre",
+    'region': "Región",
+    'size': "Tamaño",
+    'genre': "Género",
+    'year': "Año",
+    'last_played': "Última partida",
+}
+FACETS = ('region', 'format', 'verified')
+
+# Grupo de los juegos cuya serie tiene un solo juego
+OTHER_SERIES = "Otros juegos"
+
+# "God of War II" -> "God of War", "Final Fantasy X" -> "Final Fantasy"
+_SERIES_SUFFIX = re.compile(r"\s+(\d+|[IVX]+)$")
+_SERIES_SUBTITLE = re.compile(r"\s*(:|\s-\s).*$")
+
+
+def series_from_name(name: str) -> str:
+    """Serie de un juego a partir de su nombre (sin subtítulo ni numeración)"""
+    series = _SERIES_SUBTITLE.sub("", name).strip()
+    series = _SERIES_SUFFIX.sub("", series).strip()
+    return series or name
+
+
+class GroupHeader(NamedTuple):
+    """Cabecera de grupo dentro de una vista agrupada"""
+    title: str
+    count: int
+
+
+class LibraryIndex:
+    """
+    Índice de una lista de juegos (los dicts de ROMScanner).
+
+    `view(sort, filters, group_by)` retorna la lista a mostrar: los juegos
+    filtrados en el orden pedido y, si se agrupa por serie, con un
+    GroupHeader antes de cada serie. La última vista se guarda, así que
+    pedir la misma otra vez no cuesta nada.
+    """
+
+    def __init__(self, games: List[Dict], game_info, launch_stats=None):
+        self.games = games
+        self.launch_stats = launch_stats
+        self._lock = threading.Lock()
+        self._orders: Dict[str, List[int]] = {}
+        self._last_view: Optional[Tuple[Tuple, List]] = None
+
+        count = len(games)
+        self.names: List[str] = [""] * count
+        self.regions: List[str] = [""] * count
+        self.genres: List[str] = [""] * count
+        self.years: List[int] = [0] * count
+        self.series: List[str] = [""] * count
+        self.facets: Dict[str, Dict[object, Set[int]]] = {facet: {} for facet in FACETS}
+
+        for i, game in enumerate(games):
+            info = game_info.get_game_info(game['id']) or {}
+            name = game_info.get_game_name(game['id'], game['name'])
+            region = game_info.get_region(game['id'])
+            self.names[i] = name.casefold()
+            self.regions[i] = region
+            self.genres[i] = info.get('genre', "")
+            self.years[i] = info.get('year', 0)
+            self.series[i] = info.get('series') or series_from_name(name)
+            self.facets['region'].setdefault(region, set()).add(i)
+            self.facets['format'].setdefault(game.get('extension', ""), set()).add(i)
+            self.facets['verified'].setdefault(bool(info), set()).add(i)
+
+    def facet_values(self, facet: str) -> List[Tuple[object, int]]:
+        """Valores de una faceta con su número de juegos"""
+        return sorted(((value, len(members)) for value, members in self.facets[facet].items()),
+                      key=lambda item: str(item[0]))
+
+    def invalidate(self, sort_key: str):
+        """Descarta un orden calculado (p. ej. 'last_played' tras una partida)"""
+        with self._lock:
+            self._orders.pop(sort_key, None)
+            self._last_view = None
+
+    def order(self, sort_key: str) -> List[int]:
+        """Índices de los juegos en el orden pedido (calculado una vez)"""
+        with self._lock:
+            order = self._orders.get(sort_key)
+            if order is None:
+                order = self._orders[sort_key] = self._compute_order(sort_key)
+            return order
+
+    def _compute_order(self, sort_key: str) -> List[int]:
+        names = self.names
+        indices = range(len(self.games))
+        if sort_key == 'region':
+            key = lambda i: (self.regions[i], names[i])
+        elif sort_key == 'size':
+            # Los más grandes primero
+            key = lambda i: (-self.games[i].get('size', 0), names[i])
+        elif sort_key == 'genre':
+            # Sin género al final
+            key = lambda i: (not self.genres[i], self.genres[i], names[i])
+        elif sort_key == 'year':
+            # Los más recientes primero, sin año al final
+            key = lambda i: (-self.years[i] if self.years[i] else 1, names[i])
+        elif sort_key == 'last_played':
+            played = [self._last_launch(game['id']) for game in self.games]
+            key = lambda i: (-(played[i] or 0), names[i])
+        else:
+            key = names.__getitem__
+        return sorted(indices, key=key)
+
+    def _last_launch(self, game_id: str) -> Optional[float]:
+        if self.launch_stats is None:
+            return None
+        return self.launch_stats.last_launch(game_id)
+
+    def _allowed(self, filters: Dict[str, Iterable]) -> Optional[Set[int]]:
+        """Intersección de las facetas filtradas (None = sin filtro)"""
+        allowed = None
+        for facet, values in (filters or {}).items():
+            if not values:
+                continue
+            members = set()
+            for value in values:
+                members |= self.facets[facet].get(value, set())
+            allowed = members if allowed is None else allowed & members
+        return allowed
+
+    def view(self, sort_key: str = 'name', filters: Dict[str, Iterable] = None,
+             group_by: str = None) -> List:
+        """Juegos (y cabeceras de grupo) a mostrar"""
+        frozen = tuple(sorted((facet, frozenset(values))
+                              for facet, values in (filters or {}).items() if values))
+        key = (sort_key, frozen, group_by)
+        if self._last_view is not None and self._last_view[0] == key:
+            return self._last_view[1]
+
+        order = self.order(sort_key)
+        allowed = self._allowed(filters)
+        if allowed is not None:
+            order = [i for i in order if i in allowed]
+        if group_by == 'series':
+            result = self._group_by_series(order)
+        else:
+            games = self.games
+            result = [games[i] for i in order]
+        self._last_view = (key, result)
+        return result
+
+    def _group_by_series(self, order: List[int]) -> List:
+        """Series en el orden de su primer juego; las de un solo juego al final"""
+        groups: Dict[str, List[int]] = {}
+        for i in order:
+            groups.setdefault(self.series[i], []).append(i)
+        result, others = [], []
+        for title, members in groups.items():
+            if len(members) == 1:
+                others.extend(members)
+                continue
+            result.append(GroupHeader(title, len(members)))
+            result.extend(self.games[i] for i in members)
+        if others:
+            if result:
+                result.append(GroupHeader(OTHER_SERIES, len(others)))
+            result.extend(self.games[i] for i in others)
+        return result
+
+
+if __name__ == "__main__":
+    # Prueba de velocidad con una biblioteca sintética
+    import time
+    from core.game_info import GameInfo
+    prefixes = ["SLUS", "SLES", "SLPM", "SCUS"]
+    games = [{'id': f"{prefixes[i % 4]}_{20000 + i}.{i % 100:02d}", 'name': f"Juego {i % 1500} {i % 7}",
+              'path': f"/roms/{i}.iso", 'size': i * 1000, 'extension': [".iso", ".cso"][i % 2]}
+             for i in range(10000)]
+    started = time.perf_counter()
+    index = LibraryIndex(games, GameInfo())
+    print(f"Índice de {len(games)} juegos: {(time.perf_counter() - started) * 1000:.1f} ms")
+    for sort_key in SORT_KEYS:
+        started = time.perf_counter()
+        index.view(sort_key, {'region': {"PAL (Europe)"}}, group_by='series')
+        print(f"  {sort_key}: {(time.perf_counter() - started) * 1000:.1f} ms")
@@ -0,0 +1,125 @@
+"""
+Library Snapshot - Última biblioteca conocida, para mostrarla al arrancar sin tocar el disco
+
+Se guarda al cerrar (config/library_snapshot.json) en columnas: una
+lista por campo en vez de un objeto por juego, así el archivo es chico y
+se carga con una sola lectura y un json.loads. Al arrancar la ventana
+muestra la biblioteca del snapshot en el orden en que quedó y el
+escaneo en segundo plano la reconcilia (ver rom_scanner.reconcile).
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from core.library_index import GroupHeader
+
+
+SNAPSHOT_VERSION = 1
+# Campos de cada juego guardados tal cual (los demás salen del nombre del archivo)
+COLUMNS = ('id', 'name', 'size', 'mtime_ns', 'size_formatted')
+
+
+class LibrarySnapshot(NamedTuple):
+    """Juegos del snapshot y la vista guardada (juegos y cabeceras en orden)"""
+    games: List[Dict]
+    view: List
+    library_view: Dict
+
+
+def save_snapshot(path: Path, roms_path: Path, games: List[Dict], view: List,
+                  library_view: Dict = None):
+    """
+    Guarda los juegos y el orden de la vista actual. `view` son los
+    mismos dicts de `games` (más GroupHeader si se agrupa por serie).
+    """
+    roms_path = Path(roms_path)
+    position = {id(game): i for i, game in enumerate(games)}
+    order, headers = [], []
+    for item in view:
+        if isinstance(item, GroupHeader):
+            headers.append([len(order), item.title, item.count])
+        elif id(item) in position:
+            order.append(position[id(item)])
+    data = {
+        'version': SNAPSHOT_VERSION,
+        'roms_path': str(roms_path),
+        'library_view': library_view or {},
+        # Los juegos viven en roms_path: basta el nombre del archivo
+        'file': [os.path.relpath(game['path'], roms_path) for game in games],
+        'order': order,
+        'headers': headers,
+    }
+    for column in COLUMNS:
+        data[column] = [game.get(column) for game in games]
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp, path)
+
+
+def load_snapshot(path: Path, roms_path: Path) -> Optional[LibrarySnapshot]:
+    """
+    Carga el snapshot si es de la misma carpeta de ROMs (None si no hay,
+    está dañado o es de otra carpeta).
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != SNAPSHOT_VERSION:
+        return None
+    if data.get('roms_path') != str(roms_path):
+        return None
+
+    try:
+        files = data['file']
+        columns = [data[column] for column in COLUMNS]
+        if any(len(values) != len(files) for values in columns):
+            return None
+        base = str(roms_path)
+        games = []
+        for file, game_id, name, size, mtime_ns, size_formatted in zip(files, *columns):
+            games.append({
+                'id': game_id,
+                'name': name,
+                'path': os.path.join(base, file),
+                'size': size,
+                'mtime_ns': mtime_ns,
+                'size_formatted': size_formatted,
+                'extension': os.path.splitext(file)[1].lower(),
+            })
+
+        view = [games[i] for i in data.get('order', ())]
+        for position, title, count in reversed(data.get('headers', ())):
+            view.insert(position, GroupHeader(title, count))
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+    return LibrarySnapshot(games, view, data.get('library_view') or {})
+
+
+if __name__ == "__main__":
+    # Prueba de velocidad: guardar y cargar 5000 juegos
+    import tempfile
+    roms = Path("/roms")
+    games = [{'id': f"SLUS_{20000 + i}.{i % 100:02d}", 'name': f"Juego {i:05d}",
+              'path': str(roms / f"Juego_{i:05d}.iso"), 'size': 4_000_000_000 + i,
+              'mtime_ns': 1_700_000_000_000_000_000 + i, 'size_formatted': "3.7 GB",
+              'extension': ".iso"} for i in range(5000)]
+    view = sorted(games, key=lambda game: game['name'], reverse=True)
+    with tempfile.TemporaryDirectory() as workdir:
+        snapshot_file = Path(workdir) / "library_snapshot.json"
+        started = time.perf_counter()
+        save_snapshot(snapshot_file, roms, games, view)
+        saved = time.perf_counter()
+        snapshot = load_snapshot(snapshot_file, roms)
+        loaded = time.perf_counter()
+        assert snapshot.games == games
+        assert [game['path'] for game in snapshot.view] == [game['path'] for game in view]
+        print(f"{len(games)} juegos, {snapshot_file.stat().st_size / 1024:.0f} KB: guardado "
+              f"{(saved - started) * 1000:.1f} ms, carga {(loaded - saved) * 1000:.1f} ms")
@@ -0,0 +1,194 @@
+"""
+PCSX2 Discovery - Busca instalaciones de PCSX2 (Windows y Linux) y su versión
+"""
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+IS_WINDOWS = platform.system() == 'Windows'
+
+# Nombres del ejecutable según versión/empaquetado
+EXECUTABLE_NAMES = ['pcsx2-qt', 'pcsx2', 'PCSX2']
+
+# ID de la aplicación en Flathub
+FLATPAK_APP_ID = 'net.pcsx2.PCSX2'
+
+VERSION_PATTERN = re.compile(r'v?(\d+)\.(\d+)(?:\.(\d+))?')
+
+
+def parse_version(text: str) -> Optional[Tuple[int, int, int]]:
+    """Extrae (mayor, menor, parche) de un texto como 'PCSX2 v2.0.2'"""
+    match = VERSION_PATTERN.search(text or '')
+    if not match:
+        return None
+    major, minor, patch = match.groups()
+    return int(major), int(minor), int(patch or 0)
+
+
+def get_capabilities(version: Optional[Tuple[int, int, int]]) -> Dict:
+    """
+    Capacidades de línea de comandos según la versión. Las versiones
+    Qt (1.7+) usan flags con un guion y soportan batch/big picture; las
+    1.6 (wxWidgets) usan doble guion.
+    """
+    if version is None:
+        # Sin versión conocida asumimos la interfaz Qt actual
+        version = (2, 0, 0)
+    qt = version >= (1, 7, 0)
+    prefix = '-' if qt else '--'
+    return {
+        'qt': qt,
+        'batch': qt,
+        'nogui': True,
+        'fullscreen': True,
+        'bigpicture': qt,
+        'flag_prefix': prefix,
+    }
+
+
+def executable_command(path) -> List[str]:
+    """Comando base para ejecutar PCSX2 (o el emulador de prueba en Python)"""
+    path = str(path)
+    if path.endswith('.py'):
+        # Emulador de prueba (tools/fake_pcsx2.py)
+        return [sys.executable, path]
+    return [path]
+
+
+class PCSX2Discovery:
+    """Descubre instalaciones de PCSX2 probando todas las ubicaciones en paralelo"""
+
+    VERSION_PROBE_TIMEOUT = 5
+
+    def __init__(self, base_path: Path, logger=None):
+        self.base_path = Path(base_path)
+        self.logger = logger
+
+    def _log(self, message: str, level: str = "info"):
+        """Helper para logging"""
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(f"[{level.upper()}] {message}")
+
+    def candidates(self) -> List[Path]:
+        """Ubicaciones posibles, en orden de preferencia"""
+        home = Path.home()
+        paths = []
+
+        # Portable en el proyecto
+        for name in EXECUTABLE_NAMES:
+            paths.append(self.base_path / "pcsx2" / f"{name}.exe")
+            paths.append(self.base_path / "pcsx2" / name)
+
+        # Instalación típica de Windows
+        if IS_WINDOWS:
+            local_appdata = Path(os.environ.get('LOCALAPPDATA', ''))
+            paths += [
+                Path("C:/Program Files/PCSX2/pcsx2-qt.exe"),
+                Path("C:/Program Files/PCSX2/pcsx2.exe"),
+                Path("C:/Program Files (x86)/PCSX2/pcsx2-qt.exe"),
+                local_appdata / "PCSX2" / "pcsx2-qt.exe",
+                local_appdata / "Programs" / "PCSX2" / "pcsx2-qt.exe",
+            ]
+
+        # $PATH
+        for name in EXECUTABLE_NAMES:
+            found = shutil.which(name)
+            if found:
+                paths.append(Path(found))
+
+        if not IS_WINDOWS:
+            # AppImage descargada a mano
+            for folder in (home / "Applications", home / "applications", home / ".local" / "bin"):
+                if folder.is_dir():
+                    paths += sorted(
+                        (p for p in folder.iterdir()
+                         if 'pcsx2' in p.name.lower() and p.suffix.lower() == '.appimage'),
+                        reverse=True
+                    )
+            # Flatpak (usuario y sistema)
+            paths += [
+                home / ".local" / "share" / "flatpak" / "exports" / "bin" / FLATPAK_APP_ID,
+                Path("/var/lib/flatpak/exports/bin") / FLATPAK_APP_ID,
+            ]
+
+        # Sin duplicados, manteniendo el orden
+        unique = []
+        for path in paths:
+            if path not in unique:
+                unique.append(path)
+        return unique
+
+    @staticmethod
+    def probe(path: Path) -> Optional[os.stat_result]:
+        """stat() de un candidato; None si no sirve como ejecutable"""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        if not path.is_file():
+            return None
+        if not IS_WINDOWS and not os.access(path, os.X_OK):
+            return None
+        return stat
+
+    def discover(self) -> Optional[Path]:
+        """Prueba todos los candidatos a la vez y retorna el preferido"""
+        candidates = self.candidates()
+        if not candidates:
+            return None
+        # En unidades de red o discos dormidos cada stat puede tardar;
+        # en paralelo el tiempo total es el del más lento, no la suma
+        with ThreadPoolExecutor(max_workers=min(16, len(candidates))) as pool:
+            results = list(pool.map(self.probe, candidates))
+        for path, stat in zip(candidates, results):
+            if stat is not None:
+                return path
+        return None
+
+    @staticmethod
+    def fingerprint(path: Path) -> Optional[Dict]:
+        """Huella (mtime, tamaño) del ejecutable"""
+        try:
+            stat = Path(path).stat()
+        except OSError:
+            return None
+        return {'mtime': stat.st_mtime_ns, 'size': stat.st_size}
+
+    def probe_version(self, path: Path) -> Optional[Tuple[int, int, int]]:
+        """Obtiene la versión ejecutando el emulador una vez con -version"""
+        try:
+            result = subprocess.run(
+                executable_command(path) + ['-version'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+                timeout=self.VERSION_PROBE_TIMEOUT
+            )
+            version = parse_version(result.stdout.decode('utf-8', errors='replace'))
+            if version:
+                return version
+        except (OSError, subprocess.SubprocessError) as e:
+            self._log(f"No se pudo consultar la versión de PCSX2: {e}", "warning")
+        # Las AppImage llevan la versión en el nombre (pcsx2-v2.0.2-linux-...)
+        return parse_version(Path(path).name)
+
+
+if __name__ == "__main__":
+    # Test
+    discovery = PCSX2Discovery(Path(__file__).parent.parent.parent)
+    for candidate in discovery.candidates():
+        print(f"  {candidate}")
+    found = discovery.discover()
+    print(f"Encontrado: {found}")
+    if found:
+        version = discovery.probe_version(found)
+        print(f"Versión: {version} -> {get_capabilities(version)}")
@@ -0,0 +1,211 @@
+"""
+PCSX2 Profile - Traduce configuraciones de juego a claves de PCSX2.ini y las aplica
+"""
+import difflib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.game_info import DEFAULT_CONFIG
+from core.ini_file import IniDocument, format_ini_value, load_ini, save_ini
+
+
+# Valores de EmuCore/GS Renderer en PCSX2
+RENDERER_IDS = {
+    "Auto": -1,
+    "Direct3D 11": 3,
+    "OpenGL": 12,
+    "Software": 13,
+    "Vulkan": 14,
+    "Direct3D 12": 15,
+    "Metal": 17,
+}
+
+# Game fixes conocidos de PCSX2 (sección EmuCore/Gamefixes)
+KNOWN_GAMEFIXES = [
+    "VuAddSubHack", "FpuMulHack", "FpuNegDivHack", "XgKickHack", "EETimingHack",
+    "InstantDMAHack", "SoftwareRendererFMVHack", "SkipMPEGHack", "OPHFlagHack",
+    "DMABusyHack", "VIFFIFOHack", "VIF1StallHack", "GIFFIFOHack", "GoemonTlbHack",
+    "IbitHack", "VUSyncHack", "VUOverflowHack", "BlitInternalFPSHack", "FullVU0SyncHack",
+]
+
+# Perfiles con nombre (se mezclan sobre DEFAULT_CONFIG)
+PRESETS = {
+    "rendimiento": {
+        "internal_resolution": 1,
+        "anisotropic_filtering": 0,
+        "mtvu": True,
+        "speedhacks": True,
+    },
+    "equilibrado": {
+        "internal_resolution": 2,
+        "anisotropic_filtering": 8,
+    },
+    "calidad": {
+        "internal_resolution": 4,
+        "anisotropic_filtering": 16,
+    },
+    "4k": {
+        "internal_resolution": 6,
+        "anisotropic_filtering": 16,
+    },
+}
+
+
+def get_preset(name: str) -> Optional[Dict]:
+    """Configuración completa de un perfil con nombre"""
+    if name not in PRESETS:
+        return None
+    config = DEFAULT_CONFIG.copy()
+    config.update(PRESETS[name])
+    return config
+
+
+def config_to_patches(config: Dict) -> Dict[str, Dict[str, Any]]:
+    """
+    Claves de PCSX2.ini para una configuración de juego (ver GameInfo).
+    `frame_limit` y `vu_cycle_stealing` no tienen clave equivalente en
+    PCSX2 2.x y se ignoran.
+    """
+    gs = {}
+    if config.get('renderer') in RENDERER_IDS:
+        gs['Renderer'] = RENDERER_IDS[config['renderer']]
+    if 'internal_resolution' in config:
+        gs['upscale_multiplier'] = config['internal_resolution']
+    if 'anisotropic_filtering' in config:
+        gs['MaxAnisotropy'] = config['anisotropic_filtering']
+    if 'texture_filtering' in config:
+        gs['filter'] = config['texture_filtering']
+    if 'vsync' in config:
+        gs['VsyncEnable'] = bool(config['vsync'])
+
+    speedhacks = {}
+    hacks_enabled = config.get('speedhacks', True)
+    if 'ee_cycle_rate' in config:
+        speedhacks['EECycleRate'] = config['ee_cycle_rate'] if hacks_enabled else 0
+    if 'ee_cycle_skip' in config:
+        speedhacks['EECycleSkip'] = config['ee_cycle_skip'] if hacks_enabled else 0
+    if 'mtvu' in config:
+        speedhacks['vuThread'] = bool(config['mtvu'])
+
+    patches = {'EmuCore/GS': gs, 'EmuCore/Speedhacks': speedhacks}
+    if 'game_fixes' in config:
+        # Los fixes no listados se eliminan (el valor por defecto es false)
+        fixes = set(config.get('game_fixes') or [])
+        patches['EmuCore/Gamefixes'] = {fix: True if fix in fixes else None for fix in KNOWN_GAMEFIXES}
+    return {section: values for section, values in patches.items() if values}
+
+
+def relative_patches(patches: Dict[str, Dict[str, Any]],
+                     base: IniDocument) -> Dict[str, Dict[str, Any]]:
+    """
+    Parches para un INI por juego: solo lo que difiere del INI global.
+    Las claves iguales al global se eliminan (None) para que hereden.
+    """
+    result = {}
+    for section, values in patches.items():
+        result[section] = {
+            key: None if value is None or base.get(section, key) == format_ini_value(value) else value
+            for key, value in values.items()
+        }
+    return result
+
+
+def list_changes(doc: IniDocument, patches: Dict[str, Dict[str, Any]]) -> List[Tuple[str, str, Optional[str], Optional[str]]]:
+    """Cambios (sección, clave, antes, después) que produciría un parche"""
+    changes = []
+    for section, values in patches.items():
+        for key, value in values.items():
+            old = doc.get(section, key)
+            new = None if value is None else format_ini_value(value)
+            if old != new:
+                changes.append((section, key, old, new))
+    return changes
+
+
+def unified_diff(before: IniDocument, after: IniDocument, name: str = "PCSX2.ini") -> str:
+    """Diff unificado entre dos estados de un INI"""
+    return "".join(difflib.unified_diff(
+        before.render().splitlines(keepends=True),
+        after.render().splitlines(keepends=True),
+        fromfile=f"{name} (actual)",
+        tofile=f"{name} (perfil)",
+    ))
+
+
+def game_settings_serial(game_id: str) -> str:
+    """SLUS_203.12 -> SLUS-20312 (prefijo de los INI por juego de PCSX2)"""
+    return game_id.replace('_', '-').replace('.', '').upper()
+
+
+def find_game_settings(config_dir, game_id: str) -> List[Path]:
+    """INI por juego de PCSX2 (gamesettings/<SERIAL>_<CRC>.ini)"""
+    folder = Path(config_dir) / "gamesettings"
+    if not folder.exists():
+        return []
+    return sorted(folder.glob(f"{game_settings_serial(game_id)}_*.ini"))
+
+
+class ProfileApplier:
+    """Calcula, muestra y aplica los cambios de un perfil en INIs de PCSX2"""
+
+    def __init__(self, logger=None):
+        self.logger = logger
+
+    def _log(self, message: str, level: str = "info"):
+        """Helper para logging"""
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(f"[{level.upper()}] {message}")
+
+    def preview(self, ini_path, config: Dict,
+                base: IniDocument = None) -> Tuple[IniDocument, IniDocument, List]:
+        """
+        Estado actual, estado resultante y lista de cambios, sin escribir.
+        Con `base` (INI global) los parches se calculan como INI por juego.
+        """
+        before = load_ini(ini_path)
+        patches = config_to_patches(config)
+        if base is not None:
+            patches = relative_patches(patches, base)
+        after = before.copy()
+        after.apply(patches)
+        return before, after, list_changes(before, patches)
+
+    def apply(self, ini_path, config: Dict, label: str = "",
+              base: IniDocument = None) -> List:
+        """
+        Aplica un perfil de forma atómica. Retorna la lista de cambios
+        (vacía si no había nada que hacer).
+        """
+        before, after, changes = self.preview(ini_path, config, base)
+        if not changes:
+            return []
+        save_ini(ini_path, after, label)
+        self._log(f"{Path(ini_path).name}: {len(changes)} cambios aplicados ({label or 'perfil'})")
+        return changes
+
+    def apply_batch(self, global_ini, targets: Dict[str, Dict], label: str = "",
+                    dry_run: bool = False) -> Dict[str, List]:
+        """
+        Aplica perfiles a muchos INI por juego {ruta: configuración}. El INI
+        global se lee una sola vez y solo se escriben las diferencias.
+        """
+        base = load_ini(global_ini) if global_ini else IniDocument()
+        results = {}
+        for ini_path, config in targets.items():
+            if dry_run:
+                results[ini_path] = self.preview(ini_path, config, base)[2]
+            else:
+                results[ini_path] = self.apply(ini_path, config, label, base)
+        return results
+
+
+def format_changes(changes: List) -> str:
+    """Lista de cambios legible"""
+    lines = []
+    for section, key, old, new in changes:
+        old_text = old if old is not None else "(sin valor)"
+        new_text = new if new is not None else "(hereda del global)"
+        lines.append(f"  [{section}] {key}: {old_text} -> {new_text}")
+    return "\n".join(lines)
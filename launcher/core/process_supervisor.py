@@ -0,0 +1,346 @@
+"""
+Process Supervisor - Lanza y vigila el proceso del emulador
+"""
+import ctypes
+import os
+import platform
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from core.launch_profile import describe_launch_profile
+
+
+IS_WINDOWS = platform.system() == 'Windows'
+
+# Números de syscall de ioprio_set/ioprio_get por arquitectura (Linux)
+IOPRIO_SYSCALLS = {
+    'x86_64': (251, 252),
+    'aarch64': (30, 31),
+    'i686': (289, 290),
+    'i386': (289, 290),
+}
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_CLASS_SHIFT = 13
+
+# Segundos tras el lanzamiento en los que se vuelve a aplicar el perfil a
+# los hilos nuevos (los creados mientras se aplicaba no lo heredan)
+PROFILE_REAPPLY_DELAYS = (0.5, 2.0, 5.0)
+
+# Clases de prioridad de Windows según el valor nice equivalente
+WINDOWS_PRIORITY_CLASSES = [
+    (-10, 'HIGH_PRIORITY_CLASS'),
+    (-1, 'ABOVE_NORMAL_PRIORITY_CLASS'),
+    (0, 'NORMAL_PRIORITY_CLASS'),
+    (9, 'BELOW_NORMAL_PRIORITY_CLASS'),
+    (19, 'IDLE_PRIORITY_CLASS'),
+]
+
+
+def _ioprio_syscall(get: bool) -> Optional[int]:
+    """Número de syscall ioprio para esta arquitectura"""
+    numbers = IOPRIO_SYSCALLS.get(platform.machine())
+    if not numbers:
+        return None
+    return numbers[1] if get else numbers[0]
+
+
+def _ioprio_set(pid: int, ioclass: int, level: int):
+    """Equivalente a `ionice -c ioclass -n level -p pid`"""
+    number = _ioprio_syscall(get=False)
+    if number is None:
+        raise OSError("ioprio no soportado en esta arquitectura")
+    libc = ctypes.CDLL(None, use_errno=True)
+    value = (ioclass << IOPRIO_CLASS_SHIFT) | (level or 0)
+    if libc.syscall(number, IOPRIO_WHO_PROCESS, pid, value) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+
+def _ioprio_get(pid: int) -> Optional[tuple]:
+    """Retorna (clase, nivel) de ionice de un proceso"""
+    number = _ioprio_syscall(get=True)
+    if number is None:
+        return None
+    libc = ctypes.CDLL(None, use_errno=True)
+    value = libc.syscall(number, IOPRIO_WHO_PROCESS, pid)
+    if value < 0:
+        return None
+    return value >> IOPRIO_CLASS_SHIFT, value & ((1 << IOPRIO_CLASS_SHIFT) - 1)
+
+
+class ProcessSupervisor:
+    """Lanza un proceso aplicando un perfil de lanzamiento y lee su salida"""
+
+    def __init__(self, cmd: List[str], cwd: str = None, profile: Dict = None, logger=None):
+        self.cmd = cmd
+        self.cwd = cwd
+        self.profile = profile or {}
+        self.logger = logger
+        self.process: Optional[subprocess.Popen] = None
+        self.applied: Dict = {}
+        self._output_callbacks: List[Callable[[str], None]] = []
+        self._reader_thread = None
+        self._profiled_tids = set()
+        self.metrics: Dict = {}
+
+    def _log(self, message: str, level: str = "info"):
+        """Helper para logging"""
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(f"[{level.upper()}] {message}")
+
+    def add_output_callback(self, callback: Callable[[str], None]):
+        """Agrega un callback que recibe cada línea de salida del proceso"""
+        self._output_callbacks.append(callback)
+
+    def start(self) -> subprocess.Popen:
+        """Lanza el proceso con el perfil aplicado"""
+        env = os.environ.copy()
+        env.update(self.profile.get('env') or {})
+
+        kwargs = {
+            'cwd': self.cwd,
+            'env': env,
+            'stdout': subprocess.PIPE,
+            'stderr': subprocess.STDOUT,
+            'stdin': subprocess.DEVNULL,
+        }
+        errors = []
+        if IS_WINDOWS:
+            kwargs['creationflags'] = self._windows_priority_flag()
+
+        self.process = subprocess.Popen(self.cmd, **kwargs)
+        self.metrics = {
+            'start_time': time.time(),
+            'cpu_seconds': 0.0,
+            'rss_kb': 0,
+            'peak_rss_kb': 0,
+            'threads': 0,
+            'output_lines': 0,
+            'exit_code': None,
+            'runtime_seconds': 0.0,
+        }
+
+        if IS_WINDOWS and self.profile.get('cpu_affinity'):
+            try:
+                self._set_windows_affinity(self.process.pid, self.profile['cpu_affinity'])
+            except OSError as e:
+                errors.append(f"afinidad: {e}")
+        elif not IS_WINDOWS and self._posix_profile_requested():
+            # Desde el padre: un preexec_fn corre entre fork y exec, donde no
+            # es seguro ejecutar Python con otros hilos vivos
+            self._profiled_tids = set()
+            self._apply_to_threads(self.process.pid)
+            threading.Thread(target=self._reapply_profile, daemon=True).start()
+
+        self.applied = self._read_applied()
+        self.applied['errors'] = errors + self.applied.get('errors', [])
+        self._log(f"Proceso iniciado con PID: {self.process.pid}")
+        self._log(f"Perfil aplicado: {describe_launch_profile(self.applied)}")
+
+        self._reader_thread = threading.Thread(target=self._read_output, daemon=True)
+        self._reader_thread.start()
+        return self.process
+
+    def _posix_profile_requested(self) -> bool:
+        return bool(self.profile.get('cpu_affinity') or self.profile.get('nice')
+                    or self.profile.get('ionice_class'))
+
+    @staticmethod
+    def _thread_ids(pid: int) -> List[int]:
+        """Hilos del proceso (Linux: /proc/<pid>/task; si no, solo el PID)"""
+        try:
+            return [int(tid) for tid in os.listdir(f"/proc/{pid}/task")]
+        except (OSError, ValueError):
+            return [pid]
+
+    def _apply_to_threads(self, pid: int):
+        """
+        Aplica afinidad, nice e ionice a cada hilo del proceso que todavía
+        no los tiene (solo POSIX). En Linux las tres cosas son por hilo:
+        aplicarlas al PID solo cambia el hilo principal.
+        """
+        for tid in self._thread_ids(pid):
+            if tid not in self._profiled_tids:
+                self._profiled_tids.add(tid)
+                self._apply_to_tid(tid)
+
+    def _apply_to_tid(self, tid: int):
+        # Los errores se ignoran aquí; _read_applied informa lo que quedó
+        cpus = self.profile.get('cpu_affinity')
+        if cpus and hasattr(os, 'sched_setaffinity'):
+            try:
+                os.sched_setaffinity(tid, cpus)
+            except OSError:
+                pass
+        nice = self.profile.get('nice') or 0
+        if nice:
+            try:
+                os.setpriority(os.PRIO_PROCESS, tid, nice)
+            except OSError:
+                pass
+        ioclass = self.profile.get('ionice_class')
+        if ioclass:
+            try:
+                _ioprio_set(tid, ioclass, self.profile.get('ionice_level') or 0)
+            except OSError:
+                pass
+
+    def _reapply_profile(self):
+        """Cubre los hilos que el emulador creó mientras se aplicaba el perfil"""
+        process = self.process
+        started = time.monotonic()
+        for delay in PROFILE_REAPPLY_DELAYS:
+            time.sleep(max(0.0, started + delay - time.monotonic()))
+            if process.poll() is not None:
+                return
+            self._apply_to_threads(process.pid)
+
+    def _read_applied(self) -> Dict:
+        """Lee del sistema lo que realmente tiene el proceso"""
+        pid = self.process.pid
+        applied = {'env': dict(self.profile.get('env') or {}), 'errors': []}
+
+        if IS_WINDOWS:
+            applied['cpu_affinity'] = self.profile.get('cpu_affinity') or []
+            applied['priority_class'] = self._windows_priority_name()
+            return applied
+
+        try:
+            affinity = sorted(os.sched_getaffinity(pid))
+            requested = self.profile.get('cpu_affinity')
+            applied['cpu_affinity'] = affinity if requested or len(affinity) < os.cpu_count() else []
+        except (AttributeError, OSError):
+            applied['cpu_affinity'] = []
+        if self.profile.get('cpu_affinity') and applied['cpu_affinity'] != self.profile['cpu_affinity']:
+            applied['errors'].append("afinidad")
+
+        try:
+            applied['nice'] = os.getpriority(os.PRIO_PROCESS, pid)
+        except OSError:
+            applied['nice'] = None
+        if self.profile.get('nice') and applied['nice'] != self.profile['nice']:
+            applied['errors'].append(f"nice {self.profile['nice']} (¿permisos?)")
+
+        if self.profile.get('ionice_class'):
+            try:
+                ioprio = _ioprio_get(pid)
+            except OSError:
+                ioprio = None
+            if ioprio:
+                applied['ionice_class'], applied['ionice_level'] = ioprio
+            if not ioprio or ioprio[0] != self.profile['ionice_class']:
+                applied['errors'].append("ionice")
+        return applied
+
+    def _windows_priority_name(self) -> str:
+        """Nombre de la clase de prioridad equivalente al nice del perfil"""
+        nice = self.profile.get('nice') or 0
+        for threshold, name in WINDOWS_PRIORITY_CLASSES:
+            if nice <= threshold:
+                return name
+        return 'IDLE_PRIORITY_CLASS'
+
+    def _windows_priority_flag(self) -> int:
+        """creationflags de subprocess para la prioridad del perfil"""
+        return getattr(subprocess, self._windows_priority_name(), 0)
+
+    @staticmethod
+    def _set_windows_affinity(pid: int, cpus: List[int]):
+        """Fija la afinidad de CPU de un proceso en Windows"""
+        PROCESS_SET_INFORMATION = 0x0200
+        PROCESS_QUERY_INFORMATION = 0x0400
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(
+            PROCESS_SET_INFORMATION | PROCESS_QUERY_INFORMATION, False, pid
+        )
+        if not handle:
+            raise OSError("OpenProcess falló")
+        try:
+            mask = 0
+            for cpu in cpus:
+                mask |= 1 << cpu
+            if not kernel32.SetProcessAffinityMask(handle, ctypes.c_size_t(mask)):
+                raise OSError("SetProcessAffinityMask falló")
+        finally:
+            kernel32.CloseHandle(handle)
+
+    def _read_output(self):
+        """Lee la salida del proceso (evita que se llene el pipe)"""
+        try:
+            for raw_line in self.process.stdout:
+                line = raw_line.decode('utf-8', errors='replace').rstrip()
+                self.metrics['output_lines'] += 1
+                for callback in self._output_callbacks:
+                    try:
+                        callback(line)
+                    except Exception:
+                        pass
+        except (OSError, ValueError):
+            pass
+
+    def sample_metrics(self) -> Dict:
+        """
+        Toma una muestra de CPU, memoria e hilos del proceso (Linux, vía
+        /proc). En otros sistemas solo se registran tiempo y código de salida.
+        """
+        if not self.process:
+            return self.metrics
+        self.metrics['runtime_seconds'] = round(time.time() - self.metrics['start_time'], 2)
+        exit_code = self.process.poll()
+        if exit_code is not None:
+            self.metrics['exit_code'] = exit_code
+            return self.metrics
+
+        proc_dir = f"/proc/{self.process.pid}"
+        try:
+            with open(f"{proc_dir}/stat", 'r') as f:
+                # Los campos tras el nombre entre paréntesis: utime=14, stime=15
+                fields = f.read().rsplit(')', 1)[1].split()
+            ticks = os.sysconf('SC_CLK_TCK')
+            self.metrics['cpu_seconds'] = (int(fields[11]) + int(fields[12])) / ticks
+            with open(f"{proc_dir}/status", 'r') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        self.metrics['rss_kb'] = int(line.split()[1])
+                    elif line.startswith('VmHWM:'):
+                        self.metrics['peak_rss_kb'] = max(
+                            self.metrics['peak_rss_kb'], int(line.split()[1])
+                        )
+                    elif line.startswith('Threads:'):
+                        self.metrics['threads'] = int(line.split()[1])
+        except (OSError, ValueError, IndexError, AttributeError):
+            pass
+        return self.metrics
+
+    def is_running(self) -> bool:
+        """Indica si el proceso sigue vivo"""
+        return self.process is not None and self.process.poll() is None
+
+    def wait(self, timeout: float = None) -> Optional[int]:
+        """Espera a que termine el proceso y retorna su código de salida"""
+        if not self.process:
+            return None
+        try:
+            exit_code = self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return None
+        self.sample_metrics()
+        return exit_code
+
+    def terminate(self, timeout: float = 5):
+        """Cierra el proceso (y lo mata si no responde)"""
+        if not self.is_running():
+            self.sample_metrics()
+            return
+        self.sample_metrics()
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.sample_metrics()
@@ -0,0 +1,140 @@
+"""
+Resolution Tuner - Ajusta la resolución interna según la velocidad medida
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class ResolutionTuner:
+    """
+    Ajuste en lazo cerrado de `internal_resolution` por juego y máquina.
+
+    Tras cada sesión con telemetría:
+    - Si el juego no fue a velocidad completa baja un paso y recuerda ese
+      nivel como techo (no se vuelve a intentar enseguida).
+    - Si fue a velocidad completa con margen durante varias sesiones
+      seguidas sube un paso, siempre por debajo del techo.
+    - Tras muchas sesiones limpias justo bajo el techo, el techo se olvida
+      (drivers o hardware pueden haber mejorado).
+    El cambio se guarda como configuración personalizada del juego. Solo
+    cuentan las sesiones cuya resolución llegó al INI de PCSX2
+    ('internal_resolution' del resumen): si no, la velocidad medida no
+    dice nada de la resolución configurada.
+    """
+
+    MIN_RESOLUTION = 1
+    MAX_RESOLUTION = 6
+    # Bajar: velocidad media bajo este % o el percentil 5 bajo SLOW_P5
+    SLOW_AVG = 97.0
+    SLOW_P5 = 90.0
+    # Subir: percentil 5 por encima de este % en CLEAN_SESSIONS seguidas
+    HEADROOM_P5 = 99.0
+    CLEAN_SESSIONS = 3
+    CEILING_RETRY_SESSIONS = 10
+    MAX_HISTORY = 50
+
+    def __init__(self, game_info, state_file: str, logger=None):
+        self.game_info = game_info
+        self.state_file = Path(state_file)
+        self.logger = logger
+        self.games: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _log(self, message: str, level: str = "info"):
+        """Helper para logging"""
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(f"[{level.upper()}] {message}")
+
+    def _load(self):
+        """Carga el estado del ajuste"""
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    self.games = json.load(f)
+            except Exception:
+                pass
+
+    def _save(self):
+        """Guarda el estado (llamar con el lock tomado)"""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self.games, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    def on_session(self, game_id: str, summary: Dict) -> Optional[Dict]:
+        """
+        Procesa el resumen de una sesión (ver telemetry.py). Retorna el
+        cambio aplicado o None si la resolución se mantiene.
+        """
+        speed = summary.get('speed')
+        applied = summary.get('internal_resolution')
+        if not game_id or not speed:
+            return None
+        if applied is None:
+            self._log(f"Resolución de {game_id} sin ajustar: la sesión no usó la del launcher", "debug")
+            return None
+
+        current = int(applied)
+
+        with self._lock:
+            state = self.games.setdefault(game_id, {'ceiling': None, 'clean_streak': 0, 'history': []})
+            new_level = None
+            reason = None
+
+            if speed['avg'] < self.SLOW_AVG or speed['p5'] < self.SLOW_P5:
+                state['clean_streak'] = 0
+                state['ceiling'] = current if state['ceiling'] is None else min(state['ceiling'], current)
+                if current > self.MIN_RESOLUTION:
+                    new_level = current - 1
+                    reason = "por debajo de velocidad completa"
+            elif speed['p5'] >= self.HEADROOM_P5:
+                state['clean_streak'] += 1
+                ceiling = state['ceiling']
+                if ceiling is not None and current + 1 >= ceiling \
+                        and state['clean_streak'] >= self.CEILING_RETRY_SESSIONS:
+                    state['ceiling'] = None
+                    ceiling = None
+                can_rise = current < self.MAX_RESOLUTION and (ceiling is None or current + 1 < ceiling)
+                if can_rise and state['clean_streak'] >= self.CLEAN_SESSIONS:
+                    new_level = current + 1
+                    reason = f"{state['clean_streak']} sesiones a velocidad completa"
+                    state['clean_streak'] = 0
+            else:
+                # Zona intermedia (histéresis): mantener y reiniciar la racha
+                state['clean_streak'] = 0
+
+            change = None
+            if new_level is not None:
+                change = {
+                    'time': time.time(),
+                    'from': current,
+                    'to': new_level,
+                    'reason': reason,
+                    'speed_avg': speed['avg'],
+                    'speed_p5': speed['p5'],
+                }
+                state['history'] = (state['history'] + [change])[-self.MAX_HISTORY:]
+            self._save()
+
+        if change:
+            # Solo la resolución: el resto de la base de datos sigue aplicándose
+            self.game_info.update_custom_config(game_id, {'internal_resolution': new_level})
+            self._log(f"Resolución de {game_id}: {current}x -> {new_level}x ({reason})")
+        return change
+
+    def get_history(self, game_id: str) -> list:
+        """Historial de cambios de un juego"""
+        return list(self.games.get(game_id, {}).get('history', []))
+
+    def last_change(self, game_id: str) -> Optional[Dict]:
+        """Último cambio de resolución de un juego"""
+        history = self.games.get(game_id, {}).get('history')
+        return history[-1] if history else None
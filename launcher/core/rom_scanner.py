@@ -3,10 +3,53 @@ ROM Scanner - Detecta y lee información de ROMs de PS2
 """
 import os
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, NamedTuple, Optional, Tuple
 import struct
 
 
+def game_fingerprint(game: Dict) -> Tuple:
+    """Tamaño y fecha de modificación: si no cambian, el archivo es el mismo"""
+    return (game.get('size'), game.get('mtime_ns'))
+
+
+class ScanDiff(NamedTuple):
+    """Diferencias entre dos escaneos, por ruta"""
+    added: List[Dict]
+    removed: List[Dict]
+    changed: List[Dict]
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+def reconcile(previous: List[Dict], current: List[Dict]) -> Tuple[List[Dict], ScanDiff]:
+    """
+    Combina un escaneo nuevo con el anterior: los juegos que siguen
+    mantienen su posición (y su dict si no cambiaron), los modificados
+    se reemplazan en su lugar y los nuevos van al final.
+    Retorna (lista de juegos, diferencias).
+    """
+    old = {game['path']: game for game in previous}
+    new = {game['path']: game for game in current}
+    added = [game for path, game in new.items() if path not in old]
+    removed = [game for path, game in old.items() if path not in new]
+    changed = [game for path, game in new.items()
+               if path in old and old[path] is not game
+               and game_fingerprint(old[path]) != game_fingerprint(game)]
+    diff = ScanDiff(added, removed, changed)
+    if diff.empty:
+        return previous, diff
+    games = []
+    for game in previous:
+        path = game['path']
+        if path not in new:
+            continue
+        # Sin cambios se conserva el dict anterior (la selección lo referencia)
+        games.append(new[path] if game_fingerprint(game) != game_fingerprint(new[path]) else game)
+    return games + added, diff
+
+
 class ROMScanner:
     """Escanea carpetas en busca de ROMs de PS2"""
     
@@ -15,26 +58,38 @@ class ROMScanner:
     def __init__(self, roms_path: str):
         self.roms_path = Path(roms_path)
         
-    def scan(self) -> List[Dict]:
-        """Escanea la carpeta de ROMs y retorna lista de juegos encontrados"""
+    def scan(self, previous: List[Dict] = None) -> List[Dict]:
+        """
+        Escanea la carpeta de ROMs y retorna lista de juegos encontrados.
+        Los juegos de `previous` cuyo archivo no cambió (mismo tamaño y
+        fecha) se reutilizan sin volver a leer el ISO.
+        """
         games = []
         
         if not self.roms_path.exists():
             return games
-            
+        
+        known = {game['path']: game for game in previous or ()}
         for file_path in self.roms_path.iterdir():
             if file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS:
-                game_info = self._extract_game_info(file_path)
+                try:
+                    stat = file_path.stat()
+                except OSError:
+                    continue
+                game_info = known.get(str(file_path))
+                if game_info is None or game_fingerprint(game_info) != (stat.st_size, stat.st_mtime_ns):
+                    game_info = self._extract_game_info(file_path, stat)
                 if game_info:
                     games.append(game_info)
                     
         return games
     
-    def _extract_game_info(self, file_path: Path) -> Optional[Dict]:
+    def _extract_game_info(self, file_path: Path, stat: os.stat_result = None) -> Optional[Dict]:
         """Extrae información del juego desde el archivo ISO"""
         try:
             game_id = self._read_game_id(file_path)
-            file_size = file_path.stat().st_size
+            stat = stat or file_path.stat()
+            file_size = stat.st_size
             
             # Nombre limpio del archivo
             name = file_path.stem
@@ -46,6 +101,7 @@ class ROMScanner:
                 'name': name,
                 'path': str(file_path),
                 'size': file_size,
+                'mtime_ns': stat.st_mtime_ns,
                 'size_formatted': self._format_size(file_size),
                 'extension': file_path.suffix.lower()
             }
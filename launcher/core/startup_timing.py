@@ -0,0 +1,139 @@
+"""
+Startup Timing - Tiempo de arranque del launcher por fase y presupuesto del primer pintado
+
+El arranque se mide desde el inicio de main.py: imports, biblioteca
+guardada, ventana creada, primer pintado y después cada subsistema que
+se inicializa en segundo plano (escaneo de ROMs, mandos, emulador). El
+primer pintado tiene un presupuesto; tools/startup_report.py lo
+comprueba junto con el tiempo de cada import (`python -X importtime`).
+"""
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# Fases del arranque en orden, con su nombre para mostrar
+STARTUP_PHASES = [
+    ('imports', 'Imports'),
+    ('snapshot', 'Biblioteca guardada'),
+    ('window', 'Ventana creada'),
+    ('first_paint', 'Primer pintado'),
+    ('library', 'Escaneo de ROMs'),
+    ('gamepads', 'Mandos'),
+    ('emulator', 'Emulador'),
+    ('ready', 'Todo listo'),
+]
+
+# Inicio de main.py -> ventana pintada (ms)
+FIRST_PAINT_BUDGET_MS = 400
+# Arranques guardados en el historial
+MAX_HISTORY = 20
+
+# "import time:       976 |      14553 |     pygame"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+
+class StartupTimer:
+    """Marca de tiempo de cada fase del arranque"""
+
+    def __init__(self, started: float = None, budget_ms: float = FIRST_PAINT_BUDGET_MS):
+        now = time.perf_counter()
+        self.started = started if started is not None else now
+        # Hora de reloj del inicio: sirve para comparar con quien lanzó el proceso
+        self.started_wall = time.time() - (now - self.started)
+        self.budget_ms = budget_ms
+        self.marks: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, phase: str):
+        """Registra una fase (solo cuenta la primera vez)"""
+        now = time.perf_counter()
+        with self._lock:
+            self.marks.setdefault(phase, now)
+
+    def phases_ms(self) -> Dict[str, float]:
+        """Milisegundos desde el inicio hasta cada fase registrada"""
+        return {
+            phase: round((self.marks[phase] - self.started) * 1000, 1)
+            for phase, _ in STARTUP_PHASES
+            if phase in self.marks
+        }
+
+    def first_paint_ms(self) -> Optional[float]:
+        return self.phases_ms().get('first_paint')
+
+    def over_budget(self) -> bool:
+        first_paint = self.first_paint_ms()
+        return first_paint is not None and first_paint > self.budget_ms
+
+    def report(self) -> Dict:
+        return {
+            'phases_ms': self.phases_ms(),
+            'first_paint_ms': self.first_paint_ms(),
+            'budget_ms': self.budget_ms,
+            'over_budget': self.over_budget(),
+            'started_wall': self.started_wall,
+        }
+
+    def summary_text(self) -> str:
+        """Una línea para el log: 'Imports 95 ms | Ventana creada 150 ms | ...'"""
+        phases = self.phases_ms()
+        parts = []
+        for phase, label in STARTUP_PHASES:
+            if phase in phases:
+                parts.append(f"{label} {phases[phase]:.0f} ms")
+        budget = f" (presupuesto {self.budget_ms:.0f} ms, EXCEDIDO)" if self.over_budget() else ""
+        return " | ".join(parts) + budget
+
+
+class StartupHistory:
+    """Últimos arranques medidos (config/startup_timing.json)"""
+
+    def __init__(self, state_file: Path):
+        self.state_file = Path(state_file)
+
+    def load(self) -> List[Dict]:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('history', [])
+        except (OSError, ValueError):
+            return []
+
+    def record(self, report: Dict):
+        history = (self.load() + [report])[-MAX_HISTORY:]
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_file.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'history': history}, f, indent=2)
+        os.replace(tmp, self.state_file)
+
+
+def parse_importtime(text: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Líneas de `python -X importtime` como (módulo, propio_us, acumulado_us,
+    profundidad). Profundidad 0 = import de primer nivel.
+    """
+    entries = []
+    for line in text.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def slowest_imports(text: str, top: int = 10) -> List[Tuple[str, float]]:
+    """
+    Paquetes cuyo import costó más (ms), sumando el tiempo propio de todos
+    sus módulos: así 'numpy' aparece aunque lo haya importado otro módulo.
+    """
+    totals: Dict[str, int] = {}
+    for module, self_us, _, _ in parse_importtime(text):
+        package = module.split('.')[0]
+        totals[package] = totals.get(package, 0) + self_us
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [(package, round(us / 1000, 1)) for package, us in ranked]
@@ -0,0 +1,269 @@
+"""
+Stick Calibration - Deriva, zona muerta y alcance de los sticks analógicos por mando
+"""
+import importlib.util
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# NumPy es opcional: el análisis vectorizado es mucho más rápido con
+# muestreos largos, pero hay una versión en Python puro equivalente.
+# Solo se importa al analizar (cargarlo cuesta más que arrancar la ventana)
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+
+# Valores de PCSX2 sin calibrar (ver SDL_PAD_CONFIG)
+DEFAULT_DEADZONE = 0.0
+DEFAULT_AXIS_SCALE = 1.33
+
+MAX_DEADZONE = 0.4
+MIN_AXIS_SCALE = 1.0
+MAX_AXIS_SCALE = 2.0
+# Margen sobre deriva + ruido para que el stick en reposo quede dentro
+DEADZONE_MARGIN = 1.2
+# Zonas muertas menores no valen la pena (stick sano)
+MIN_DEADZONE = 0.02
+SECTORS = 16
+MIN_COVERAGE = 0.75
+MAX_SAMPLES = 50000
+
+# Ejes (SDL joystick / códigos evdev ABS_*) de cada stick si no hay mapeo
+DEFAULT_STICK_AXES = {
+    'pygame': {'left': (0, 1), 'right': (2, 3)},
+    'evdev': {'left': (0x00, 0x01), 'right': (0x03, 0x04)},
+}
+
+
+def default_stick_axes(gamepad, backend_name: str = 'pygame') -> Dict[str, Tuple[int, int]]:
+    """Ejes X/Y de cada stick: del mapeo SDL del mando o los habituales"""
+    axes = dict(DEFAULT_STICK_AXES.get(backend_name, DEFAULT_STICK_AXES['pygame']))
+    layout = getattr(gamepad, 'layout', None) or {}
+    if backend_name == 'pygame':
+        for stick in ('left', 'right'):
+            x, y = layout.get(f'{stick}x', ''), layout.get(f'{stick}y', '')
+            if x.startswith('a') and y.startswith('a') and x[1:].isdigit() and y[1:].isdigit():
+                axes[stick] = (int(x[1:]), int(y[1:]))
+    return axes
+
+
+def _analyze_numpy(rest: Sequence, sweep: Sequence) -> Dict:
+    import numpy as np
+    rest = np.asarray(rest, dtype=np.float64).reshape(-1, 2)
+    center = rest.mean(axis=0)
+    noise = float(np.percentile(np.hypot(*(rest - center).T), 99))
+
+    sweep = np.asarray(sweep, dtype=np.float64).reshape(-1, 2) - center
+    radius = np.hypot(sweep[:, 0], sweep[:, 1])
+    sector = ((np.arctan2(sweep[:, 1], sweep[:, 0]) + math.pi) / (2 * math.pi) * SECTORS)
+    sector = np.minimum(sector.astype(np.int64), SECTORS - 1)
+    outer = np.zeros(SECTORS)
+    np.maximum.at(outer, sector, radius)
+    return _summarize(center.tolist(), noise, outer.tolist())
+
+
+def _analyze_python(rest: Sequence, sweep: Sequence) -> Dict:
+    cx = sum(x for x, _ in rest) / len(rest)
+    cy = sum(y for _, y in rest) / len(rest)
+    deviations = sorted(math.hypot(x - cx, y - cy) for x, y in rest)
+    noise = deviations[min(len(deviations) - 1, int(round(0.99 * (len(deviations) - 1))))]
+
+    outer = [0.0] * SECTORS
+    for x, y in sweep:
+        x, y = x - cx, y - cy
+        sector = min(int((math.atan2(y, x) + math.pi) / (2 * math.pi) * SECTORS), SECTORS - 1)
+        outer[sector] = max(outer[sector], math.hypot(x, y))
+    return _summarize([cx, cy], noise, outer)
+
+
+def _summarize(center: List[float], noise: float, outer: List[float]) -> Dict:
+    """Métricas de un stick y los valores de PCSX2 que corresponden"""
+    drift = math.hypot(*center)
+    reached = sorted(r for r in outer if r > 0.2)
+    coverage = len(reached) / SECTORS
+    result = {
+        'center': [round(c, 4) for c in center],
+        'drift': round(drift, 4),
+        'noise': round(noise, 4),
+        'coverage': round(coverage, 2),
+        'max_radius': round(reached[len(reached) // 2], 4) if reached else 0.0,
+        'circularity': round(reached[0] / reached[-1], 3) if reached else 0.0,
+    }
+    deadzone = (drift + noise) * DEADZONE_MARGIN
+    result['deadzone'] = round(min(deadzone, MAX_DEADZONE), 2) if deadzone >= MIN_DEADZONE else 0.0
+    if coverage >= MIN_COVERAGE:
+        # Un stick gastado no llega al borde: se compensa con más escala
+        scale = DEFAULT_AXIS_SCALE / result['max_radius']
+        result['axis_scale'] = round(max(MIN_AXIS_SCALE, min(scale, MAX_AXIS_SCALE)), 2)
+    return result
+
+
+def analyze_stick(rest: Sequence, sweep: Sequence) -> Dict:
+    """
+    Analiza un stick a partir de muestras (x, y) normalizadas a -1..1:
+    `rest` con el stick suelto y `sweep` girándolo contra el borde.
+    Retorna centro, deriva, ruido, cobertura, radio, circularidad,
+    'deadzone' y 'axis_scale' (si el barrido cubrió todo el borde).
+    """
+    if not rest:
+        raise ValueError("No hay muestras en reposo")
+    if not sweep:
+        sweep = rest
+    if NUMPY_AVAILABLE:
+        return _analyze_numpy(rest, sweep)
+    return _analyze_python(rest, sweep)
+
+
+def pad_settings(result: Dict) -> Dict[str, float]:
+    """Deadzone/AxisScale de [PadN]: PCSX2 usa un valor para ambos sticks"""
+    sticks = [result[s] for s in ('left', 'right') if s in result]
+    scales = [s['axis_scale'] for s in sticks if 'axis_scale' in s]
+    return {
+        'Deadzone': max([s['deadzone'] for s in sticks], default=DEFAULT_DEADZONE),
+        'AxisScale': max(scales, default=DEFAULT_AXIS_SCALE),
+    }
+
+
+class CalibrationSampler:
+    """
+    Junta muestras (x, y) de cada stick desde los eventos de entrada del
+    detector (`GamepadDetector.add_input_listener`). `phase` indica a
+    qué grupo van: 'rest' o 'sweep' (None = no guardar).
+
+    Los backends solo avisan cuando un eje cambia, así que `set_phase`
+    agrega además la posición actual: un stick quieto también deja
+    muestras en reposo.
+    """
+
+    def __init__(self, instance_id: int, stick_axes: Dict[str, Tuple[int, int]]):
+        self.instance_id = instance_id
+        self.stick_axes = stick_axes
+        self.phase: Optional[str] = None
+        self.values: Dict[int, float] = {}
+        self.samples = {phase: {stick: [] for stick in stick_axes} for phase in ('rest', 'sweep')}
+
+    def feed(self, event):
+        """Listener de eventos de entrada (hilo de monitoreo)"""
+        if event.instance_id != self.instance_id or event.kind != 'axis' or self.phase is None:
+            return
+        self.values[event.code] = event.value
+        for stick, (x_axis, y_axis) in self.stick_axes.items():
+            if event.code in (x_axis, y_axis):
+                samples = self.samples[self.phase][stick]
+                if len(samples) < MAX_SAMPLES:
+                    samples.append((self.values.get(x_axis, 0.0), self.values.get(y_axis, 0.0)))
+
+    def set_phase(self, phase: Optional[str]):
+        """Cambia de fase y registra la posición actual de cada stick"""
+        self.phase = phase
+        if phase is None:
+            return
+        for stick, (x_axis, y_axis) in self.stick_axes.items():
+            if x_axis in self.values or y_axis in self.values:
+                self.samples[phase][stick].append(
+                    (self.values.get(x_axis, 0.0), self.values.get(y_axis, 0.0)))
+
+    def count(self, phase: str) -> int:
+        return min(len(samples) for samples in self.samples[phase].values())
+
+    def analyze(self) -> Dict:
+        """Resultado de ambos sticks (los que tengan muestras en reposo)"""
+        result = {}
+        for stick in self.stick_axes:
+            rest = self.samples['rest'][stick]
+            if rest:
+                result[stick] = analyze_stick(rest, self.samples['sweep'][stick])
+        return result
+
+
+class StickCalibration:
+    """
+    Calibraciones guardadas por GUID (config/stick_calibration.json).
+    Se leen una vez; `pad_settings` se consulta al generar cada [PadN].
+    """
+
+    def __init__(self, state_file: str = None, logger=None):
+        self.state_file = Path(state_file) if state_file else None
+        self.logger = logger
+        self.calibrations: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _log(self, message: str, level: str = "info"):
+        """Helper para logging"""
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(f"[{level.upper()}] {message}")
+
+    def _load(self):
+        if self.state_file and self.state_file.exists():
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    self.calibrations = json.load(f)
+            except (OSError, ValueError):
+                pass
+
+    def _save(self):
+        """Guarda las calibraciones (llamar con el lock tomado)"""
+        if not self.state_file:
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.calibrations, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    @staticmethod
+    def _key(gamepad) -> str:
+        return (gamepad.guid or gamepad.name).lower()
+
+    def get(self, gamepad) -> Optional[Dict]:
+        return self.calibrations.get(self._key(gamepad))
+
+    def is_calibrated(self, gamepad) -> bool:
+        return self._key(gamepad) in self.calibrations
+
+    def save(self, gamepad, result: Dict) -> Dict:
+        """Guarda el resultado de analizar los sticks de un mando"""
+        entry = dict(result)
+        entry.update({'name': gamepad.name, 'time': time.time()})
+        entry.update(pad_settings(result))
+        with self._lock:
+            self.calibrations[self._key(gamepad)] = entry
+            self._save()
+        self._log(f"Sticks calibrados: {gamepad.name} "
+                  f"(Deadzone {entry['Deadzone']}, AxisScale {entry['AxisScale']})")
+        return entry
+
+    def forget(self, gamepad) -> bool:
+        with self._lock:
+            if self.calibrations.pop(self._key(gamepad), None) is None:
+                return False
+            self._save()
+        return True
+
+    def pad_settings(self, gamepad) -> Dict[str, float]:
+        """Deadzone/AxisScale del mando (valores por defecto si no está calibrado)"""
+        entry = self.get(gamepad)
+        if not entry:
+            return {'Deadzone': DEFAULT_DEADZONE, 'AxisScale': DEFAULT_AXIS_SCALE}
+        return {'Deadzone': entry['Deadzone'], 'AxisScale': entry['AxisScale']}
+
+
+def format_calibration(entry: Dict) -> str:
+    """Resumen en texto de una calibración guardada"""
+    lines = [f"Deadzone {entry['Deadzone']:.2f} · AxisScale {entry['AxisScale']:.2f}"]
+    for stick, label in (('left', "Izq"), ('right', "Der")):
+        data = entry.get(stick)
+        if not data:
+            continue
+        line = (f"  {label}: deriva {data['drift']:.3f}, ruido {data['noise']:.3f}, "
+                f"radio {data['max_radius']:.2f}, circularidad {data['circularity']:.2f}")
+        if data['coverage'] < MIN_COVERAGE:
+            line += " (barrido incompleto: escala sin cambiar)"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,323 @@
+"""
+Telemetry - Rendimiento de cada sesión leído de la salida de PCSX2
+"""
+import json
+import math
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+# Líneas de rendimiento (stdout / emulog.txt)
+SPEED_PATTERN = re.compile(r'speed[:=\s]+(\d+(?:\.\d+)?)\s*%', re.IGNORECASE)
+FPS_PATTERN = re.compile(r'\bfps[:=\s]+(\d+(?:\.\d+)?)', re.IGNORECASE)
+VPS_PATTERN = re.compile(r'\bvps[:=\s]+(\d+(?:\.\d+)?)', re.IGNORECASE)
+FRAME_TIME_PATTERN = re.compile(r'frame\s*time|slow frame|frame took|long frame', re.IGNORECASE)
+SHADER_PATTERN = re.compile(r'compil\w*\s+(shader|pipeline)|shader cache miss|pipeline cache miss',
+                            re.IGNORECASE)
+
+# Por debajo de este porcentaje la sesión "no fue a velocidad completa"
+FULL_SPEED_THRESHOLD = 97.0
+
+
+class RunningStats:
+    """
+    Estadísticas con memoria constante: media (Welford), mínimo, máximo y
+    un histograma de cubetas fijas para percentiles aproximados.
+    """
+
+    def __init__(self, bucket_size: float = 1.0, max_value: float = 300.0):
+        self.bucket_size = bucket_size
+        self.buckets = [0] * (int(max_value / bucket_size) + 1)
+        self.count = 0
+        self.mean = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float):
+        """Agrega una muestra"""
+        self.count += 1
+        self.mean += (value - self.mean) / self.count
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        index = min(len(self.buckets) - 1, max(0, int(value / self.bucket_size)))
+        self.buckets[index] += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Percentil aproximado (límite inferior de la cubeta)"""
+        if not self.count:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.buckets):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return index * self.bucket_size
+        return self.maximum
+
+    def summary(self) -> Optional[Dict]:
+        """Resumen serializable"""
+        if not self.count:
+            return None
+        return {
+            'avg': round(self.mean, 2),
+            'min': round(self.minimum, 2),
+            'max': round(self.maximum, 2),
+            'p5': self.percentile(0.05),
+            'samples': self.count,
+        }
+
+
+def _number(pattern: re.Pattern, line: str) -> Optional[float]:
+    """Valor numérico capturado por `pattern` (None si no hay o no es válido)"""
+    match = pattern.search(line)
+    if not match:
+        return None
+    try:
+        return float(match.group(1))
+    except ValueError:
+        return None
+
+
+class TelemetryParser:
+    """Parser incremental de líneas de rendimiento de PCSX2"""
+
+    def __init__(self):
+        self.speed = RunningStats(bucket_size=0.5)
+        self.fps = RunningStats(bucket_size=0.5)
+        self.vps = RunningStats(bucket_size=0.5)
+        self.slow_samples = 0
+        self.frame_time_warnings = 0
+        self.shader_stalls = 0
+        self.lines = 0
+        self.start_time = time.time()
+        self.end_time: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def feed(self, line: str):
+        """Procesa una línea de salida"""
+        with self._lock:
+            self.lines += 1
+            value = _number(SPEED_PATTERN, line)
+            if value is not None:
+                self.speed.add(value)
+                if value < FULL_SPEED_THRESHOLD:
+                    self.slow_samples += 1
+            value = _number(FPS_PATTERN, line)
+            if value is not None:
+                self.fps.add(value)
+            value = _number(VPS_PATTERN, line)
+            if value is not None:
+                self.vps.add(value)
+            if FRAME_TIME_PATTERN.search(line):
+                self.frame_time_warnings += 1
+            if SHADER_PATTERN.search(line):
+                self.shader_stalls += 1
+
+    def finish(self):
+        """Marca el final de la sesión"""
+        self.end_time = self.end_time or time.time()
+
+    def summary(self) -> Dict:
+        """Resumen de la sesión"""
+        with self._lock:
+            end = self.end_time or time.time()
+            speed = self.speed.summary()
+            return {
+                'start': self.start_time,
+                'duration': round(end - self.start_time, 1),
+                'speed': speed,
+                'fps': self.fps.summary(),
+                'vps': self.vps.summary(),
+                'slow_ratio': round(self.slow_samples / self.speed.count, 3) if self.speed.count else None,
+                'frame_time_warnings': self.frame_time_warnings,
+                'shader_stalls': self.shader_stalls,
+            }
+
+
+class LogTailer:
+    """Sigue un archivo de log que crece (como `tail -f`) en un hilo"""
+
+    POLL_INTERVAL = 0.25
+    CHUNK_SIZE = 64 * 1024
+    MAX_PARTIAL_LINE = 4096
+
+    def __init__(self, path: Path, on_line: Callable[[str], None], from_start: bool = False):
+        self.path = Path(path)
+        self.on_line = on_line
+        self.position = 0
+        self._partial = b''
+        self._stop = threading.Event()
+        self._thread = None
+        if not from_start:
+            try:
+                self.position = self.path.stat().st_size
+            except OSError:
+                self.position = 0
+
+    def start(self):
+        """Inicia el seguimiento en segundo plano"""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Detiene el seguimiento tras leer lo pendiente"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.read_new()
+            self._stop.wait(self.POLL_INTERVAL)
+        self.read_new()
+
+    def read_new(self):
+        """Lee lo escrito desde la última vez"""
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return
+        if size < self.position:
+            # PCSX2 trunca emulog.txt al arrancar
+            self.position = 0
+            self._partial = b''
+        if size == self.position:
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self.position)
+                while True:
+                    chunk = f.read(self.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    self.position += len(chunk)
+                    self._consume(chunk)
+        except OSError:
+            pass
+
+    def _consume(self, chunk: bytes):
+        data = self._partial + chunk
+        lines = data.split(b'\n')
+        self._partial = lines.pop()[-self.MAX_PARTIAL_LINE:]
+        for raw_line in lines:
+            self.on_line(raw_line.decode('utf-8', errors='replace').rstrip('\r'))
+
+
+class TelemetrySession:
+    """
+    Recoge la telemetría de una partida de una sola fuente: emulog.txt si
+    PCSX2 escribió en él, si no stdout. PCSX2 copia su consola en emulog,
+    así que contar las dos duplicaría cada línea. Cada fuente tiene su
+    parser y el resumen usa el de emulog si recibió alguna línea.
+    `internal_resolution` es la resolución que PCSX2 tenía en su INI (None
+    si el launcher no pudo escribirla).
+    """
+
+    def __init__(self, game_id: str = None, internal_resolution: int = None):
+        self.game_id = game_id
+        self.internal_resolution = internal_resolution
+        self.stdout_parser = TelemetryParser()
+        self.emulog_parser = TelemetryParser()
+        self._tailer: Optional[LogTailer] = None
+
+    @property
+    def parser(self) -> TelemetryParser:
+        """Parser de la fuente usada"""
+        return self.emulog_parser if self.emulog_parser.lines else self.stdout_parser
+
+    def on_output(self, line: str):
+        """Callback de salida del supervisor (registrar antes de start())"""
+        self.stdout_parser.feed(line)
+
+    def watch(self, supervisor, emulog_path: Path = None,
+              on_finished: Callable[['TelemetrySession'], None] = None):
+        """Sigue emulog.txt hasta que el proceso termina"""
+        if emulog_path:
+            self._tailer = LogTailer(emulog_path, self.emulog_parser.feed)
+            self._tailer.start()
+
+        def run():
+            supervisor.wait()
+            if self._tailer:
+                self._tailer.stop()
+            self.stdout_parser.finish()
+            self.emulog_parser.finish()
+            if on_finished:
+                on_finished(self)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def summary(self) -> Dict:
+        """Resumen de la sesión"""
+        return {**self.parser.summary(), 'internal_resolution': self.internal_resolution}
+
+
+class TelemetryStore:
+    """Historial de sesiones por juego (serial)"""
+
+    MAX_SESSIONS = 20
+    # Sesiones más cortas no dicen nada del rendimiento
+    MIN_DURATION = 30
+
+    def __init__(self, store_file: str):
+        self.store_file = Path(store_file)
+        self.games: Dict[str, List[Dict]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Carga el historial guardado"""
+        if self.store_file.exists():
+            try:
+                with open(self.store_file, 'r') as f:
+                    self.games = json.load(f)
+            except Exception:
+                pass
+
+    def _save(self):
+        """Guarda el historial (llamar con el lock tomado)"""
+        self.store_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.store_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self.games, f, indent=2)
+        os.replace(tmp_file, self.store_file)
+
+    def record(self, game_id: str, summary: Dict) -> bool:
+        """Guarda una sesión si tiene datos de rendimiento"""
+        if not game_id or not summary.get('speed') or summary['duration'] < self.MIN_DURATION:
+            return False
+        with self._lock:
+            sessions = self.games.setdefault(game_id, [])
+            sessions.append(summary)
+            self.games[game_id] = sessions[-self.MAX_SESSIONS:]
+            self._save()
+        return True
+
+    def get_sessions(self, game_id: str) -> List[Dict]:
+        """Sesiones de un juego, de la más antigua a la más reciente"""
+        return list(self.games.get(game_id, []))
+
+    def last_session(self, game_id: str) -> Optional[Dict]:
+        """Última sesión registrada de un juego"""
+        sessions = self.games.get(game_id)
+        return sessions[-1] if sessions else None
+
+
+def format_session_summary(summary: Dict) -> str:
+    """Texto corto de rendimiento para la interfaz"""
+    parts = []
+    if summary.get('speed'):
+        parts.append(f"Velocidad {summary['speed']['avg']:.0f}% (mín. {summary['speed']['min']:.0f}%)")
+    if summary.get('fps'):
+        parts.append(f"{summary['fps']['avg']:.1f} FPS")
+    if summary.get('shader_stalls'):
+        parts.append(f"{summary['shader_stalls']} tirones de shader")
+    if summary.get('frame_time_warnings'):
+        parts.append(f"{summary['frame_time_warnings']} avisos de frame time")
+    minutes = summary.get('duration', 0) / 60
+    parts.append(f"{minutes:.0f} min")
+    return "\n".join(parts)
@@ -8,20 +8,33 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from core.emulator import ControllerConfig
+from core.input_diagnostics import format_report, save_report
+from core.stick_calibration import format_calibration
 
 
 class ControllerConfigWindow(ctk.CTkToplevel):
     """Ventana de configuración de mandos"""
     
-    def __init__(self, parent, controller_config: ControllerConfig):
+    DIAGNOSTIC_SECONDS = 10
+    # Pasos del asistente de calibración: (fase, segundos, instrucción)
+    CALIBRATION_STEPS = [
+        ('rest', 3, "Suelta los sticks y no toques el mando"),
+        ('sweep', 6, "Gira ambos sticks contra el borde, varias vueltas"),
+    ]
+    
+    def __init__(self, parent, controller_config: ControllerConfig, detector=None):
         super().__init__(parent)
         
         self.controller_config = controller_config
+        # GamepadDetector opcional: habilita el diagnóstico de latencia
+        self.detector = detector
         self.waiting_for_key = None
         self.button_widgets = {}
+        self._diagnostic_remaining = 0
+        self._calibration = None
         
         self.title("🎮 Configuración de Mandos")
-        self.geometry("700x600")
+        self.geometry("700x780" if detector else "700x600")
         self.resizable(False, False)
         
         # Bind para capturar teclas
@@ -111,6 +124,10 @@ class ControllerConfigWindow(ctk.CTkToplevel):
         for button_id, label in buttons_row:
             self._create_button_mapping(other_inner, button_id, label, horizontal=True)
             
+        # === DIAGNÓSTICO ===
+        if self.detector:
+            self._create_diagnostics_panel()
+            
         # Botones de acción
         action_frame = ctk.CTkFrame(self, fg_color="transparent")
         action_frame.pack(fill="x", padx=20, pady=15)
@@ -133,6 +150,130 @@ class ControllerConfigWindow(ctk.CTkToplevel):
         )
         save_btn.pack(side="right", padx=5)
         
+    def _create_diagnostics_panel(self):
+        """Panel de medición de frecuencia de reporte y jitter"""
+        diag_frame = ctk.CTkFrame(self, fg_color=("#16213e", "#16213e"), corner_radius=15)
+        diag_frame.pack(fill="x", padx=20, pady=(0, 10))
+        
+        top = ctk.CTkFrame(diag_frame, fg_color="transparent")
+        top.pack(fill="x", padx=15, pady=(10, 5))
+        
+        ctk.CTkLabel(top, text="Diagnóstico y calibración",
+                     font=ctk.CTkFont(size=14, weight="bold"),
+                     text_color="#00d4ff").pack(side="left")
+        
+        gamepad = self.detector.active_gamepad
+        calibrated = gamepad is not None and self.detector.calibration.is_calibrated(gamepad)
+        self.calib_btn = ctk.CTkButton(
+            top, text="🎯 Recalibrar sticks" if calibrated else "🎯 Calibrar sticks",
+            width=140, height=28,
+            fg_color=("#2d3436", "#2d3436"),
+            hover_color=("#636e72", "#636e72"),
+            command=self._start_calibration
+        )
+        self.calib_btn.pack(side="right", padx=(5, 0))
+        
+        self.diag_btn = ctk.CTkButton(
+            top, text=f"⏱ Medir ({self.DIAGNOSTIC_SECONDS} s)",
+            width=120, height=28,
+            fg_color=("#2d3436", "#2d3436"),
+            hover_color=("#636e72", "#636e72"),
+            command=self._start_diagnostics
+        )
+        self.diag_btn.pack(side="right")
+        
+        self.diag_label = ctk.CTkLabel(
+            diag_frame,
+            text="Mide la frecuencia de reporte y el jitter de los mandos conectados",
+            font=ctk.CTkFont(family="Consolas", size=11),
+            text_color="#888", justify="left", anchor="w"
+        )
+        self.diag_label.pack(fill="x", padx=15, pady=(0, 10))
+        if calibrated:
+            self.diag_label.configure(
+                text=format_calibration(self.detector.calibration.get(gamepad)))
+        
+    def _start_diagnostics(self):
+        """Empieza la medición; el resultado se muestra al terminar"""
+        if not self.detector.gamepads:
+            self.diag_label.configure(text="No hay mandos conectados")
+            return
+        if self.detector.start_diagnostics() is None:
+            self.diag_label.configure(text="El backend de mandos no permite medir la entrada")
+            return
+        self.diag_btn.configure(state="disabled")
+        self._diagnostic_remaining = self.DIAGNOSTIC_SECONDS
+        self._tick_diagnostics()
+        
+    def _tick_diagnostics(self):
+        if not self.winfo_exists():
+            return
+        if self._diagnostic_remaining > 0:
+            self.diag_label.configure(
+                text=f"Mueve los sticks sin parar... {self._diagnostic_remaining} s")
+            self._diagnostic_remaining -= 1
+            self.after(1000, self._tick_diagnostics)
+            return
+        report = self.detector.stop_diagnostics()
+        text = format_report(report)
+        try:
+            path = save_report(report, Path(__file__).parent.parent.parent / "logs" / "input_diagnostics")
+            text += f"\nInforme: {path.name}"
+        except OSError:
+            pass
+        self.diag_label.configure(text=text)
+        self.diag_btn.configure(state="normal")
+        
+    def _start_calibration(self):
+        """Asistente: muestras en reposo, barrido y análisis del mando activo"""
+        gamepad = self.detector.active_gamepad
+        if gamepad is None:
+            self.diag_label.configure(text="No hay mandos conectados")
+            return
+        sampler = self.detector.start_calibration(gamepad)
+        if sampler is None:
+            self.diag_label.configure(text="El backend de mandos no permite leer los sticks")
+            return
+        self._calibration = (gamepad, sampler)
+        self.calib_btn.configure(state="disabled")
+        self.diag_btn.configure(state="disabled")
+        self._run_calibration_step(0, self.CALIBRATION_STEPS[0][1])
+        
+    def _run_calibration_step(self, step: int, remaining: int):
+        if not self.winfo_exists() or self._calibration is None:
+            return
+        gamepad, sampler = self._calibration
+        if step < len(self.CALIBRATION_STEPS):
+            phase, seconds, instruction = self.CALIBRATION_STEPS[step]
+            if remaining > 0:
+                sampler.set_phase(phase)
+                self.diag_label.configure(
+                    text=f"{gamepad.name}\n{instruction}... {remaining} s "
+                         f"({sampler.count(phase)} muestras)")
+                self.after(1000, self._run_calibration_step, step, remaining - 1)
+            else:
+                next_seconds = self.CALIBRATION_STEPS[step + 1][1] \
+                    if step + 1 < len(self.CALIBRATION_STEPS) else 0
+                self._run_calibration_step(step + 1, next_seconds)
+            return
+        
+        sampler.set_phase(None)
+        self._calibration = None
+        entry = self.detector.finish_calibration(gamepad, sampler)
+        self.diag_label.configure(
+            text=format_calibration(entry) if entry else "Sin muestras: ¿el mando responde?")
+        self.calib_btn.configure(state="normal",
+                                 text="🎯 Recalibrar sticks" if entry else "🎯 Calibrar sticks")
+        self.diag_btn.configure(state="normal")
+        
+    def destroy(self):
+        if self.detector and self.detector.diagnostics is not None:
+            self.detector.stop_diagnostics()
+        if self._calibration is not None:
+            self.detector.remove_input_listener(self._calibration[1].feed)
+            self._calibration = None
+        super().destroy()
+        
     def _create_section(self, parent, title: str, buttons: list):
         """Crea una sección de botones"""
         section = ctk.CTkFrame(parent, fg_color="transparent")
@@ -0,0 +1,279 @@
+"""
+Gamepad Navigation - Manejo de la interfaz con el mando (modo "big picture")
+
+El hilo de entrada del detector traduce cada InputEvent a una acción
+('up', 'down', 'accept', ...) y la deja en una cola; la ventana la vacía
+con after() cada POLL_MS, repite las direcciones mantenidas con
+aceleración y mide la latencia desde el evento hasta el resaltado.
+"""
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, Tuple
+
+
+# Sondeo de la cola en el bucle de Tk (ms): la mitad de un cuadro a 60 Hz
+POLL_MS = 8
+# Presupuesto de latencia entrada -> resaltado: un cuadro a 60 Hz
+LATENCY_BUDGET_MS = 1000 / 60
+
+# Repetición de direcciones mantenidas: espera inicial, intervalo que se
+# acorta en cada repetición hasta el mínimo
+REPEAT_DELAY_MS = 350
+REPEAT_INTERVAL_MS = 120
+REPEAT_MIN_INTERVAL_MS = 30
+REPEAT_ACCELERATION = 0.85
+
+# Stick como cruceta: umbrales con histéresis para que no rebote
+STICK_PRESS = 0.6
+STICK_RELEASE = 0.4
+
+DIRECTIONS = ('up', 'down', 'left', 'right')
+# Acciones que se repiten al mantenerlas y cuya latencia se mide (mueven
+# el resaltado; abrir una ventana o lanzar un juego no cuenta)
+REPEATING = DIRECTIONS + ('page_up', 'page_down')
+MAX_QUEUED = 256
+MAX_LATENCIES = 500
+
+# Elementos SDL -> acción de navegación
+SDL_TO_ACTION = {
+    'a': 'accept', 'b': 'back', 'y': 'controllers',
+    'back': 'config', 'start': 'play',
+    'leftshoulder': 'page_up', 'rightshoulder': 'page_down',
+    'dpup': 'up', 'dpdown': 'down', 'dpleft': 'left', 'dpright': 'right',
+}
+
+# Bits de una cruceta SDL (h0.1 = arriba, ...)
+HAT_UP, HAT_RIGHT, HAT_DOWN, HAT_LEFT = 1, 2, 4, 8
+HAT_DIRECTIONS = {HAT_UP: 'up', HAT_RIGHT: 'right', HAT_DOWN: 'down', HAT_LEFT: 'left'}
+
+# Sin mapeo conocido: disposición XInput de SDL (A=0, B=1, X=2, Y=3, LB=4,
+# RB=5, Back=6, Start=7) o códigos evdev (BTN_SOUTH, ..., BTN_DPAD_*)
+DEFAULT_BUTTONS = {
+    'pygame': {0: 'accept', 1: 'back', 3: 'controllers', 4: 'page_up', 5: 'page_down',
+               6: 'config', 7: 'play'},
+    'evdev': {0x130: 'accept', 0x131: 'back', 0x133: 'controllers', 0x136: 'page_up',
+              0x137: 'page_down', 0x13a: 'config', 0x13b: 'play',
+              0x220: 'up', 0x221: 'down', 0x222: 'left', 0x223: 'right'},
+}
+# Stick izquierdo (x, y): índice SDL o ABS_X/ABS_Y
+DEFAULT_STICK = {'pygame': (0, 1), 'evdev': (0x00, 0x01)}
+EVDEV_HAT_X, EVDEV_HAT_Y = 0x10, 0x11
+
+
+class PadMapping:
+    """Botones, crucetas y stick de un mando -> acciones de navegación"""
+
+    def __init__(self, gamepad, backend_name: str = 'pygame'):
+        self.evdev = backend_name == 'evdev'
+        self.buttons: Dict[int, str] = dict(DEFAULT_BUTTONS['evdev' if self.evdev else 'pygame'])
+        self.hats: Dict[Tuple[int, int], str] = {(0, bit): d for bit, d in HAT_DIRECTIONS.items()}
+        self.stick: Tuple[int, int] = DEFAULT_STICK['evdev' if self.evdev else 'pygame']
+        layout = getattr(gamepad, 'layout', None) or {}
+        if layout and not self.evdev:
+            self._apply_layout(layout)
+
+    def _apply_layout(self, layout: Dict[str, str]):
+        """Usa el mapeo SDL real del mando (los índices de pygame son los suyos)"""
+        self.buttons, self.hats = {}, {}
+        for element, action in SDL_TO_ACTION.items():
+            binding = layout.get(element, '')
+            if binding.startswith('b') and binding[1:].isdigit():
+                self.buttons[int(binding[1:])] = action
+            elif binding.startswith('h') and '.' in binding:
+                hat, _, bit = binding[1:].partition('.')
+                if hat.isdigit() and bit.isdigit():
+                    self.hats[(int(hat), int(bit))] = action
+        x, y = layout.get('leftx', ''), layout.get('lefty', '')
+        if x.startswith('a') and y.startswith('a') and x[1:].isdigit() and y[1:].isdigit():
+            self.stick = (int(x[1:]), int(y[1:]))
+
+
+class GamepadNavigator:
+    """
+    Traduce la entrada de los mandos a acciones de la ventana.
+
+    `handlers` asocia cada acción ('up', 'down', 'left', 'right', 'accept',
+    'back', 'play', 'config', 'controllers', 'page_up', 'page_down') a una
+    función sin argumentos que se llama en el hilo de Tk. `can_navigate`
+    (opcional) indica si la ventana acepta acciones ahora (p. ej. que no
+    haya un juego en primer plano).
+
+    Las direcciones se repiten mientras estén pulsadas: la primera vez al
+    instante, luego tras REPEAT_DELAY_MS y cada vez más rápido.
+    """
+
+    def __init__(self, window, detector, handlers: Dict[str, Callable[[], None]],
+                 can_navigate: Callable[[], bool] = None, logger=None):
+        self.window = window
+        self.detector = detector
+        self.handlers = handlers
+        self.can_navigate = can_navigate
+        self.logger = logger
+        # Cola hilo de entrada -> Tk (deque: append/popleft son atómicos)
+        self._queue: deque = deque(maxlen=MAX_QUEUED)
+        # Solo los toca el hilo de entrada
+        self._mappings: Dict[int, PadMapping] = {}
+        self._sources: Dict[Tuple, bool] = {}
+        # Solo los toca el hilo de Tk
+        self._held: Dict[str, set] = {}
+        self._repeat: Optional[Tuple[str, float, float]] = None
+        self._after_id = None
+        self.latencies: deque = deque(maxlen=MAX_LATENCIES)
+        self.over_budget = 0
+        self.actions = 0
+
+    def _log(self, message: str, level: str = "info"):
+        """Helper para logging"""
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(f"[{level.upper()}] {message}")
+
+    @property
+    def running(self) -> bool:
+        return self._after_id is not None
+
+    def start(self) -> bool:
+        """Se suscribe a la entrada del detector y empieza el sondeo"""
+        if self.running:
+            return True
+        if not self.detector.add_input_listener(self._on_input):
+            return False
+        self._after_id = self.window.after(POLL_MS, self._tick)
+        return True
+
+    def stop(self):
+        """Deja de escuchar los mandos y registra la latencia medida"""
+        if self._after_id is not None:
+            self.window.after_cancel(self._after_id)
+            self._after_id = None
+        self.detector.remove_input_listener(self._on_input)
+        self._queue.clear()
+        self._held.clear()
+        self._repeat = None
+        report = self.latency_report()
+        if report['samples']:
+            self._log(f"Navegación con mando: {report['samples']} acciones, latencia p50 "
+                      f"{report['p50_ms']:.1f} ms, p95 {report['p95_ms']:.1f} ms, máx "
+                      f"{report['max_ms']:.1f} ms ({report['over_budget']} sobre "
+                      f"{LATENCY_BUDGET_MS:.1f} ms)")
+
+    # === HILO DE ENTRADA ===
+
+    def _mapping(self, instance_id: int) -> PadMapping:
+        mapping = self._mappings.get(instance_id)
+        if mapping is None:
+            gamepad = next((g for g in self.detector.gamepads if g.instance_id == instance_id), None)
+            backend_name = getattr(self.detector.backend, 'name', 'pygame')
+            mapping = self._mappings[instance_id] = PadMapping(
+                gamepad, 'evdev' if backend_name.startswith('evdev') else 'pygame')
+        return mapping
+
+    def _set(self, event, source: Tuple, action: Optional[str], pressed: bool):
+        """Encola el cambio de una fuente (botón, bit de cruceta, stick)"""
+        if action is None or self._sources.get(source, False) == pressed:
+            return
+        self._sources[source] = pressed
+        self._queue.append((event.t_ns, source, action, pressed))
+
+    def _on_input(self, event):
+        """Listener del detector: solo traduce y encola"""
+        mapping = self._mapping(event.instance_id)
+        key = (event.instance_id, event.kind, event.code)
+        if event.kind == 'button':
+            self._set(event, key, mapping.buttons.get(event.code), event.value > 0.5)
+        elif event.kind == 'hat':
+            if mapping.evdev:
+                # evdev: un eje por dirección de la cruceta, arriba = -1
+                value = int(event.value)
+                if event.code in (EVDEV_HAT_X, EVDEV_HAT_Y):
+                    low, high = ('left', 'right') if event.code == EVDEV_HAT_X else ('up', 'down')
+                    self._set(event, key + (low,), low, value < 0)
+                    self._set(event, key + (high,), high, value > 0)
+                return
+            value = int(event.value)
+            x, y = value // 3 - 1, value % 3 - 1
+            bits = ((HAT_UP if y > 0 else 0) | (HAT_RIGHT if x > 0 else 0)
+                    | (HAT_DOWN if y < 0 else 0) | (HAT_LEFT if x < 0 else 0))
+            for bit in HAT_DIRECTIONS:
+                self._set(event, key + (bit,), mapping.hats.get((event.code, bit)), bool(bits & bit))
+        elif event.kind == 'axis' and event.code in mapping.stick:
+            low, high = ('left', 'right') if event.code == mapping.stick[0] else ('up', 'down')
+            for action, active in ((low, -event.value), (high, event.value)):
+                source = key + (action,)
+                threshold = STICK_RELEASE if self._sources.get(source) else STICK_PRESS
+                self._set(event, source, action, active > threshold)
+
+    # === HILO DE TK ===
+
+    def _tick(self):
+        self._after_id = None
+        try:
+            self._process()
+        except Exception as e:
+            self._log(f"Error en la navegación con mando: {e}", "error")
+        finally:
+            # Reprograma después de procesar: un diálogo modal abierto por
+            # una acción no provoca ticks anidados
+            if self._after_id is None:
+                self._after_id = self.window.after(POLL_MS, self._tick)
+
+    def _process(self):
+        active = self.can_navigate is None or self.can_navigate()
+        while self._queue:
+            t_ns, source, action, pressed = self._queue.popleft()
+            held = self._held.setdefault(action, set())
+            was_held = bool(held)
+            if pressed:
+                held.add(source)
+            else:
+                held.discard(source)
+            if pressed and not was_held and active:
+                self._fire(action, t_ns)
+                if action in REPEATING:
+                    now = time.perf_counter()
+                    self._repeat = (action, now + REPEAT_DELAY_MS / 1000, REPEAT_INTERVAL_MS)
+            elif not held and self._repeat and self._repeat[0] == action:
+                self._repeat = None
+
+        if self._repeat and active:
+            action, due, interval = self._repeat
+            now = time.perf_counter()
+            if now >= due:
+                self._fire(action, None)
+                interval = max(REPEAT_MIN_INTERVAL_MS, interval * REPEAT_ACCELERATION)
+                self._repeat = (action, max(due + interval / 1000, now), interval)
+
+    def _fire(self, action: str, t_ns: Optional[int]):
+        handler = self.handlers.get(action)
+        if handler is None:
+            return
+        handler()
+        self.actions += 1
+        if t_ns is None or action not in REPEATING:
+            return
+        # Dibuja ya el resaltado: la latencia medida es hasta el cambio visible
+        self.window.update_idletasks()
+        latency_ms = (time.perf_counter_ns() - t_ns) / 1e6
+        self.latencies.append(latency_ms)
+        if latency_ms > LATENCY_BUDGET_MS:
+            self.over_budget += 1
+            self._log(f"Navegación con mando: '{action}' tardó {latency_ms:.1f} ms", "debug")
+
+    def latency_report(self) -> Dict:
+        """Latencia entrada -> resaltado de las últimas acciones (ms)"""
+        values = sorted(self.latencies)
+        if not values:
+            return {'samples': 0, 'over_budget': 0}
+
+        def percentile(fraction):
+            return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+        return {
+            'samples': len(values),
+            'p50_ms': round(percentile(0.50), 2),
+            'p95_ms': round(percentile(0.95), 2),
+            'max_ms': round(values[-1], 2),
+            'over_budget': self.over_budget,
+            'budget_ms': round(LATENCY_BUDGET_MS, 1),
+        }
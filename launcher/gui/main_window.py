@@ -7,15 +7,46 @@ from tkinter import filedialog, messagebox
 from pathlib import Path
 import sys
 import os
+import json
+import threading
+from concurrent.futures import Future
 
 # Agregar el path del proyecto
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.rom_scanner import ROMScanner
+from core.rom_scanner import ROMScanner, reconcile
+from core.library_index import LibraryIndex, GroupHeader, SORT_KEYS, SORT_LABELS
+from core.library_snapshot import load_snapshot, save_snapshot
 from core.game_info import GameInfo
 from core.emulator import EmulatorManager, ControllerConfig
 from core.gamepad_detector import GamepadDetector, get_controller_type_display_name
+from core.controller_db import ControllerDB
+from core.controller_ports import ControllerPorts
+from core.stick_calibration import StickCalibration
 from core.logger import get_logger, PS2LauncherLogger
+from core.launch_timing import LaunchTimer
+from core.telemetry import format_session_summary
+from core.resolution_tuner import ResolutionTuner
+from core.startup_timing import StartupTimer, StartupHistory
+from gui.controller_config import ControllerConfigWindow
+from gui.gamepad_navigation import GamepadNavigator
+from gui.virtual_list import VirtualList
+
+
+# Cada cuánto se vacía la cola de eventos de mandos (ms)
+GAMEPAD_POLL_MS = 100
+# Cada cuánto se mira si terminó una tarea en segundo plano (ms)
+BACKGROUND_POLL_MS = 15
+# Alto de cada fila de la biblioteca (px)
+GAME_ROW_HEIGHT = 55
+# Etiquetas de los filtros de la biblioteca
+ALL_REGIONS = "Todas las regiones"
+ALL_FORMATS = "Todos los formatos"
+
+# Campos del panel de detalles (en este orden)
+DETAIL_FIELDS = ("ID", "Region", "Tamano", "Desarrollador", "Ano", "Inicio")
+# Filas que salta la navegación con mando por página (LB/RB, izquierda/derecha)
+NAV_PAGE_ROWS = 8
 
 
 # Paleta de colores - Blanco y Negro
@@ -38,12 +69,16 @@ COLORS = {
 class PS2Launcher(ctk.CTk):
     """Ventana principal del PS2 Launcher"""
     
-    def __init__(self):
+    def __init__(self, startup: StartupTimer = None, exit_after_startup: bool = False):
         super().__init__()
+        # Antes del primer pintado solo se crea lo que la ventana necesita
+        # para dibujarse; ROMs, mandos y PCSX2 se inicializan después, en
+        # segundo plano y por orden de prioridad (ver _run_startup_stages)
+        self.startup = startup or StartupTimer()
+        self.exit_after_startup = exit_after_startup
         
         # Inicializar logger
         self.logger = get_logger()
-        self.logger.log_system_info()
         
         # Configuración de la ventana
         self.title("PS2 Launcher")
@@ -60,6 +95,13 @@ class PS2Launcher(ctk.CTk):
         self.emulator = EmulatorManager(logger=self.logger)
         self.controller_config = ControllerConfig()
         
+        # Ajuste automático de resolución según el rendimiento medido
+        self.resolution_tuner = ResolutionTuner(
+            self.game_info, self.base_path / "config" / "resolution_tuner.json", logger=self.logger
+        )
+        if self.emulator.settings.get('adaptive_resolution', True):
+            self.emulator.add_session_listener(self.resolution_tuner.on_session)
+        
         # Cargar ruta de ROMs guardada o usar por defecto
         saved_roms_path = self.emulator.settings.get('roms_path')
         if saved_roms_path and Path(saved_roms_path).exists():
@@ -68,39 +110,158 @@ class PS2Launcher(ctk.CTk):
             self.roms_path = self.base_path / "roms"
         self.scanner = ROMScanner(str(self.roms_path))
         
-        # Inicializar detector de gamepads
-        self.gamepad_detector = GamepadDetector(logger=self.logger)
-        self.gamepad_detector.initialize()
+        # Detector de gamepads: el hilo de entrada (y pygame) arranca después del primer pintado
+        self.controller_db = ControllerDB(
+            ControllerDB.default_sources(self.emulator.base_path, self.emulator.pcsx2_path),
+            cache_file=self.emulator.config_path / "controller_db_cache.json",
+            logger=self.logger
+        )
+        self.gamepad_detector = GamepadDetector(
+            logger=self.logger,
+            backend=self.emulator.settings.get('gamepad_backend'),
+            controller_db=self.controller_db,
+            ports=ControllerPorts(self.emulator.config_path / "controller_ports.json", logger=self.logger),
+            calibration=StickCalibration(self.emulator.config_path / "stick_calibration.json",
+                                         logger=self.logger)
+        )
+        self.gamepad_navigator = None
         
         # Lista de juegos
         self.games = []
         self.selected_game = None
+        # Orden, filtros y agrupación (se recuerdan entre sesiones)
+        self.library_index = None
+        self.library_view = {'sort': 'name', 'region': None, 'format': None,
+                             'verified': False, 'group': False}
+        self.library_view.update(self.emulator.settings.get('library_view') or {})
+        self.emulator.add_session_listener(self._on_session_recorded)
+        # Juego resaltado por la navegación con mando (aún sin seleccionar)
+        self.highlighted_game = None
         
         # Crear interfaz
         self._create_ui()
+        self._bind_keyboard()
         
-        # Cargar juegos
-        self._load_games()
-        
-        # Verificar estado del emulador
-        self._check_emulator()
-        
-        # Detectar gamepads
-        self._detect_gamepads()
-        
-        # Iniciar monitoreo de gamepads
-        self.gamepad_detector.start_monitoring(
-            on_connected=self._on_gamepad_connected,
-            on_disconnected=self._on_gamepad_disconnected
-        )
+        # La biblioteca de la última sesión se muestra ya; el escaneo la reconcilia después
+        self._load_snapshot()
+        self.startup.mark('snapshot')
         
         # Manejar cierre
         self.protocol("WM_DELETE_WINDOW", self._on_close)
         
-        self.logger.info("Launcher iniciado correctamente")
+        # El resto del arranque empieza cuando la ventana ya se dibujó
+        self._first_paint_done = False
+        self._closing = False
+        self.bind("<Map>", self._on_first_map, add="+")
+        self.startup.mark('window')
+        
+    # === ARRANQUE ===
+    
+    def _on_first_map(self, event):
+        if event.widget is not self or self._first_paint_done:
+            return
+        self._first_paint_done = True
+        # Las tareas idle de Tk (el dibujado) ya están en cola: esta va después
+        self.after_idle(self._after_first_paint)
+        
+    def _after_first_paint(self):
+        self.startup.mark('first_paint')
+        self.logger.info(f"Ventana pintada en {self.startup.first_paint_ms():.0f} ms")
+        self._run_startup_stages([
+            self._start_library,
+            self._start_gamepads,
+            self._start_emulator_check,
+        ])
+        
+    def _run_startup_stages(self, stages: list):
+        """
+        Ejecuta las etapas del arranque una tras otra. Cada etapa recibe
+        `done` y lo llama (en el hilo de Tk) al terminar su parte en
+        segundo plano.
+        """
+        if not stages:
+            self._finish_startup()
+            return
+        stage, rest = stages[0], stages[1:]
+        stage(lambda: self._run_startup_stages(rest))
+        
+    def _run_in_background(self, func, on_done):
+        """Ejecuta `func` en un hilo y entrega su resultado a `on_done` en el hilo de Tk"""
+        future = Future()
+        
+        def worker():
+            try:
+                future.set_result(func())
+            except Exception as e:
+                self.logger.exception(f"Error en segundo plano: {e}")
+                future.set_result(None)
+                
+        def check():
+            if self._closing:
+                return
+            if future.done():
+                on_done(future.result())
+            else:
+                self.after(BACKGROUND_POLL_MS, check)
+                
+        threading.Thread(target=worker, name="startup", daemon=True).start()
+        self.after(BACKGROUND_POLL_MS, check)
+        
+    def _start_library(self, done):
+        previous = self.games
+        
+        def on_scanned(scanned):
+            self._apply_scan(scanned or [])
+            self.startup.mark('library')
+            done()
+            
+        self._run_in_background(lambda: self._scan_games(previous), on_scanned)
+        
+    def _start_gamepads(self, done):
+        def on_detected(gamepads):
+            self._update_gamepad_status(gamepads or ())
+            # Las altas y bajas llegan por la cola del detector
+            self._poll_gamepad_events()
+            # Navegación con mando: sondeo propio a alta frecuencia
+            if self.emulator.settings.get('gamepad_navigation', True):
+                self._start_gamepad_navigation()
+            self.startup.mark('gamepads')
+            done()
+            
+        self._run_in_background(self._detect_gamepads, on_detected)
+        
+    def _start_emulator_check(self, done):
+        def on_checked(state):
+            self._show_emulator_status(state)
+            self._update_cache_status()
+            self.startup.mark('emulator')
+            done()
+            
+        self._run_in_background(self._emulator_state, on_checked)
+        
+    def _finish_startup(self):
+        self.startup.mark('ready')
+        self.logger.log_system_info()
+        self.logger.info(f"Launcher iniciado correctamente: {self.startup.summary_text()}")
+        if self.startup.over_budget():
+            self.logger.warning(f"Primer pintado fuera de presupuesto: {self.startup.first_paint_ms():.0f} ms "
+                                f"(máximo {self.startup.budget_ms:.0f} ms)")
+        report = self.startup.report()
+        try:
+            StartupHistory(self.emulator.config_path / "startup_timing.json").record(report)
+        except OSError as e:
+            self.logger.warning(f"No se pudo guardar el tiempo de arranque: {e}")
+        if self.exit_after_startup:
+            # tools/startup_report.py lee esta línea
+            print(f"STARTUP_REPORT {json.dumps(report)}", flush=True)
+            self._on_close()
         
     def _on_close(self):
         self.logger.info("Cerrando launcher...")
+        self._closing = True
+        self._save_snapshot()
+        if self.gamepad_navigator:
+            self.gamepad_navigator.stop()
         self.gamepad_detector.cleanup()
         self.destroy()
         
@@ -126,6 +287,14 @@ class PS2Launcher(ctk.CTk):
         # Footer
         self._create_footer()
         
+    def _bind_keyboard(self):
+        """Flechas y AvPág/RePág recorren la biblioteca, Enter juega"""
+        self.bind("<Up>", lambda e: self._move_selection(-1))
+        self.bind("<Down>", lambda e: self._move_selection(1))
+        self.bind("<Prior>", lambda e: self._move_selection(-NAV_PAGE_ROWS))
+        self.bind("<Next>", lambda e: self._move_selection(NAV_PAGE_ROWS))
+        self.bind("<Return>", lambda e: self._launch_game() if self.selected_game else None)
+        
     def _create_header(self):
         header = ctk.CTkFrame(self.main_container, fg_color="transparent", height=40)
         header.pack(fill="x")
@@ -158,6 +327,22 @@ class PS2Launcher(ctk.CTk):
         )
         self.logs_btn.pack(side="left", padx=4)
         
+        self.controls_btn = ctk.CTkButton(
+            btn_frame,
+            text="Mandos",
+            font=ctk.CTkFont(size=11),
+            width=60,
+            height=28,
+            fg_color="transparent",
+            hover_color=COLORS['bg_hover'],
+            text_color=COLORS['text_secondary'],
+            border_width=1,
+            border_color=COLORS['border'],
+            corner_radius=4,
+            command=self._open_controller_config
+        )
+        self.controls_btn.pack(side="left", padx=4)
+        
         self.settings_btn = ctk.CTkButton(
             btn_frame,
             text="Config",
@@ -204,14 +389,90 @@ class PS2Launcher(ctk.CTk):
         )
         self.games_count.pack(side="right")
         
-        self.games_scroll = ctk.CTkScrollableFrame(
-            left_container, 
-            fg_color="transparent",
+        self._create_library_toolbar(left_container)
+        
+        # Solo existen widgets para las filas visibles (se reutilizan al desplazarse)
+        self._row_fonts = (ctk.CTkFont(size=13, weight="bold"), ctk.CTkFont(size=10))
+        self.games_list = VirtualList(
+            left_container,
+            row_height=GAME_ROW_HEIGHT,
+            create_row=self._create_game_row,
+            fill_row=self._fill_game_row,
+            on_click=self._on_row_click,
+            on_double_click=self._on_row_double_click,
             scrollbar_button_color=COLORS['bg_light'],
             scrollbar_button_hover_color=COLORS['bg_hover']
         )
-        self.games_scroll.pack(fill="both", expand=True, padx=8, pady=(0, 8))
+        self.games_list.pack(fill="both", expand=True, padx=8, pady=(0, 8))
+        self.games_list.set_empty_text("", font=ctk.CTkFont(size=11), text_color=COLORS['text_muted'])
+        
+    def _create_library_toolbar(self, parent):
+        """Orden, filtros por región/formato/verificado y agrupación por serie"""
+        toolbar = ctk.CTkFrame(parent, fg_color="transparent")
+        toolbar.pack(fill="x", padx=16, pady=(0, 8))
+        
+        menu_style = dict(
+            height=26,
+            font=ctk.CTkFont(size=10),
+            dropdown_font=ctk.CTkFont(size=10),
+            fg_color=COLORS['bg_light'],
+            button_color=COLORS['bg_light'],
+            button_hover_color=COLORS['bg_hover'],
+            text_color=COLORS['text_secondary'],
+            dropdown_fg_color=COLORS['bg_medium'],
+            dropdown_hover_color=COLORS['bg_hover'],
+            dropdown_text_color=COLORS['text_secondary'],
+        )
+        self.sort_menu = ctk.CTkOptionMenu(
+            toolbar,
+            values=[SORT_LABELS[key] for key in SORT_KEYS],
+            width=120,
+            command=self._on_sort_changed,
+            **menu_style
+        )
+        self.sort_menu.set(SORT_LABELS.get(self.library_view['sort'], SORT_LABELS['name']))
+        self.sort_menu.pack(side="left")
+        
+        # Valores de las facetas: se completan con cada escaneo
+        self._facet_options = {'region': {}, 'format': {}}
+        self.region_menu = ctk.CTkOptionMenu(
+            toolbar,
+            values=[ALL_REGIONS],
+            width=140,
+            command=lambda label: self._on_facet_changed('region', label),
+            **menu_style
+        )
+        self.region_menu.pack(side="left", padx=(6, 0))
+        self.format_menu = ctk.CTkOptionMenu(
+            toolbar,
+            values=[ALL_FORMATS],
+            width=120,
+            command=lambda label: self._on_facet_changed('format', label),
+            **menu_style
+        )
+        self.format_menu.pack(side="left", padx=(6, 0))
         
+        check_style = dict(
+            font=ctk.CTkFont(size=10),
+            text_color=COLORS['text_secondary'],
+            checkbox_width=16,
+            checkbox_height=16,
+            border_width=1,
+            fg_color=COLORS['text_secondary'],
+            hover_color=COLORS['bg_hover'],
+            border_color=COLORS['text_muted'],
+        )
+        self.group_check = ctk.CTkCheckBox(toolbar, text="Por serie", command=self._on_toggles_changed,
+                                           **check_style)
+        self.group_check.pack(side="right")
+        self.verified_check = ctk.CTkCheckBox(toolbar, text="Verificados", command=self._on_toggles_changed,
+                                              **check_style)
+        self.verified_check.pack(side="right", padx=(0, 8))
+        if self.library_view.get('group'):
+            self.group_check.select()
+        if self.library_view.get('verified'):
+            self.verified_check.select()
+            
     def _create_details_panel(self):
         self.right_container = ctk.CTkFrame(
             self.content,
@@ -227,21 +488,146 @@ class PS2Launcher(ctk.CTk):
         self.details_container = ctk.CTkFrame(self.right_container, fg_color="transparent")
         self.details_container.pack(fill="both", expand=True, padx=20, pady=20)
         
-        # Placeholder inicial
-        self._show_placeholder()
-        
-    def _show_placeholder(self):
-        for widget in self.details_container.winfo_children():
-            widget.destroy()
-        
-        placeholder = ctk.CTkLabel(
+        # Los widgets del panel se crean una vez; al seleccionar solo cambia
+        # su texto y visibilidad
+        self.placeholder = ctk.CTkLabel(
             self.details_container,
             text="Selecciona un juego\nde la biblioteca",
             font=ctk.CTkFont(size=13),
             text_color=COLORS['text_muted'],
             justify="center"
         )
-        placeholder.pack(expand=True)
+        self.details_body = ctk.CTkFrame(self.details_container, fg_color="transparent")
+        self._details_visible = None
+        self._create_details_widgets(self.details_body)
+        
+        # Placeholder inicial
+        self._show_placeholder()
+        
+    def _create_details_widgets(self, parent):
+        # Nombre del juego
+        self.detail_name = ctk.CTkLabel(
+            parent,
+            text="",
+            font=ctk.CTkFont(size=18, weight="bold"),
+            text_color=COLORS['text_primary'],
+            wraplength=290,
+            justify="left",
+            anchor="w"
+        )
+        self.detail_name.pack(fill="x", pady=(0, 16))
+        
+        # Info: una fila por campo, ocultas con grid_remove si no hay dato
+        info_frame = ctk.CTkFrame(parent, fg_color="transparent")
+        info_frame.pack(fill="x")
+        info_frame.grid_columnconfigure(1, weight=1)
+        label_font, value_font = ctk.CTkFont(size=10), ctk.CTkFont(size=11)
+        self.detail_rows = {}
+        for index, field in enumerate(DETAIL_FIELDS):
+            lbl = ctk.CTkLabel(
+                info_frame,
+                text=field,
+                font=label_font,
+                text_color=COLORS['text_muted'],
+                width=90,
+                anchor="w"
+            )
+            val = ctk.CTkLabel(
+                info_frame,
+                text="",
+                font=value_font,
+                text_color=COLORS['text_secondary'],
+                anchor="w"
+            )
+            lbl.grid(row=index, column=0, sticky="w", pady=2)
+            val.grid(row=index, column=1, sticky="ew", pady=2)
+            self.detail_rows[field] = (lbl, val)
+            
+        # Configuración recomendada y rendimiento de la última sesión
+        self.detail_recommended = ctk.CTkLabel(
+            parent,
+            text="",
+            font=ctk.CTkFont(family="Consolas", size=9),
+            text_color=COLORS['text_secondary'],
+            justify="left",
+            anchor="w"
+        )
+        self.detail_recommended.pack(fill="x", pady=(14, 0))
+        
+        session_title = ctk.CTkLabel(
+            parent,
+            text="ÚLTIMA SESIÓN",
+            font=ctk.CTkFont(size=9, weight="bold"),
+            text_color=COLORS['text_muted'],
+            anchor="w"
+        )
+        session_title.pack(fill="x", pady=(8, 0))
+        self.detail_session = ctk.CTkLabel(
+            parent,
+            text="",
+            font=ctk.CTkFont(size=10),
+            text_color=COLORS['text_secondary'],
+            justify="left",
+            anchor="w"
+        )
+        self.detail_session.pack(fill="x")
+        
+        # Mando (se muestra solo si hay uno activo)
+        self.controller_frame = ctk.CTkFrame(
+            parent,
+            fg_color=COLORS['bg_light'],
+            corner_radius=4
+        )
+        controller_info = ctk.CTkFrame(self.controller_frame, fg_color="transparent")
+        controller_info.pack(fill="x", padx=12, pady=10)
+        
+        self.controller_title = ctk.CTkLabel(
+            controller_info,
+            text="",
+            font=ctk.CTkFont(size=11, weight="bold"),
+            text_color=COLORS['text_primary'],
+            anchor="w"
+        )
+        self.controller_title.pack(fill="x")
+        
+        controller_status = ctk.CTkLabel(
+            controller_info,
+            text="Configurado como mando PS2",
+            font=ctk.CTkFont(size=9),
+            text_color=COLORS['success'],
+            anchor="w"
+        )
+        controller_status.pack(fill="x")
+        
+        # BOTON JUGAR (al final, sin spacer)
+        play_btn = ctk.CTkButton(
+            parent,
+            text="JUGAR",
+            font=ctk.CTkFont(size=14, weight="bold"),
+            height=46,
+            fg_color=COLORS['text_primary'],
+            hover_color=COLORS['accent_hover'],
+            text_color=COLORS['bg_dark'],
+            corner_radius=8,
+            border_width=2,
+            border_color=COLORS['accent'],
+            command=self._launch_game
+        )
+        play_btn.pack(fill="x", pady=(20, 0), side="bottom")
+        
+    def _show_details_body(self, visible: bool):
+        if self._details_visible == visible:
+            return
+        self._details_visible = visible
+        if visible:
+            self.placeholder.pack_forget()
+            self.details_body.pack(fill="both", expand=True)
+        else:
+            self.details_body.pack_forget()
+            self.placeholder.pack(expand=True)
+        
+    def _show_placeholder(self):
+        self._show_details_body(False)
         
     def _create_footer(self):
         footer = ctk.CTkFrame(self.main_container, fg_color="transparent", height=28)
@@ -267,201 +653,375 @@ class PS2Launcher(ctk.CTk):
         )
         self.gamepad_status.pack(side="left")
         
-    def _load_games(self):
-        self.logger.info(f"Escaneando ROMs en: {self.roms_path}")
+        self.cache_status = ctk.CTkLabel(
+            footer,
+            text="",
+            font=ctk.CTkFont(size=10),
+            text_color=COLORS['text_muted']
+        )
+        self.cache_status.pack(side="right")
+        
+    def _snapshot_path(self) -> Path:
+        return self.emulator.config_path / "library_snapshot.json"
         
-        for widget in self.games_scroll.winfo_children():
-            widget.destroy()
+    def _load_snapshot(self):
+        """Muestra la biblioteca guardada al cerrar la sesión anterior (una sola lectura)"""
+        snapshot = load_snapshot(self._snapshot_path(), self.roms_path)
+        if snapshot is None or not snapshot.games:
+            self.games_list.set_empty_text("Buscando juegos...")
+            return
+        self.games = snapshot.games
+        # El orden guardado solo vale si la vista (orden y filtros) es la misma
+        view = snapshot.view if snapshot.library_view == self.library_view else snapshot.games
+        shown = sum(1 for item in view if not isinstance(item, GroupHeader))
+        total = len(self.games)
+        self._set_text(self.games_count,
+                       f"{total} juegos" if shown == total else f"{shown} de {total} juegos")
+        self.games_list.set_empty_text("Ningún juego coincide con los filtros")
+        self.games_list.set_items(view)
+        self.logger.info(f"Biblioteca guardada: {total} juegos")
+        
+    def _save_snapshot(self):
+        """Guarda la biblioteca y su orden para el próximo arranque"""
+        if self.library_index is None:
+            # Sin escaneo terminado no hay nada nuevo que guardar
+            return
+        try:
+            save_snapshot(self._snapshot_path(), self.roms_path, self.games,
+                          self.games_list.items, dict(self.library_view))
+        except OSError as e:
+            self.logger.warning(f"No se pudo guardar la biblioteca: {e}")
             
+    def _load_games(self):
+        """
+        Escanea la carpeta de ROMs y aplica a la lista solo las diferencias
+        con el escaneo anterior (por ruta, tamaño y fecha): sin cambios no
+        se toca ningún widget, y la selección y el desplazamiento se conservan.
+        """
+        self._apply_scan(self._scan_games(self.games))
+        
+    def _scan_games(self, previous: list) -> list:
+        """Escaneo de la carpeta de ROMs (no toca widgets: puede correr en otro hilo)"""
+        self.logger.info(f"Escaneando ROMs en: {self.roms_path}")
         try:
-            self.games = self.scanner.scan()
-            self.games_count.configure(text=f"{len(self.games)} juegos")
-            self.logger.info(f"Encontrados {len(self.games)} juegos")
+            return self.scanner.scan(previous=previous)
         except Exception as e:
             self.logger.error(f"Error escaneando ROMs: {e}")
-            self.games = []
-        
-        if not self.games:
-            no_games = ctk.CTkLabel(
-                self.games_scroll,
-                text=f"No hay juegos\n\nAgrega .iso a:\n{self.roms_path}",
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS['text_muted'],
-                justify="center"
-            )
-            no_games.pack(expand=True, pady=40)
+            return []
+            
+    def _apply_scan(self, scanned: list):
+        """Aplica un escaneo a la lista (hilo de Tk)"""
+        games, diff = reconcile(self.games, scanned)
+        index = self.library_index
+        if diff.empty and index is not None and index.games is games:
+            self.logger.info(f"Biblioteca sin cambios ({len(games)} juegos)")
             return
+        self.logger.info(f"Encontrados {len(games)} juegos ({len(diff.added)} nuevos, "
+                         f"{len(diff.removed)} quitados, {len(diff.changed)} modificados)")
+        
+        # Selección y resaltado pasan al dict nuevo del mismo archivo (o se quitan)
+        by_path = {game['path']: game for game in games}
+        selected = self.selected_game
+        if selected is not None:
+            self.selected_game = by_path.get(selected['path'])
+        if self.highlighted_game is not None:
+            self.highlighted_game = by_path.get(self.highlighted_game['path'])
+        
+        self.games = games
+        # Claves de orden y facetas: una vez por escaneo
+        self.library_index = LibraryIndex(games, self.game_info, self.emulator.launch_stats)
+        self._update_facet_menus()
+        self._apply_library_view(keep_offset=True)
+        
+        if selected is not None and self.selected_game is None:
+            self._show_placeholder()
+        elif selected is not None and self.selected_game is not selected:
+            self._show_game_details(self.selected_game)
+            
+    def _update_facet_menus(self):
+        """Opciones de los filtros según los juegos escaneados"""
+        for facet, menu, all_label in (('region', self.region_menu, ALL_REGIONS),
+                                       ('format', self.format_menu, ALL_FORMATS)):
+            options = {all_label: None}
+            for value, count in self.library_index.facet_values(facet):
+                label = value.lstrip('.').upper() if facet == 'format' else value
+                options[f"{label} ({count})"] = value
+            if options != self._facet_options[facet]:
+                self._facet_options[facet] = options
+                menu.configure(values=list(options))
+            # Un filtro guardado que ya no tiene juegos se quita
+            current = self.library_view.get(facet)
+            if current not in options.values():
+                current = self.library_view[facet] = None
+            label = next(label for label, value in options.items() if value == current)
+            if menu.get() != label:
+                menu.set(label)
+                
+    def _library_filters(self) -> dict:
+        view = self.library_view
+        return {
+            'region': [view['region']] if view.get('region') else None,
+            'format': [view['format']] if view.get('format') else None,
+            'verified': [True] if view.get('verified') else None,
+        }
+        
+    def _apply_library_view(self, keep_offset: bool = False):
+        """Muestra la vista actual del índice (solo se rellenan las filas visibles)"""
+        if self.library_index is None:
+            return
+        view = self.library_index.view(
+            self.library_view['sort'],
+            self._library_filters(),
+            group_by='series' if self.library_view.get('group') else None
+        )
+        shown = sum(1 for item in view if not isinstance(item, GroupHeader))
+        total = len(self.games)
+        self._set_text(self.games_count,
+                       f"{total} juegos" if shown == total else f"{shown} de {total} juegos")
+        if not self.games:
+            self.games_list.set_empty_text(f"No hay juegos\n\nAgrega .iso a:\n{self.roms_path}")
+        elif not view:
+            self.games_list.set_empty_text("Ningún juego coincide con los filtros")
+        self.games_list.set_items(view, keep_offset=keep_offset)
+        if not keep_offset and self.selected_game is not None:
+            index = self.games_list.index_of(self.selected_game)
+            if index is not None:
+                self.games_list.see(index)
+                
+    def _save_library_view(self):
+        self.emulator.settings['library_view'] = dict(self.library_view)
+        self.emulator.save_settings()
+        
+    def _on_sort_changed(self, label: str):
+        self.library_view['sort'] = next(key for key in SORT_KEYS if SORT_LABELS[key] == label)
+        self._apply_library_view()
+        self._save_library_view()
+        
+    def _on_facet_changed(self, facet: str, label: str):
+        self.library_view[facet] = self._facet_options[facet].get(label)
+        self._apply_library_view()
+        self._save_library_view()
+        
+    def _on_toggles_changed(self):
+        self.library_view['verified'] = bool(self.verified_check.get())
+        self.library_view['group'] = bool(self.group_check.get())
+        self._apply_library_view()
+        self._save_library_view()
+        
+    def _on_session_recorded(self, game_id: str, summary: dict):
+        """Listener de sesiones (hilo del monitor): el orden por última partida cambió"""
+        index = self.library_index
+        if index is not None:
+            index.invalidate('last_played')
             
-        for game in self.games:
-            self._create_game_item(game)
+    def _on_row_click(self, index: int):
+        item = self.games_list.items[index]
+        if not isinstance(item, GroupHeader):
+            self._select_game(item)
             
-    def _create_game_item(self, game: dict):
-        item = ctk.CTkFrame(
-            self.games_scroll,
+    def _on_row_double_click(self, index: int):
+        if not isinstance(self.games_list.items[index], GroupHeader):
+            self._launch_game()
+            
+    def _create_game_row(self, parent):
+        """Fila reutilizable de la biblioteca (la rellena _fill_game_row)"""
+        row = ctk.CTkFrame(
+            parent,
             fg_color="transparent",
-            height=55,
+            height=GAME_ROW_HEIGHT,
             corner_radius=4
         )
-        item.pack(fill="x", pady=1, padx=4)
-        item.pack_propagate(False)
+        row.pack_propagate(False)
+        row.game = None
+        row.header = False
+        row.style = None
         
         def on_enter(e):
-            if self.selected_game != game:
-                item.configure(fg_color=COLORS['bg_light'])
+            if row.game is not None and not row.header and self.selected_game is not row.game:
+                row.configure(fg_color=COLORS['bg_light'])
+                row.style = None
         
         def on_leave(e):
-            if self.selected_game != game:
-                item.configure(fg_color="transparent")
+            if row.game is not None:
+                self._style_game_row(row)
         
-        item.bind("<Enter>", on_enter)
-        item.bind("<Leave>", on_leave)
-        item.bind("<Button-1>", lambda e: self._select_game(game))
-        item.bind("<Double-Button-1>", lambda e: self._launch_game())
+        row.bind("<Enter>", on_enter)
+        row.bind("<Leave>", on_leave)
         
-        content = ctk.CTkFrame(item, fg_color="transparent")
+        content = ctk.CTkFrame(row, fg_color="transparent")
         content.pack(fill="both", expand=True, padx=12, pady=8)
-        content.bind("<Button-1>", lambda e: self._select_game(game))
         
-        display_name = self.game_info.get_game_name(game['id'], game['name'])
-        name_label = ctk.CTkLabel(
+        row.name_label = ctk.CTkLabel(
             content,
-            text=display_name,
-            font=ctk.CTkFont(size=13, weight="bold"),
+            text="",
+            font=self._row_fonts[0],
             text_color=COLORS['text_primary'],
             anchor="w"
         )
-        name_label.pack(fill="x")
-        name_label.bind("<Button-1>", lambda e: self._select_game(game))
+        row.name_label.pack(fill="x")
         
-        region = self.game_info.get_region(game['id'])
-        info_text = f"{game['id']}  |  {region}  |  {game['size_formatted']}"
-        info_label = ctk.CTkLabel(
+        row.info_label = ctk.CTkLabel(
             content,
-            text=info_text,
-            font=ctk.CTkFont(size=10),
+            text="",
+            font=self._row_fonts[1],
             text_color=COLORS['text_muted'],
             anchor="w"
         )
-        info_label.pack(fill="x")
-        info_label.bind("<Button-1>", lambda e: self._select_game(game))
-        
-        game['_item'] = item
+        row.info_label.pack(fill="x")
+        return row
+        
+    def _fill_game_row(self, row, game: dict, index: int):
+        if row.game is not game:
+            row.game = game
+            header = isinstance(game, GroupHeader)
+            if header:
+                self._set_text(row.name_label, game.title.upper())
+                self._set_text(row.info_label, f"{game.count} juegos")
+            else:
+                display = self._game_display(game)
+                self._set_text(row.name_label, display['name'])
+                self._set_text(row.info_label, display['row_info'])
+            if header != row.header:
+                row.header = header
+                row.name_label.configure(
+                    text_color=COLORS['text_muted'] if header else COLORS['text_primary'])
+        self._style_game_row(row)
+        
+    def _style_game_row(self, row):
+        """Fondo de selección y borde de la navegación con mando (solo si cambian)"""
+        style = (row.game is self.selected_game, row.game is self.highlighted_game)
+        if style == row.style:
+            return
+        row.style = style
+        selected, highlighted = style
+        row.configure(
+            fg_color=COLORS['bg_hover'] if selected else "transparent",
+            border_width=1 if highlighted else 0,
+            border_color=COLORS['text_secondary']
+        )
         
-    def _select_game(self, game: dict):
-        if self.selected_game and '_item' in self.selected_game:
-            self.selected_game['_item'].configure(fg_color="transparent")
+    def _refresh_game_row(self, game: dict):
+        index = self.games_list.index_of(game) if game is not None else None
+        if index is not None:
+            self.games_list.refresh(index)
             
+    def _select_game(self, game: dict):
+        previous = self.selected_game
         self.selected_game = game
-        if '_item' in game:
-            game['_item'].configure(fg_color=COLORS['bg_hover'])
+        self._refresh_game_row(previous)
+        self._set_highlight(game)
+        self._refresh_game_row(game)
             
         self._show_game_details(game)
         self.logger.debug(f"Juego seleccionado: {game['name']}")
         
-    def _show_game_details(self, game: dict):
-        for widget in self.details_container.winfo_children():
-            widget.destroy()
-            
-        # Nombre del juego
-        display_name = self.game_info.get_game_name(game['id'], game['name'])
-        name = ctk.CTkLabel(
-            self.details_container,
-            text=display_name,
-            font=ctk.CTkFont(size=18, weight="bold"),
-            text_color=COLORS['text_primary'],
-            wraplength=290,
-            justify="left",
-            anchor="w"
-        )
-        name.pack(fill="x", pady=(0, 16))
-        
-        # Info
-        info_frame = ctk.CTkFrame(self.details_container, fg_color="transparent")
-        info_frame.pack(fill="x")
-        
-        info_items = [
-            ("ID", game['id']),
-            ("Region", self.game_info.get_region(game['id'])),
-            ("Tamano", game['size_formatted']),
-        ]
-        
-        db_info = self.game_info.get_game_info(game['id'])
-        if db_info:
-            if 'developer' in db_info:
-                info_items.append(("Desarrollador", db_info['developer']))
-            if 'year' in db_info:
-                info_items.append(("Ano", str(db_info['year'])))
-        
-        for label, value in info_items:
-            row = ctk.CTkFrame(info_frame, fg_color="transparent")
-            row.pack(fill="x", pady=2)
-            
-            lbl = ctk.CTkLabel(
-                row,
-                text=label,
-                font=ctk.CTkFont(size=10),
-                text_color=COLORS['text_muted'],
-                width=90,
-                anchor="w"
-            )
-            lbl.pack(side="left")
-            
-            val = ctk.CTkLabel(
-                row,
-                text=value,
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS['text_secondary'],
-                anchor="w"
-            )
-            val.pack(side="left", fill="x", expand=True)
-            
-        # Mando
-        if self.gamepad_detector.active_gamepad:
-            gp = self.gamepad_detector.active_gamepad
-            
-            controller_frame = ctk.CTkFrame(
-                self.details_container,
-                fg_color=COLORS['bg_light'],
-                corner_radius=4
-            )
-            controller_frame.pack(fill="x", pady=(14, 0))
-            
-            controller_info = ctk.CTkFrame(controller_frame, fg_color="transparent")
-            controller_info.pack(fill="x", padx=12, pady=10)
+    def _set_highlight(self, game: dict):
+        """Resalta un juego para la navegación con mando (borde, sin seleccionarlo)"""
+        previous = self.highlighted_game
+        if previous is game:
+            return
+        self.highlighted_game = game
+        self._refresh_game_row(previous)
+        self._refresh_game_row(game)
             
-            controller_title = ctk.CTkLabel(
-                controller_info,
-                text=get_controller_type_display_name(gp.controller_type),
-                font=ctk.CTkFont(size=11, weight="bold"),
-                text_color=COLORS['text_primary'],
-                anchor="w"
-            )
-            controller_title.pack(fill="x")
+    def _move_selection(self, step: int):
+        """Selecciona el juego `step` filas más abajo (teclado y mando)"""
+        view = self.games_list.items
+        if not view:
+            return
+        current = self.highlighted_game or self.selected_game
+        index = self.games_list.index_of(current) if current is not None else None
+        if index is None:
+            index = -1 if step > 0 else len(view)
+        target = max(0, min(len(view) - 1, index + step))
+        # Las cabeceras de serie no se seleccionan: la siguiente fila en la
+        # dirección del movimiento (o la anterior si no hay)
+        direction = 1 if step > 0 else -1
+        for candidate in (range(target, len(view) if direction > 0 else -1, direction),
+                          range(target, -1 if direction > 0 else len(view), -direction)):
+            target = next((i for i in candidate if not isinstance(view[i], GroupHeader)), None)
+            if target is not None:
+                break
+        if target is None:
+            return
+        # Primero el desplazamiento: la fila resaltada ya está en el grupo visible
+        self.games_list.see(target)
+        if view[target] is not self.selected_game:
+            self._select_game(view[target])
+        
+    def _game_display(self, game: dict) -> dict:
+        """
+        Datos de presentación que no cambian mientras el archivo sea el
+        mismo (nombre, región, campos de la base de datos). Se calculan
+        una vez y se guardan en el dict del juego: un rescaneo que
+        encuentra el archivo modificado crea un dict nuevo.
+        """
+        display = game.get('_display')
+        if display is None:
+            db_info = self.game_info.get_game_info(game['id']) or {}
+            region = self.game_info.get_region(game['id'])
+            display = {
+                'name': self.game_info.get_game_name(game['id'], game['name']),
+                'row_info': f"{game['id']}  |  {region}  |  {game['size_formatted']}",
+                'fields': {
+                    "ID": game['id'],
+                    "Region": region,
+                    "Tamano": game['size_formatted'],
+                    "Desarrollador": db_info.get('developer'),
+                    "Ano": str(db_info['year']) if 'year' in db_info else None,
+                },
+            }
+            game['_display'] = display
+        return display
+        
+    @staticmethod
+    def _set_text(label, text: str):
+        """Cambia el texto solo si es distinto (configure siempre redibuja)"""
+        if label.cget("text") != text:
+            label.configure(text=text)
             
-            controller_status = ctk.CTkLabel(
-                controller_info,
-                text="Configurado como mando PS2",
-                font=ctk.CTkFont(size=9),
-                text_color=COLORS['success'],
-                anchor="w"
-            )
-            controller_status.pack(fill="x")
-        
-        # BOTON JUGAR (al final, sin spacer)
-        play_btn = ctk.CTkButton(
-            self.details_container,
-            text="JUGAR",
-            font=ctk.CTkFont(size=14, weight="bold"),
-            height=46,
-            fg_color=COLORS['text_primary'],
-            hover_color=COLORS['accent_hover'],
-            text_color=COLORS['bg_dark'],
-            corner_radius=8,
-            border_width=2,
-            border_color=COLORS['accent'],
-            command=self._launch_game
-        )
-        play_btn.pack(fill="x", pady=(20, 0), side="bottom")
+    def _show_game_details(self, game: dict):
+        display = self._game_display(game)
+        self._set_text(self.detail_name, display['name'])
+        
+        # Datos que cambian con cada partida: se consultan siempre
+        fields = dict(display['fields'])
+        fields["Inicio"] = self.emulator.launch_stats.get_summary_text(game['id'])
+        for field, (lbl, val) in self.detail_rows.items():
+            value = fields.get(field)
+            shown = bool(lbl.winfo_manager())
+            if value:
+                self._set_text(val, value)
+                if not shown:
+                    lbl.grid()
+                    val.grid()
+            elif shown:
+                lbl.grid_remove()
+                val.grid_remove()
+                
+        config = self.game_info.get_optimal_config(game['id'])
+        self._set_text(self.detail_recommended, self.emulator.get_recommended_settings_text(config))
+        
+        last_session = self.emulator.telemetry.last_session(game['id'])
+        session_text = format_session_summary(last_session) if last_session else "Sin datos de rendimiento"
+        last_change = self.resolution_tuner.last_change(game['id'])
+        if last_change:
+            session_text += f"\nResolución ajustada: {last_change['from']}x -> {last_change['to']}x"
+        self._set_text(self.detail_session, session_text)
+        
+        self._update_details_controller()
+        self._show_details_body(True)
+        
+    def _update_details_controller(self):
+        """Sección del mando activo del panel de detalles"""
+        gp = self.gamepad_detector.active_gamepad
+        shown = bool(self.controller_frame.winfo_manager())
+        if gp:
+            self._set_text(self.controller_title, get_controller_type_display_name(gp.controller_type))
+            if not shown:
+                self.controller_frame.pack(fill="x", pady=(14, 0), after=self.detail_session)
+        elif shown:
+            self.controller_frame.pack_forget()
         
     def _launch_game(self):
         if not self.selected_game:
@@ -469,6 +1029,7 @@ class PS2Launcher(ctk.CTk):
             return
             
         game = self.selected_game
+        timer = LaunchTimer(game['id'], self.game_info.get_game_name(game['id'], game['name']))
         self.logger.info(f"Lanzando juego: {game['name']}")
             
         if not self.emulator.is_configured():
@@ -477,11 +1038,16 @@ class PS2Launcher(ctk.CTk):
             return
             
         config = self.game_info.get_optimal_config(game['id'])
+        timer.mark('config')
         
         try:
-            success = self.emulator.launch_game(game['path'], config)
+            success = self.emulator.launch_game(game['path'], config, timer=timer, game_id=game['id'])
             if success:
                 self.logger.info("Juego lanzado exitosamente")
+                if self.library_index is not None:
+                    self.library_index.invalidate('last_played')
+                    if self.library_view['sort'] == 'last_played':
+                        self._apply_library_view(keep_offset=True)
             else:
                 self.logger.error("Error al lanzar el juego")
                 messagebox.showerror("Error", "No se pudo iniciar el juego")
@@ -490,23 +1056,32 @@ class PS2Launcher(ctk.CTk):
             messagebox.showerror("Error", f"Error: {e}")
             
     def _detect_gamepads(self):
+        """Arranca el detector y aplica la configuración del mando (no toca widgets)"""
         try:
             gamepads = self.gamepad_detector.scan()
-            self._update_gamepad_status(gamepads)
-            # Aplicar configuración automática si hay un mando conectado
-            if gamepads and self.gamepad_detector.active_gamepad:
-                if self.gamepad_detector.apply_pcsx2_config():
+            # Aplicar configuración automática (sin mandos se liberan los puertos
+            # que quedaron de la sesión anterior); sin backend no se sabe qué hay
+            if self.gamepad_detector.initialize():
+                if self.gamepad_detector.apply_pcsx2_config(self.emulator.get_ini_path()):
                     self.logger.info("Configuración de mando aplicada automáticamente a PCSX2")
+            return gamepads
         except Exception as e:
             self.logger.error(f"Error detectando gamepads: {e}")
+            return ()
             
     def _update_gamepad_status(self, gamepads=None):
+        snapshot = self.gamepad_detector.snapshot
         if gamepads is None:
-            gamepads = self.gamepad_detector.gamepads
+            gamepads = snapshot.gamepads
             
         if gamepads:
-            active = self.gamepad_detector.active_gamepad
-            if active:
+            active = snapshot.active
+            if len(gamepads) > 1:
+                self.gamepad_status.configure(
+                    text=f"Mandos: {len(gamepads)} jugadores",
+                    text_color=COLORS['success']
+                )
+            elif active:
                 type_name = get_controller_type_display_name(active.controller_type)
                 self.gamepad_status.configure(
                     text=f"Mando: {type_name}",
@@ -517,25 +1092,110 @@ class PS2Launcher(ctk.CTk):
                 text="Mando: No detectado",
                 text_color=COLORS['text_muted']
             )
+        if self._details_visible:
+            self._update_details_controller()
             
-    def _on_gamepad_connected(self, gamepad):
-        self.logger.info(f"Gamepad conectado: {gamepad.name}")
-        # Aplicar configuración automática a PCSX2
-        if self.gamepad_detector.apply_pcsx2_config():
-            self.logger.info("Configuración de mando aplicada automáticamente a PCSX2")
-        self.after(0, lambda: self._update_gamepad_status())
-        
-    def _on_gamepad_disconnected(self):
-        self.logger.warning("Gamepad desconectado")
-        self.after(0, lambda: self._update_gamepad_status())
+    def _poll_gamepad_events(self):
+        """Vacía la cola de conexiones del hilo de entrada (en el hilo de Tk)"""
+        events = self.gamepad_detector.poll_events()
+        if events:
+            # Varias altas/bajas seguidas se resuelven con una sola escritura.
+            # Asigna puertos, libera los de mandos quitados (todos si se
+            # desconectó el último) y ajusta el multitap
+            if self.gamepad_detector.apply_pcsx2_config(self.emulator.get_ini_path()):
+                self.logger.info("Configuración de mando aplicada automáticamente a PCSX2")
+            self._update_gamepad_status()
+        self.after(GAMEPAD_POLL_MS, self._poll_gamepad_events)
+        
+    def _start_gamepad_navigation(self):
+        """Maneja la biblioteca con el mando: cruceta/stick, A, Start, Select, B"""
+        on_main = self._nav_on_main_window
+        self.gamepad_navigator = GamepadNavigator(
+            self,
+            self.gamepad_detector,
+            handlers={
+                'up': on_main(lambda: self._move_selection(-1)),
+                'down': on_main(lambda: self._move_selection(1)),
+                'left': on_main(lambda: self._move_selection(-NAV_PAGE_ROWS)),
+                'right': on_main(lambda: self._move_selection(NAV_PAGE_ROWS)),
+                'page_up': on_main(lambda: self._move_selection(-NAV_PAGE_ROWS)),
+                'page_down': on_main(lambda: self._move_selection(NAV_PAGE_ROWS)),
+                'accept': on_main(self._nav_accept),
+                'play': on_main(self._nav_play),
+                'config': on_main(self._open_settings),
+                'controllers': on_main(self._open_controller_config),
+                'back': self._nav_back,
+            },
+            can_navigate=self._can_navigate,
+            logger=self.logger
+        )
+        if not self.gamepad_navigator.start():
+            self.gamepad_navigator = None
+            
+    def _can_navigate(self) -> bool:
+        """Con un juego abierto el mando es del emulador"""
+        supervisor = self.emulator.supervisor
+        return not (supervisor and supervisor.is_running())
         
+    def _modal_window(self):
+        """Ventana secundaria abierta con grab_set (Config, Mandos, Logs) o None"""
+        try:
+            window = self.grab_current()
+        except KeyError:
+            # Diálogo nativo de Tk (messagebox): no es un widget de Python
+            return None
+        return window if window is not None and window is not self else None
+        
+    def _nav_on_main_window(self, handler):
+        """Acción que solo se aplica si no hay una ventana secundaria encima"""
+        def action():
+            if self._modal_window() is None:
+                handler()
+        return action
+        
+    def _nav_accept(self):
+        game = self.highlighted_game
+        if game is None:
+            self._move_selection(1)
+        elif game is self.selected_game:
+            self._launch_game()
+        else:
+            self._select_game(game)
+            
+    def _nav_play(self):
+        game = self.highlighted_game
+        if game is not None and game is not self.selected_game:
+            self._select_game(game)
+        self._launch_game()
+        
+    def _nav_back(self):
+        """Cierra la ventana secundaria abierta o quita la selección"""
+        window = self._modal_window()
+        if window is not None:
+            getattr(window, '_on_close', window.destroy)()
+        elif self.selected_game:
+            previous, self.selected_game = self.selected_game, None
+            self._refresh_game_row(previous)
+            self._show_placeholder()
+            
     def _check_emulator(self):
+        self._show_emulator_status(self._emulator_state())
+        
+    def _emulator_state(self) -> str:
+        """'ready', 'detected' o 'missing' (puede correr en otro hilo)"""
         if self.emulator.is_configured():
+            return 'ready'
+        if self.emulator.detect_pcsx2():
+            return 'detected'
+        return 'missing'
+        
+    def _show_emulator_status(self, state: str):
+        if state == 'ready':
             self.emulator_status.configure(
                 text="PCSX2: Listo",
                 text_color=COLORS['success']
             )
-        elif self.emulator.detect_pcsx2():
+        elif state == 'detected':
             self.emulator_status.configure(
                 text="PCSX2: Detectado",
                 text_color=COLORS['success']
@@ -546,10 +1206,23 @@ class PS2Launcher(ctk.CTk):
                 text_color=COLORS['error']
             )
             
+    def _update_cache_status(self):
+        """Refresca el estado de la caché ISO (las copias corren en segundo plano)"""
+        if self.emulator.settings.get('iso_cache_enabled', True):
+            self.cache_status.configure(text=self.emulator.iso_cache.get_stats_text())
+        else:
+            self.cache_status.configure(text="")
+        self.after(5000, self._update_cache_status)
+            
     def _open_settings(self):
         settings_window = SettingsWindow(self, self.emulator, self.roms_path, self.logger)
         settings_window.grab_set()
         
+    def _open_controller_config(self):
+        controller_window = ControllerConfigWindow(self, self.controller_config,
+                                                   detector=self.gamepad_detector)
+        controller_window.grab_set()
+        
     def _open_logs_window(self):
         logs_window = LogsWindow(self, self.logger)
         logs_window.grab_set()
@@ -682,7 +1355,7 @@ class SettingsWindow(ctk.CTkToplevel):
     def _browse_pcsx2(self):
         path = filedialog.askopenfilename(
             title="Seleccionar PCSX2",
-            filetypes=[("Ejecutable", "*.exe")]
+            filetypes=[("Ejecutable", "*.exe"), ("AppImage", "*.AppImage"), ("Todos", "*")]
         )
         if path:
             self.pcsx2_entry.delete(0, "end")
@@ -717,15 +1390,17 @@ class SettingsWindow(ctk.CTkToplevel):
         if roms_path:
             new_roms_path = Path(roms_path)
             if new_roms_path.exists() and new_roms_path.is_dir():
-                # Actualizar la ruta en el launcher principal
-                self.master.roms_path = new_roms_path
-                self.master.scanner = ROMScanner(str(new_roms_path))
-                # Guardar en settings
-                self.emulator.settings['roms_path'] = str(new_roms_path)
-                self.emulator.save_settings()
-                # Recargar juegos
-                self.master._load_games()
-                self.logger.info(f"Carpeta de ROMs actualizada: {new_roms_path}")
+                # Solo se vuelve a escanear si la carpeta cambió
+                if new_roms_path.resolve() != Path(self.master.roms_path).resolve():
+                    # Actualizar la ruta en el launcher principal
+                    self.master.roms_path = new_roms_path
+                    self.master.scanner = ROMScanner(str(new_roms_path))
+                    # Guardar en settings
+                    self.emulator.settings['roms_path'] = str(new_roms_path)
+                    self.emulator.save_settings()
+                    # Recargar juegos
+                    self.master._load_games()
+                    self.logger.info(f"Carpeta de ROMs actualizada: {new_roms_path}")
             else:
                 messagebox.showerror("Error", "La carpeta de ROMs no existe")
                 return
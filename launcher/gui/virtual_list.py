@@ -0,0 +1,254 @@
+"""
+Virtual List - Lista con desplazamiento que solo crea widgets para las filas visibles
+
+Un grupo fijo de filas (las que caben en pantalla + 1) se reutiliza al
+desplazarse: la fila del elemento i es siempre pool[i % len(pool)], así
+que al bajar una posición solo se rellena la fila que entra. La barra de
+desplazamiento se ajusta al largo de los datos, no a los widgets.
+"""
+import math
+from typing import Callable, Dict, List, Optional, Sequence
+
+import customtkinter as ctk
+
+
+# Filas desplazadas por cada paso de la rueda del ratón
+WHEEL_ROWS = 3
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    Lista virtualizada de alto de fila fijo.
+
+    `create_row(parent)` crea el widget de una fila (una sola vez por fila
+    del grupo, con `height=row_height`) y `fill_row(row, item, index)` lo
+    rellena con un elemento: se llama solo cuando la fila pasa a mostrar
+    otro elemento o con `refresh`. `on_click(index)` y `on_double_click(index)` reciben el
+    índice del elemento pulsado.
+    """
+
+    def __init__(self, master, row_height: int,
+                 create_row: Callable[[ctk.CTkBaseClass], ctk.CTkBaseClass],
+                 fill_row: Callable[[ctk.CTkBaseClass, object, int], None],
+                 on_click: Callable[[int], None] = None,
+                 on_double_click: Callable[[int], None] = None,
+                 row_gap: int = 2,
+                 scrollbar_button_color=None, scrollbar_button_hover_color=None,
+                 **kwargs):
+        kwargs.setdefault('fg_color', "transparent")
+        super().__init__(master, **kwargs)
+        self.row_height = row_height
+        self.row_gap = row_gap
+        self.create_row = create_row
+        self.fill_row = fill_row
+        self.on_click = on_click
+        self.on_double_click = on_double_click
+
+        self.items: Sequence = []
+        self._index: Dict[int, int] = {}
+        self.offset = 0
+        self._pool: List[ctk.CTkBaseClass] = []
+        # Índice y elemento que muestra cada fila del grupo (None = oculta)
+        # y su posición actual: solo se toca un widget si algo cambió
+        self._shown: List[Optional[int]] = []
+        self._shown_items: List[object] = []
+        self._placed: List[Optional[int]] = []
+        self._scrollbar_value = None
+        self._empty_shown = False
+
+        scrollbar_kwargs = {}
+        if scrollbar_button_color is not None:
+            scrollbar_kwargs['button_color'] = scrollbar_button_color
+        if scrollbar_button_hover_color is not None:
+            scrollbar_kwargs['button_hover_color'] = scrollbar_button_hover_color
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar, **scrollbar_kwargs)
+        # La barra ya convierte la rueda en ('scroll', n, 'units')
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.viewport.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.viewport)
+
+        self.empty_label = ctk.CTkLabel(self.viewport, text="", justify="center")
+
+    # === DATOS ===
+
+    def set_items(self, items: Sequence, keep_offset: bool = False):
+        """
+        Muestra otra lista de elementos (sin crear widgets). Solo se
+        rellenan las filas visibles cuyo elemento cambió; con
+        `keep_offset` el primer elemento visible queda donde estaba si
+        sigue en la lista.
+        """
+        anchor = None
+        if keep_offset and self.items:
+            first = min(self.offset // self.stride, len(self.items) - 1)
+            anchor = (self.items[first], self.offset - first * self.stride)
+        self.items = items
+        self._index = {id(item): i for i, item in enumerate(items)}
+        if anchor is not None and id(anchor[0]) in self._index:
+            self.offset = self._index[id(anchor[0])] * self.stride + anchor[1]
+        elif not keep_offset:
+            self.offset = 0
+        self.offset = min(self.offset, self._max_offset())
+        if bool(items) == self._empty_shown:
+            self._empty_shown = not items
+            if items:
+                self.empty_label.place_forget()
+            else:
+                self.empty_label.place(relx=0.5, y=40, anchor="n")
+        self._render()
+
+    def set_empty_text(self, text: str, **kwargs):
+        self.empty_label.configure(text=text, **kwargs)
+
+    def index_of(self, item) -> Optional[int]:
+        """Índice de un elemento (por identidad)"""
+        return self._index.get(id(item))
+
+    def refresh(self, index: int = None):
+        """Vuelve a rellenar una fila visible (o todas) tras cambiar su estado"""
+        if index is None:
+            self._shown_items = [None] * len(self._pool)
+            self._render()
+            return
+        row = self.row_for(index)
+        if row is not None:
+            self.fill_row(row, self.items[index], index)
+
+    def row_for(self, index: int) -> Optional[ctk.CTkBaseClass]:
+        """Widget que muestra el elemento `index`, si está en pantalla"""
+        if not self._pool or index is None:
+            return None
+        slot = index % len(self._pool)
+        return self._pool[slot] if self._shown[slot] == index else None
+
+    # === DESPLAZAMIENTO ===
+
+    @property
+    def stride(self) -> int:
+        return self.row_height + self.row_gap
+
+    @property
+    def content_height(self) -> int:
+        return len(self.items) * self.stride
+
+    def _view_height(self) -> int:
+        # winfo_* da píxeles reales; las posiciones de place() van sin escalar
+        return max(1, self._reverse_widget_scaling(self.viewport.winfo_height()))
+
+    def _max_offset(self) -> int:
+        return max(0, self.content_height - self._view_height())
+
+    def scroll_to(self, offset: float):
+        offset = int(max(0, min(offset, self._max_offset())))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def see(self, index: int):
+        """Desplaza lo justo para que el elemento quede visible"""
+        top = index * self.stride
+        bottom = top + self.row_height
+        if top < self.offset:
+            self.scroll_to(top)
+        elif bottom > self.offset + self._view_height():
+            self.scroll_to(bottom - self._view_height())
+
+    def _on_scrollbar(self, command, *args):
+        if command == "moveto":
+            self.scroll_to(float(args[0]) * self.content_height)
+        elif command == "scroll":
+            amount, unit = int(args[0]), args[1]
+            step = self._view_height() if unit == "pages" else self.stride
+            self.scroll_to(self.offset + amount * step)
+
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            direction = -1
+        elif event.num == 5 or event.delta < 0:
+            direction = 1
+        else:
+            return
+        self.scroll_to(self.offset + direction * WHEEL_ROWS * self.stride)
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel, add="+")
+        widget.bind("<Button-4>", self._on_wheel, add="+")
+        widget.bind("<Button-5>", self._on_wheel, add="+")
+
+    # === GRUPO DE FILAS ===
+
+    def _on_resize(self, event):
+        needed = math.ceil(self._reverse_widget_scaling(event.height) / self.stride) + 1
+        if needed > len(self._pool):
+            for _ in range(needed - len(self._pool)):
+                self._pool.append(self._new_row())
+            # El módulo cambió: todas las filas se vuelven a asignar
+            for row in self._pool:
+                row.place_forget()
+            self._shown = [None] * len(self._pool)
+            self._shown_items = [None] * len(self._pool)
+            self._placed = [None] * len(self._pool)
+        self.offset = min(self.offset, self._max_offset())
+        self._render()
+
+    def _new_row(self):
+        row = self.create_row(self.viewport)
+        slot = len(self._pool)
+        widgets = [row]
+        while widgets:
+            widget = widgets.pop()
+            widget.bind("<Button-1>", lambda e, s=slot: self._click(s, self.on_click))
+            widget.bind("<Double-Button-1>", lambda e, s=slot: self._click(s, self.on_double_click))
+            self._bind_wheel(widget)
+            widgets.extend(child for child in widget.winfo_children()
+                           if isinstance(child, ctk.CTkBaseClass))
+        return row
+
+    def _click(self, slot: int, callback):
+        index = self._shown[slot]
+        if callback is not None and index is not None:
+            callback(index)
+
+    def _render(self):
+        """Coloca las filas visibles; rellena solo las que cambiaron de elemento"""
+        if not self._pool:
+            return
+        stride = self.stride
+        first = self.offset // stride
+        count = len(self._pool)
+        last = min(len(self.items), first + count)
+        used = set()
+        for index in range(first, last):
+            slot = index % count
+            used.add(slot)
+            row = self._pool[slot]
+            item = self.items[index]
+            if self._shown[slot] != index or self._shown_items[slot] is not item:
+                self._shown[slot] = index
+                self._shown_items[slot] = item
+                self.fill_row(row, item, index)
+            y = index * stride - self.offset
+            if self._placed[slot] != y:
+                # El alto sale del constructor de la fila (CTk no lo acepta en place)
+                row.place(x=0, y=y, relwidth=1.0)
+                self._placed[slot] = y
+        for slot in range(count):
+            if slot not in used and self._placed[slot] is not None:
+                self._pool[slot].place_forget()
+                self._placed[slot] = None
+                self._shown[slot] = None
+                self._shown_items[slot] = None
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        total = self.content_height
+        if total <= 0:
+            value = (0.0, 1.0)
+        else:
+            value = (self.offset / total, min(1.0, (self.offset + self._view_height()) / total))
+        if value != self._scrollbar_value:
+            self._scrollbar_value = value
+            self.scrollbar.set(*value)
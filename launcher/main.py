@@ -12,7 +12,13 @@ Instalación:
 
 Uso:
     python main.py
+    python main.py --startup-report   # Mide el arranque, imprime el informe y sale
 """
+import time
+
+# Inicio del arranque (antes de cualquier otro import)
+STARTED = time.perf_counter()
+
 import sys
 from pathlib import Path
 
@@ -52,10 +58,13 @@ def main():
     
     # Importar y ejecutar la aplicación
     try:
+        from core.startup_timing import StartupTimer
+        startup = StartupTimer(STARTED)
         from gui.main_window import PS2Launcher
+        startup.mark('imports')
         
         print("📀 Cargando interfaz...")
-        app = PS2Launcher()
+        app = PS2Launcher(startup=startup, exit_after_startup='--startup-report' in sys.argv)
         app.mainloop()
         
     except Exception as e:
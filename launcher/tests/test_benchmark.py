@@ -0,0 +1,65 @@
+"""
+Benchmark en lote contra el emulador de prueba (tools/fake_pcsx2.py)
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.benchmark import BatchBenchmark
+from core.emulator import EmulatorManager
+
+FAKE_PCSX2 = Path(__file__).parent.parent / "tools" / "fake_pcsx2.py"
+
+
+def _emulator(tmp_path: Path) -> EmulatorManager:
+    emulator = EmulatorManager(config_path=tmp_path / "config")
+    emulator.pcsx2_path = FAKE_PCSX2.resolve()
+    emulator.settings['pcsx2_fingerprint'] = emulator.discovery.fingerprint(emulator.pcsx2_path)
+    version = emulator.discovery.probe_version(emulator.pcsx2_path)
+    emulator.settings['pcsx2_version'] = list(version) if version else None
+    config_dir = tmp_path / "pcsx2"
+    (config_dir / "inis").mkdir(parents=True)
+    (config_dir / "inis" / "PCSX2.ini").write_text("[EmuCore/GS]\nupscale_multiplier = 1\n")
+    (config_dir / "gamesettings").mkdir()
+    (config_dir / "gamesettings" / "SLUS-20312_ABCD1234.ini").write_text("")
+    emulator.pcsx2_config_dir = str(config_dir)
+    return emulator
+
+
+def _game(tmp_path: Path, game_id: str) -> dict:
+    rom = tmp_path / "roms" / f"{game_id}.iso"
+    rom.parent.mkdir(exist_ok=True)
+    rom.write_bytes(b"\0" * 2048)
+    return {'id': game_id, 'name': game_id, 'path': str(rom)}
+
+
+def test_benchmark_profiles_reach_the_game_ini(tmp_path):
+    emulator = _emulator(tmp_path)
+    with_ini = _game(tmp_path, "SLUS_203.12")
+    without_ini = _game(tmp_path, "SLES_500.00")
+    profiles = {
+        "base": {},
+        "2x": {"config": {"internal_resolution": 2}},
+    }
+    benchmark = BatchBenchmark(emulator, output_dir=tmp_path / "benchmarks")
+    run_dir = benchmark.run([with_ini, without_ini], profiles, duration=1.5)
+
+    results = {name: json.loads((run_dir / f"{name}.json").read_text())['results']
+               for name in profiles}
+    base, missing = results["base"]
+    assert base['launched'] and not base['crashed']
+    assert base['output_tail'][0].startswith("PCSX2")
+    assert missing['launched'] and missing['error'] is None
+
+    upscaled, failed = results["2x"]
+    assert upscaled['launched'] and upscaled['error'] is None
+    game_ini = Path(emulator.pcsx2_config_dir) / "gamesettings" / "SLUS-20312_ABCD1234.ini"
+    assert "upscale_multiplier = 2" in game_ini.read_text()
+    # Sin INI del juego el perfil no se aplicaría: falla en vez de medir lo mismo que "base"
+    assert not failed['launched'] and failed['error']
+    report = (run_dir / "comparison.txt").read_text(encoding='utf-8')
+    assert "SIN PERFIL" in report
+    # El benchmark no ensucia la telemetría del juego
+    assert emulator.telemetry.get_sessions("SLUS_203.12") == []
@@ -0,0 +1,79 @@
+"""
+Backend evdev sobre un /dev/input falso generado con tools/fake_input.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+from core.evdev_backend import EvdevBackend, sdl_guid
+from fake_input import add_device, remove_device
+
+
+def _backend(root: Path) -> EvdevBackend:
+    return EvdevBackend(root / "input", root / "devices")
+
+
+def test_is_supported_uses_input_dir(tmp_path):
+    assert not _backend(tmp_path).is_supported()
+    add_device(tmp_path, 'dualsense')
+    assert _backend(tmp_path).is_supported()
+
+
+def test_enumerate_fixture_pads(tmp_path):
+    add_device(tmp_path, 'dualsense')
+    add_device(tmp_path, 'keyboard')
+    add_device(tmp_path, 'xbox-series')
+    gamepads = _backend(tmp_path).enumerate()
+
+    names = sorted(gamepad.name for gamepad in gamepads)
+    assert names == ["Microsoft Xbox Series S|X Controller",
+                     "Sony Interactive Entertainment DualSense Wireless Controller"]
+    dualsense = next(g for g in gamepads if "DualSense" in g.name)
+    assert dualsense.guid == sdl_guid(0x0003, 0x054c, 0x0ce6, 0x8111)
+    assert (dualsense.num_axes, dualsense.num_hats) == (6, 1)
+    assert len({g.instance_id for g in gamepads}) == 2
+
+
+def test_enumerate_after_remove(tmp_path):
+    node = add_device(tmp_path, 'dualsense')
+    add_device(tmp_path, 'switch-pro')
+    backend = _backend(tmp_path)
+    assert len(backend.enumerate()) == 2
+    remove_device(tmp_path, node)
+    assert [g.name for g in backend.enumerate()] == ["Nintendo Switch Pro Controller"]
+
+
+def _wait_for(backend: EvdevBackend, kind: str, attempts: int = 20):
+    for _ in range(attempts):
+        changes = [value for change, value in backend.wait_events() if change == kind]
+        if changes:
+            return changes
+    return []
+
+
+def test_inotify_hotplug(tmp_path):
+    add_device(tmp_path, 'keyboard')
+    backend = _backend(tmp_path)
+    backend.initialize()
+    try:
+        assert backend._inotify_fd is not None
+        assert backend.enumerate() == []
+
+        node = add_device(tmp_path, 'dualsense')
+        added = _wait_for(backend, 'added')
+        assert [g.name for g in added] == [
+            "Sony Interactive Entertainment DualSense Wireless Controller"]
+
+        remove_device(tmp_path, node)
+        assert _wait_for(backend, 'removed') == [added[0].instance_id]
+    finally:
+        backend.shutdown()
+
+
+def test_no_backend_without_pygame_off_linux(monkeypatch):
+    import core.gamepad_detector as detector
+    monkeypatch.setattr(detector, 'PYGAME_AVAILABLE', False)
+    monkeypatch.setattr(detector.sys, 'platform', 'win32')
+    assert detector.create_backend() is None
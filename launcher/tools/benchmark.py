@@ -0,0 +1,73 @@
+"""
+Benchmark - Ejecuta juegos en lote con uno o varios perfiles y compara resultados
+
+Ejemplo de perfiles (JSON):
+    {
+        "base": {},
+        "4cores": {"launch_profile": {"cpu_affinity": [0, 1, 2, 3]}},
+        "2x": {"config": {"internal_resolution": 2}}
+    }
+
+Uso:
+    python tools/benchmark.py --profiles perfiles.json --duration 60
+    python tools/benchmark.py --pcsx2 tools/fake_pcsx2.py --roms roms --duration 5
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.benchmark import BatchBenchmark
+from core.emulator import EmulatorManager
+from core.game_info import GameInfo
+from core.rom_scanner import ROMScanner
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de perfiles en lote")
+    parser.add_argument("--profiles", help="JSON con perfiles {nombre: perfil}")
+    parser.add_argument("--duration", type=float, default=60, help="Segundos por juego")
+    parser.add_argument("--roms", help="Carpeta de ROMs (por defecto la configurada)")
+    parser.add_argument("--game", action="append", default=[],
+                        help="ID o parte del nombre del juego (repetible)")
+    parser.add_argument("--pcsx2", help="Ejecutable de PCSX2 (o tools/fake_pcsx2.py)")
+    parser.add_argument("--output", help="Carpeta de informes")
+    args = parser.parse_args()
+
+    emulator = EmulatorManager()
+    if args.pcsx2:
+        # Sin guardar en settings.json: el benchmark no cambia la instalación
+        emulator.pcsx2_path = Path(args.pcsx2).resolve()
+        emulator.settings['pcsx2_fingerprint'] = emulator.discovery.fingerprint(emulator.pcsx2_path)
+        version = emulator.discovery.probe_version(emulator.pcsx2_path)
+        emulator.settings['pcsx2_version'] = list(version) if version else None
+    if not emulator.is_configured() and not emulator.detect_pcsx2():
+        print("PCSX2 no encontrado (usa --pcsx2)")
+        return 1
+
+    roms_path = args.roms or emulator.settings.get('roms_path') or emulator.base_path / "roms"
+    games = ROMScanner(str(roms_path)).scan()
+    if args.game:
+        wanted = [g.lower() for g in args.game]
+        games = [
+            game for game in games
+            if any(w == game['id'].lower() or w in game['name'].lower() for w in wanted)
+        ]
+    if not games:
+        print(f"No hay juegos para probar en {roms_path}")
+        return 1
+
+    profiles = BatchBenchmark.load_profiles(args.profiles) if args.profiles else {"actual": {}}
+    benchmark = BatchBenchmark(emulator, GameInfo(), args.output)
+    try:
+        run_dir = benchmark.run(games, profiles, args.duration)
+    except KeyboardInterrupt:
+        benchmark.stop()
+        return 1
+
+    print((run_dir / "comparison.txt").read_text(encoding='utf-8'))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Calibrate Sticks - Asistente de calibración de sticks (deriva, zona muerta y escala)
+
+Mide cada mando conectado en reposo y girando los sticks, y guarda
+Deadzone/AxisScale por GUID en config/stick_calibration.json. La próxima
+vez que el launcher configure PCSX2 los usa en la sección [PadN].
+
+Uso:
+    python tools/calibrate_sticks.py                # Calibra los mandos sin calibrar
+    python tools/calibrate_sticks.py --all          # Recalibra todos
+    python tools/calibrate_sticks.py --list         # Calibraciones guardadas
+    python tools/calibrate_sticks.py --forget       # Borra la de los mandos conectados
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.gamepad_detector import GamepadDetector
+from core.stick_calibration import NUMPY_AVAILABLE, StickCalibration, format_calibration
+
+STATE_FILE = Path(__file__).parent.parent.parent / "config" / "stick_calibration.json"
+
+
+def run_phase(sampler, phase: str, seconds: float, instruction: str):
+    """Muestrea una fase mostrando la cuenta atrás"""
+    input(f"\n{instruction}. Pulsa Enter para empezar...")
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        sampler.set_phase(phase)
+        remaining = end - time.monotonic()
+        print(f"\r  {remaining:4.1f} s - {sampler.count(phase)} muestras", end="", flush=True)
+        time.sleep(min(0.2, max(remaining, 0)))
+    sampler.set_phase(None)
+    print()
+
+
+def calibrate(detector: GamepadDetector, gamepad, args) -> bool:
+    print(f"\n=== {gamepad.name} ===")
+    sampler = detector.start_calibration(gamepad)
+    if sampler is None:
+        return False
+    run_phase(sampler, 'rest', args.rest, "Suelta los sticks y no toques el mando")
+    run_phase(sampler, 'sweep', args.sweep, "Gira ambos sticks contra el borde, varias vueltas")
+    entry = detector.finish_calibration(gamepad, sampler)
+    if entry:
+        print(format_calibration(entry))
+    return entry is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibración de sticks por mando")
+    parser.add_argument("--all", action="store_true", help="Recalibrar también los ya calibrados")
+    parser.add_argument("--list", action="store_true", help="Mostrar las calibraciones guardadas")
+    parser.add_argument("--forget", action="store_true", help="Borrar la calibración de los conectados")
+    parser.add_argument("--rest", type=float, default=3, help="Segundos en reposo")
+    parser.add_argument("--sweep", type=float, default=6, help="Segundos de barrido")
+    parser.add_argument("--backend", choices=["pygame", "evdev"], help="Backend de entrada")
+    args = parser.parse_args()
+
+    calibration = StickCalibration(STATE_FILE)
+    if args.list:
+        for key, entry in calibration.calibrations.items():
+            print(f"{entry.get('name', key)} [{key}]")
+            print(format_calibration(entry))
+        return 0
+
+    detector = GamepadDetector(backend=args.backend, calibration=calibration)
+    try:
+        gamepads = detector.scan()
+        if not gamepads:
+            print("No hay mandos conectados")
+            return 1
+        if args.forget:
+            for gamepad in gamepads:
+                if calibration.forget(gamepad):
+                    print(f"Calibración borrada: {gamepad.name}")
+            return 0
+        if not NUMPY_AVAILABLE:
+            print("NumPy no está instalado: se usa el análisis en Python puro")
+        pending = [g for g in gamepads if args.all or not calibration.is_calibrated(g)]
+        if not pending:
+            print("Todos los mandos conectados ya están calibrados (usa --all para repetir)")
+            return 0
+        ok = all([calibrate(detector, gamepad, args) for gamepad in pending])
+        return 0 if ok else 1
+    finally:
+        detector.cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Fake Input - /dev/input falso para probar el backend evdev sin hardware
+
+Crea una carpeta con nodos eventN (archivos normales) y un archivo con el
+formato de /proc/bus/input/devices. Agregar o quitar un mando genera los
+mismos eventos de inotify que un hotplug real.
+
+Uso:
+    python tools/fake_input.py DIR add dualsense
+    python tools/fake_input.py DIR add xbox-series
+    python tools/fake_input.py DIR remove event3
+    python tools/fake_input.py DIR list
+    python tools/fake_input.py DIR watch      # Detector evdev sobre DIR
+
+    EvdevBackend(input_dir="DIR/input", proc_devices="DIR/devices")
+"""
+import argparse
+import struct
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+_LONG_BITS = struct.calcsize('L') * 8
+
+# Botones de gamepad (BTN_SOUTH..BTN_THUMBR) y ejes con cruceta (HAT0)
+GAMEPAD_KEYS = list(range(0x130, 0x13f))
+GAMEPAD_ABS = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x10, 0x11]
+
+PRESETS = {
+    'dualsense': (0x0003, 0x054c, 0x0ce6, 0x8111,
+                  "Sony Interactive Entertainment DualSense Wireless Controller"),
+    'dualshock4': (0x0003, 0x054c, 0x09cc, 0x8111,
+                   "Sony Interactive Entertainment Wireless Controller"),
+    'xbox-series': (0x0003, 0x045e, 0x0b12, 0x0511, "Microsoft Xbox Series S|X Controller"),
+    'xbox-360': (0x0003, 0x045e, 0x028e, 0x0114, "Microsoft X-Box 360 pad"),
+    'switch-pro': (0x0003, 0x057e, 0x2009, 0x8111, "Nintendo Switch Pro Controller"),
+    'bt-dualsense': (0x0005, 0x054c, 0x0ce6, 0x8100, "DualSense Wireless Controller"),
+    'keyboard': (0x0011, 0x0001, 0x0001, 0xab41, "AT Translated Set 2 keyboard"),
+}
+
+
+def format_bitmap(codes) -> str:
+    """Bitmap en el formato de /proc (palabra más alta primero)"""
+    value = 0
+    for code in codes:
+        value |= 1 << code
+    words = []
+    while value:
+        words.append(f"{value & ((1 << _LONG_BITS) - 1):x}")
+        value >>= _LONG_BITS
+    return " ".join(reversed(words)) or "0"
+
+
+def _blocks(proc_file: Path):
+    if not proc_file.exists():
+        return []
+    return [b for b in proc_file.read_text().split("\n\n") if b.strip()]
+
+
+def _handlers(block: str):
+    """Nodos de la línea "H: Handlers=" de un bloque"""
+    for line in block.splitlines():
+        if line.startswith("H: Handlers="):
+            return line[len("H: Handlers="):].split()
+    return []
+
+
+def _write_blocks(proc_file: Path, blocks):
+    tmp = proc_file.with_suffix('.tmp')
+    tmp.write_text("".join(b.strip("\n") + "\n\n" for b in blocks))
+    tmp.replace(proc_file)
+
+
+def add_device(root: Path, preset: str) -> str:
+    """Agrega un dispositivo; retorna su nodo"""
+    input_dir = root / "input"
+    input_dir.mkdir(parents=True, exist_ok=True)
+    proc_file = root / "devices"
+    used = {int(p.name[5:]) for p in input_dir.glob("event*")}
+    number = next(n for n in range(256) if n not in used)
+    node = f"event{number}"
+
+    bus, vendor, product, version, name = PRESETS[preset]
+    keys = list(range(1, 100)) if preset == 'keyboard' else GAMEPAD_KEYS
+    abs_codes = [] if preset == 'keyboard' else GAMEPAD_ABS
+    block = "\n".join([
+        f"I: Bus={bus:04x} Vendor={vendor:04x} Product={product:04x} Version={version:04x}",
+        f'N: Name="{name}"',
+        f"P: Phys=fake/{node}",
+        f"S: Sysfs=/devices/virtual/input/{node}",
+        "U: Uniq=",
+        f"H: Handlers={node}" + ("" if preset == 'keyboard' else f" js{number}"),
+        "B: PROP=0",
+        "B: EV=b" if abs_codes else "B: EV=3",
+        f"B: KEY={format_bitmap(keys)}",
+    ] + ([f"B: ABS={format_bitmap(abs_codes)}"] if abs_codes else []))
+    # Como en el kernel: /proc se actualiza antes de que aparezca el nodo
+    _write_blocks(proc_file, _blocks(proc_file) + [block])
+    (input_dir / node).touch()
+    return node
+
+
+def remove_device(root: Path, node: str):
+    """Quita un dispositivo"""
+    (root / "input" / node).unlink(missing_ok=True)
+    proc_file = root / "devices"
+    blocks = [b for b in _blocks(proc_file) if node not in _handlers(b)]
+    _write_blocks(proc_file, blocks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/dev/input falso para el backend evdev")
+    parser.add_argument("root", help="Carpeta del fixture")
+    parser.add_argument("command", choices=["add", "remove", "list", "watch"])
+    parser.add_argument("arg", nargs="?", help="Preset (add) o nodo eventN (remove)")
+    args = parser.parse_args()
+    root = Path(args.root)
+
+    if args.command == "add":
+        if args.arg not in PRESETS:
+            parser.error(f"preset: {', '.join(PRESETS)}")
+        print(add_device(root, args.arg))
+    elif args.command == "remove":
+        remove_device(root, args.arg)
+    elif args.command == "list":
+        for block in _blocks(root / "devices"):
+            print(block.splitlines()[1], " ".join(_handlers(block)))
+    elif args.command == "watch":
+        from core.evdev_backend import EvdevBackend
+        from core.gamepad_detector import GamepadDetector
+        detector = GamepadDetector(backend=EvdevBackend(root / "input", root / "devices"))
+        detector.scan()
+        detector.start_monitoring()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            detector.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
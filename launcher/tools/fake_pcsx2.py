@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Fake PCSX2 - Emulador de prueba para el benchmark y el CI (sin PCSX2 real)
+
+Imita la línea de comandos de PCSX2 Qt y escribe líneas de rendimiento
+en stdout (y en emulog.txt si se indica). Se controla con variables de
+entorno, así un perfil de lanzamiento puede cambiar el resultado:
+
+    FAKE_PCSX2_SPEED        Velocidad media en % (por defecto 100)
+    FAKE_PCSX2_JITTER       Variación de la velocidad en % (por defecto 2)
+    FAKE_PCSX2_FPS          FPS objetivo del juego (por defecto 60)
+    FAKE_PCSX2_EMULOG       Ruta de emulog.txt a escribir (opcional)
+    FAKE_PCSX2_BOOT_DELAY   Segundos antes de la primera salida (por defecto 0.2)
+    FAKE_PCSX2_CRASH_AFTER  Segundos hasta terminar con error (opcional)
+"""
+import os
+import random
+import sys
+import time
+
+VERSION = "PCSX2 v2.0.2 (fake)"
+
+
+def main():
+    args = sys.argv[1:]
+    if '-version' in args or '--version' in args:
+        print(VERSION)
+        return 0
+
+    rom = next((arg for arg in reversed(args) if not arg.startswith('-')), None)
+    flags = [arg for arg in args if arg.startswith('-')]
+
+    speed = float(os.environ.get('FAKE_PCSX2_SPEED', 100))
+    jitter = float(os.environ.get('FAKE_PCSX2_JITTER', 2))
+    target_fps = float(os.environ.get('FAKE_PCSX2_FPS', 60))
+    crash_after = os.environ.get('FAKE_PCSX2_CRASH_AFTER')
+    emulog_path = os.environ.get('FAKE_PCSX2_EMULOG')
+    emulog = open(emulog_path, 'w', encoding='utf-8') if emulog_path else None
+
+    def emit(line: str):
+        print(line, flush=True)
+        if emulog:
+            emulog.write(line + "\n")
+            emulog.flush()
+
+    time.sleep(float(os.environ.get('FAKE_PCSX2_BOOT_DELAY', 0.2)))
+    emit(VERSION)
+    emit(f"Flags: {' '.join(flags) or '(ninguno)'}")
+    emit(f"Opening CDVD... {rom}")
+
+    rng = random.Random(rom)
+    start = time.time()
+    frame = 0
+    while True:
+        time.sleep(0.5)
+        frame += 1
+        current = max(1.0, speed + rng.uniform(-jitter, jitter))
+        fps = target_fps * min(current, 100.0) / 100.0
+        vps = target_fps * current / 100.0
+        emit(f"Speed: {current:.1f}% | FPS: {fps:.2f} | VPS: {vps:.2f}")
+        if frame % 20 == 1:
+            emit("GS: Compiling shaders (pipeline cache miss)")
+        if crash_after and time.time() - start >= float(crash_after):
+            emit("Fatal error: simulated crash")
+            return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""
+Input Bench - Grabación, reproducción y benchmark del detector de mandos sin hardware
+
+Uso:
+    python tools/input_bench.py record traza.bin --duration 30   # Graba los mandos reales
+    python tools/input_bench.py synth traza.bin --pads 4 --rate 1000 --seconds 10
+    python tools/input_bench.py replay traza.bin --speed 1       # Diagnóstico de la traza
+    python tools/input_bench.py bench                            # Traza sintética a máxima velocidad
+    python tools/input_bench.py bench traza.bin --ini PCSX2.ini
+
+El detector usa la traza con el backend 'replay:<traza>' (ver input_trace.py),
+así que también sirve para la interfaz: gamepad_backend = "replay:traza.bin".
+"""
+import argparse
+import math
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.evdev_backend import sdl_guid
+from core.gamepad_detector import (ControllerType, GamepadDetector, GamepadInfo, InputEvent,
+                                   create_backend)
+from core.input_diagnostics import InputDiagnostics, format_report
+from core.input_trace import RecordingBackend, ReplayBackend, TraceWriter, read_trace
+
+# Mandos sintéticos: (nombre, bus, vendor, product, versión)
+SYNTH_PADS = [
+    ("DualSense Wireless Controller", 0x03, 0x054c, 0x0ce6, 0x8111),
+    ("Xbox Series X Controller", 0x03, 0x045e, 0x0b12, 0x0511),
+    ("DualShock 4 Wireless Controller", 0x05, 0x054c, 0x09cc, 0x8100),
+    ("Pro Controller", 0x03, 0x057e, 0x2009, 0x8111),
+]
+
+
+def _synth_pad(index: int) -> GamepadInfo:
+    name, bus, vendor, product, version = SYNTH_PADS[index % len(SYNTH_PADS)]
+    return GamepadInfo(id=index, name=name, controller_type=ControllerType.UNKNOWN,
+                       num_axes=6, num_buttons=15, num_hats=1,
+                       guid=sdl_guid(bus, vendor, product, version), instance_id=index)
+
+
+def synthesize(path, pads: int = 2, rate_hz: float = 1000, seconds: float = 5,
+               hotplug_every: float = 1.0) -> int:
+    """
+    Traza sintética: `pads` mandos presentes moviendo los sticks en círculo
+    a `rate_hz` reportes por segundo (2 ejes por reporte) y pulsando un
+    botón cada 100 ms; cada `hotplug_every` s se conecta o desconecta un
+    mando extra (que también se mueve mientras está conectado). Retorna el
+    número de registros.
+    """
+    step = int(1e9 / rate_hz)
+    end = int(seconds * 1e9)
+    extra = _synth_pad(pads)
+    with TraceWriter(path) as writer:
+        devices = [_synth_pad(i) for i in range(pads)]
+        for gamepad in devices:
+            writer.write_device(gamepad, 0, present=True)
+        connected = False
+        next_hotplug = int(hotplug_every * 1e9) if hotplug_every else None
+        for t in range(0, end, step):
+            if next_hotplug is not None and t >= next_hotplug:
+                if connected:
+                    writer.write_removed(extra.instance_id, t)
+                else:
+                    writer.write_device(extra, t)
+                connected = not connected
+                next_hotplug += int(hotplug_every * 1e9)
+            angle = t / 1e9 * 2 * math.pi
+            for gamepad in devices + ([extra] if connected else []):
+                # Desfase de 13 µs por mando: los reportes no llegan juntos
+                t_pad = t + gamepad.instance_id * 13_000
+                writer.write_input(InputEvent(t_pad, gamepad.instance_id, 'axis', 0, math.cos(angle)))
+                writer.write_input(InputEvent(t_pad, gamepad.instance_id, 'axis', 1, math.sin(angle)))
+                if t % 100_000_000 < step:
+                    writer.write_input(InputEvent(t_pad, gamepad.instance_id, 'button', 0,
+                                                  float(t // 100_000_000 % 2)))
+        return writer.records
+
+
+def cmd_record(args) -> int:
+    backend = RecordingBackend(create_backend(args.backend), args.trace)
+    detector = GamepadDetector(backend=backend)
+    gamepads = detector.scan()
+    print(f"Grabando {len(gamepads)} mando(s) en {args.trace} "
+          f"({args.duration:g} s, Ctrl+C para terminar)...")
+    try:
+        time.sleep(args.duration)
+    except KeyboardInterrupt:
+        pass
+    detector.cleanup()
+    size = Path(args.trace).stat().st_size
+    print(f"{backend.writer.records} registros, {size / 1024:.1f} KB")
+    return 0
+
+
+def cmd_synth(args) -> int:
+    records = synthesize(args.trace, args.pads, args.rate, args.seconds, args.hotplug)
+    size = Path(args.trace).stat().st_size
+    print(f"{records} registros, {size / 1024:.1f} KB -> {args.trace}")
+    return 0
+
+
+def cmd_replay(args) -> int:
+    backend = ReplayBackend(args.trace, speed=args.speed, paused=True)
+    detector = GamepadDetector(backend=backend)
+    detector.scan()
+    detector.start_diagnostics()
+    backend.start()
+    started = time.perf_counter()
+    while not backend.finished.wait(0.25):
+        pass
+    elapsed = time.perf_counter() - started
+    report = detector.stop_diagnostics()
+    detector.cleanup()
+    print(format_report(report))
+    print(f"Reproducido en {elapsed:.2f} s (velocidad {args.speed:g}x)")
+    return 0
+
+
+def cmd_bench(args) -> int:
+    workdir = Path(tempfile.mkdtemp(prefix="input_bench_"))
+    try:
+        trace = Path(args.trace) if args.trace else workdir / "synth.bin"
+        if not args.trace:
+            synthesize(trace, args.pads, args.rate, args.seconds, args.hotplug)
+        present, changes = read_trace(trace)
+        inputs = sum(1 for _, kind, _ in changes if kind == 'input')
+        hotplugs = len(changes) - inputs
+
+        ini = workdir / "PCSX2.ini"
+        if args.ini:
+            shutil.copy(args.ini, ini)
+        else:
+            ini.write_text("[Pad]\nMultitapPort1 = false\nMultitapPort2 = false\n")
+
+        backend = ReplayBackend(trace, speed=0, paused=True)
+        detector = GamepadDetector(backend=backend)
+        diagnostics = InputDiagnostics()
+        for gamepad in present + [v for _, kind, v in changes if kind == 'added']:
+            diagnostics.add_device(gamepad.instance_id, gamepad.name, gamepad.guid)
+        received = [0]
+
+        def on_input(event):
+            received[0] += 1
+            diagnostics.feed(event)
+
+        detector.scan()
+        detector.add_input_listener(on_input)
+        started = time.perf_counter()
+        backend.start()
+        # Bucle de "interfaz": lo mismo que hace la ventana con after()
+        ui_batches, ui_events, ui_time = 0, 0, 0.0
+        while True:
+            finished = backend.finished.is_set()
+            t0 = time.perf_counter()
+            events = detector.poll_events()
+            if events:
+                detector.apply_pcsx2_config(ini)
+                ui_batches += 1
+                ui_events += len(events)
+            ui_time += time.perf_counter() - t0
+            if finished:
+                break
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - started
+        detector.cleanup()
+
+        print(f"Traza: {trace.name} ({trace.stat().st_size / 1024:.0f} KB), "
+              f"{len(present)} mando(s) presentes")
+        print(f"Entrada: {received[0]}/{inputs} eventos en {elapsed:.2f} s "
+              f"({received[0] / elapsed:,.0f} eventos/s)")
+        print(f"Hotplug: {ui_events}/{hotplugs} cambios en {ui_batches} lotes de la interfaz, "
+              f"{ui_time * 1000:.1f} ms en el hilo de la interfaz")
+        print(format_report(diagnostics.report()))
+        return 0 if received[0] == inputs and ui_events == hotplugs else 1
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trazas de mandos: grabación, reproducción y benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    record = sub.add_parser("record", help="Grabar los mandos conectados")
+    record.add_argument("trace")
+    record.add_argument("--duration", type=float, default=30)
+    record.add_argument("--backend", choices=["pygame", "evdev"])
+
+    for name, help_text in (("synth", "Generar una traza sintética"),
+                            ("bench", "Benchmark del detector con una traza")):
+        command = sub.add_parser(name, help=help_text)
+        command.add_argument("trace", nargs="?" if name == "bench" else None)
+        command.add_argument("--pads", type=int, default=2)
+        command.add_argument("--rate", type=float, default=1000, help="Reportes por segundo por mando")
+        command.add_argument("--seconds", type=float, default=5)
+        command.add_argument("--hotplug", type=float, default=0.5, help="Segundos entre conexiones (0 = no)")
+        if name == "bench":
+            command.add_argument("--ini", help="PCSX2.ini a copiar para la prueba")
+
+    replay = sub.add_parser("replay", help="Reproducir una traza con diagnóstico")
+    replay.add_argument("trace")
+    replay.add_argument("--speed", type=float, default=1.0, help="1 = tiempo real, 0 = sin esperas")
+
+    args = parser.parse_args()
+    return {"record": cmd_record, "synth": cmd_synth,
+            "replay": cmd_replay, "bench": cmd_bench}[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
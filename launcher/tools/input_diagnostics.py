@@ -0,0 +1,99 @@
+"""
+Input Diagnostics - Mide la frecuencia de reporte y el jitter de los mandos conectados
+
+Uso:
+    python tools/input_diagnostics.py                     # Mide 10 s (mueve los sticks)
+    python tools/input_diagnostics.py --duration 30 --record traza.jsonl
+    python tools/input_diagnostics.py --trace traza.jsonl # Analiza una traza grabada
+    python tools/input_diagnostics.py --trace traza.bin   # o una de tools/input_bench.py
+    python tools/input_diagnostics.py --backend evdev --output informe.json
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import input_trace
+from core.input_diagnostics import (InputDiagnostics, format_report, read_trace,
+                                    save_report, write_trace)
+
+
+def measure(args) -> dict:
+    """Mide los mandos conectados durante args.duration segundos"""
+    from core.gamepad_detector import GamepadDetector
+    detector = GamepadDetector(backend=args.backend)
+    try:
+        gamepads = detector.scan()
+        if not gamepads:
+            print("No hay mandos conectados")
+            return None
+        print(f"Midiendo {len(gamepads)} mando(s) durante {args.duration:g} s: "
+              f"mueve los sticks sin parar...")
+        diagnostics = detector.start_diagnostics(record=bool(args.record))
+        if diagnostics is None:
+            return None
+        time.sleep(args.duration)
+        report = detector.stop_diagnostics()
+        if args.record:
+            write_trace(args.record, detector.gamepads, diagnostics.recorded)
+            print(f"Traza guardada en {args.record} ({len(diagnostics.recorded)} eventos)")
+        return report
+    finally:
+        detector.cleanup()
+
+
+def analyze_trace(path) -> dict:
+    """Informe de una traza grabada (JSONL o binaria de input_bench.py)"""
+    with open(path, 'rb') as f:
+        binary = f.read(len(input_trace.MAGIC)) == input_trace.MAGIC
+    if binary:
+        present, changes = input_trace.read_trace(path)
+        devices = [{'instance_id': g.instance_id, 'name': g.name, 'guid': g.guid}
+                   for g in present + [v for _, kind, v in changes if kind == 'added']]
+        events = [v for _, kind, v in changes if kind == 'input']
+    else:
+        devices, events = read_trace(path)
+    diagnostics = InputDiagnostics()
+    for device in devices:
+        diagnostics.add_device(device['instance_id'], device.get('name', ""), device.get('guid', ""))
+    diagnostics.feed_all(events)
+    report = diagnostics.report()
+    if events:
+        report['duration_s'] = round((events[-1].t_ns - events[0].t_ns) / 1e9, 1)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frecuencia de reporte y jitter de los mandos")
+    parser.add_argument("--duration", type=float, default=10, help="Segundos de medición")
+    parser.add_argument("--backend", choices=["pygame", "evdev"], help="Backend de entrada")
+    parser.add_argument("--record", help="Guardar los eventos como traza JSONL")
+    parser.add_argument("--trace", help="Analizar una traza JSONL en lugar de medir")
+    parser.add_argument("--output", help="Guardar el informe JSON en este archivo")
+    parser.add_argument("--json", action="store_true", help="Imprimir el informe como JSON")
+    args = parser.parse_args()
+
+    report = analyze_trace(args.trace) if args.trace else measure(args)
+    if report is None:
+        return 1
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print(format_report(report))
+    if args.output:
+        output = Path(args.output)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Informe guardado en {output}")
+    elif not args.trace:
+        path = save_report(report, Path(__file__).parent.parent.parent / "logs" / "input_diagnostics")
+        print(f"Informe guardado en {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
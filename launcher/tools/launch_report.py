@@ -0,0 +1,62 @@
+"""
+Launch Report - Informe de tiempos de lanzamiento y lanzamientos lentos
+"""
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.launch_timing import LaunchStats, LAUNCH_PHASES
+
+
+def print_report(stats: LaunchStats, min_ms: float = 0):
+    """Imprime p50/p95 por juego y los lanzamientos atípicos"""
+    if not stats.games:
+        print("No hay lanzamientos registrados")
+        return
+
+    print("=" * 70)
+    print("  TIEMPOS DE LANZAMIENTO (clic -> primera salida del emulador)")
+    print("=" * 70)
+    print(f"  {'Juego':32} {'N':>4} {'p50':>8} {'p95':>8}")
+    for game_id, game in sorted(stats.games.items(), key=lambda g: g[1].get('name') or g[0]):
+        count = sum(game['histogram'])
+        p50 = stats.percentile(game_id, 0.50)
+        p95 = stats.percentile(game_id, 0.95)
+        name = (game.get('name') or game_id)[:32]
+        p50_text = f"{p50 / 1000:.2f}s" if p50 is not None else "--"
+        p95_text = f"{p95 / 1000:.2f}s" if p95 is not None else "--"
+        print(f"  {name:32} {count:>4} {p50_text:>8} {p95_text:>8}")
+
+    outliers = stats.outliers(min_ms)
+    print()
+    print("=" * 70)
+    print(f"  LANZAMIENTOS LENTOS ({len(outliers)})")
+    print("=" * 70)
+    labels = dict(LAUNCH_PHASES)
+    for sample in outliers:
+        when = datetime.fromtimestamp(sample['time']).strftime('%Y-%m-%d %H:%M')
+        total = sample['total_ms']
+        total_text = f"{total / 1000:.2f}s" if total is not None else "sin respuesta"
+        p95_text = f" (p95 {sample['p95'] / 1000:.2f}s)" if sample['p95'] is not None else ""
+        print(f"  {when}  {sample['name'] or sample['game_id']}: {total_text}{p95_text}")
+        phases = ", ".join(
+            f"{labels.get(phase, phase)} {ms:.0f}ms"
+            for phase, ms in sample['phases'].items() if phase != 'click'
+        )
+        print(f"      {phases}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Informe de tiempos de lanzamiento")
+    parser.add_argument(
+        "--stats", default=str(Path(__file__).parent.parent.parent / "config" / "launch_stats.json"),
+        help="Archivo launch_stats.json"
+    )
+    parser.add_argument(
+        "--min-ms", type=float, default=0,
+        help="Marcar también como lentos los lanzamientos por encima de este tiempo"
+    )
+    args = parser.parse_args()
+    print_report(LaunchStats(args.stats), args.min_ms)
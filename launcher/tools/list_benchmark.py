@@ -0,0 +1,202 @@
+"""
+List Benchmark - Tiempo de construcción y memoria de la lista de juegos según su tamaño
+
+Compara la lista virtualizada (gui/virtual_list.py) con la lista
+anterior (un CTkFrame y dos CTkLabel por juego dentro de un
+CTkScrollableFrame). Cada medición corre en un proceso nuevo para que
+la memoria (RSS) de una no afecte a la siguiente. Necesita un display:
+en un servidor usar Xvfb.
+
+Uso:
+    xvfb-run -a python tools/list_benchmark.py
+    xvfb-run -a python tools/list_benchmark.py --sizes 100 1000 5000 --legacy
+    python tools/list_benchmark.py --json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+ROW_HEIGHT = 55
+REGIONS = ["NTSC-U", "PAL", "NTSC-J"]
+
+
+def _rss_kb() -> int:
+    """Memoria residente actual del proceso (KB)"""
+    try:
+        with open("/proc/self/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _synth_games(count: int):
+    return [{
+        'id': f"SLUS_{20000 + i:03d}.{i % 100:02d}",
+        'name': f"Juego de prueba {i:05d}",
+        'path': f"/roms/juego_{i:05d}.iso",
+        'size_formatted': f"{1 + i % 4}.{i % 10} GB",
+    } for i in range(count)]
+
+
+def _build_legacy(ctk, parent, games):
+    """La lista anterior: widgets y bindings por juego"""
+    scroll = ctk.CTkScrollableFrame(parent, fg_color="transparent")
+    scroll.pack(fill="both", expand=True)
+    for index, game in enumerate(games):
+        item = ctk.CTkFrame(scroll, fg_color="transparent", height=ROW_HEIGHT, corner_radius=4)
+        item.pack(fill="x", pady=1, padx=4)
+        item.pack_propagate(False)
+        item.bind("<Enter>", lambda e: None)
+        item.bind("<Leave>", lambda e: None)
+        item.bind("<Button-1>", lambda e: None)
+        content = ctk.CTkFrame(item, fg_color="transparent")
+        content.pack(fill="both", expand=True, padx=12, pady=8)
+        ctk.CTkLabel(content, text=game['name'], font=ctk.CTkFont(size=13, weight="bold"),
+                     anchor="w").pack(fill="x")
+        ctk.CTkLabel(content, text=f"{game['id']}  |  {REGIONS[index % 3]}  |  {game['size_formatted']}",
+                     font=ctk.CTkFont(size=10), anchor="w").pack(fill="x")
+    return scroll
+
+
+def _build_virtual(ctk, parent, games):
+    """La lista actual: el mismo contenido por fila, solo para las visibles"""
+    from gui.virtual_list import VirtualList
+    fonts = (ctk.CTkFont(size=13, weight="bold"), ctk.CTkFont(size=10))
+
+    def create_row(master):
+        row = ctk.CTkFrame(master, fg_color="transparent", height=ROW_HEIGHT, corner_radius=4)
+        row.pack_propagate(False)
+        content = ctk.CTkFrame(row, fg_color="transparent")
+        content.pack(fill="both", expand=True, padx=12, pady=8)
+        row.name_label = ctk.CTkLabel(content, text="", font=fonts[0], anchor="w")
+        row.name_label.pack(fill="x")
+        row.info_label = ctk.CTkLabel(content, text="", font=fonts[1], anchor="w")
+        row.info_label.pack(fill="x")
+        return row
+
+    def fill_row(row, game, index):
+        row.name_label.configure(text=game['name'])
+        row.info_label.configure(text=f"{game['id']}  |  {REGIONS[index % 3]}  |  {game['size_formatted']}")
+
+    games_list = VirtualList(parent, row_height=ROW_HEIGHT, create_row=create_row, fill_row=fill_row)
+    games_list.pack(fill="both", expand=True)
+    games_list.set_items(games)
+    return games_list
+
+
+def run_one(mode: str, count: int, scroll_steps: int) -> dict:
+    """Una medición (en este proceso): construcción, RSS y desplazamiento"""
+    import customtkinter as ctk
+    games = _synth_games(count)
+    root = ctk.CTk()
+    root.geometry("1000x600")
+    root.update()
+    rss_before = _rss_kb()
+
+    started = time.perf_counter()
+    builder = _build_virtual if mode == "virtual" else _build_legacy
+    widget = builder(ctk, root, games)
+    root.update()
+    build_s = time.perf_counter() - started
+    result = {
+        'mode': mode,
+        'games': count,
+        'build_ms': round(build_s * 1000, 1),
+        'rss_delta_kb': _rss_kb() - rss_before,
+        'widgets': _count_widgets(root),
+    }
+
+    # Desplazamiento fila a fila hasta el final (o scroll_steps pasos)
+    steps = min(scroll_steps, max(1, count - 1))
+    times = []
+    for step in range(steps):
+        t0 = time.perf_counter()
+        if mode == "virtual":
+            widget.scroll_to((step + 1) * widget.stride)
+        else:
+            widget._parent_canvas.yview_moveto((step + 1) / max(1, count))
+        root.update_idletasks()
+        times.append(time.perf_counter() - t0)
+    times.sort()
+    result['scroll_p50_ms'] = round(times[len(times) // 2] * 1000, 3)
+    result['scroll_max_ms'] = round(times[-1] * 1000, 3)
+    root.destroy()
+    return result
+
+
+def _count_widgets(root) -> int:
+    pending, total = [root], 0
+    while pending:
+        widget = pending.pop()
+        children = widget.winfo_children()
+        total += len(children)
+        pending.extend(children)
+    return total
+
+
+def _run_subprocess(mode: str, count: int, scroll_steps: int) -> dict:
+    cmd = [sys.executable, __file__, "--child", mode, str(count), "--scroll-steps", str(scroll_steps)]
+    output = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    if output.returncode != 0:
+        return {'mode': mode, 'games': count, 'error': output.stderr.strip().splitlines()[-1:]}
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construcción y memoria de la lista de juegos")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 2000, 5000])
+    parser.add_argument("--legacy", action="store_true",
+                        help="Medir también la lista anterior (lenta con miles de juegos)")
+    parser.add_argument("--scroll-steps", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="Imprimir los resultados como JSON")
+    parser.add_argument("--child", nargs=2, metavar=("MODO", "JUEGOS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_one(args.child[0], int(args.child[1]), args.scroll_steps)))
+        return 0
+
+    if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+        print("No hay display: ejecutar con xvfb-run -a python tools/list_benchmark.py")
+        return 1
+
+    modes = ["virtual"] + (["legacy"] if args.legacy else [])
+    results = [_run_subprocess(mode, count, args.scroll_steps)
+               for mode in modes for count in args.sizes]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'lista':<8} {'juegos':>7} {'construcción':>13} {'RSS':>10} {'widgets':>8} "
+          f"{'scroll p50':>11} {'scroll máx':>11}")
+    for r in results:
+        if 'error' in r:
+            print(f"{r['mode']:<8} {r['games']:>7}  error: {' '.join(r['error'])}")
+            continue
+        print(f"{r['mode']:<8} {r['games']:>7} {r['build_ms']:>10.1f} ms {r['rss_delta_kb'] / 1024:>7.1f} MB "
+              f"{r['widgets']:>8} {r['scroll_p50_ms']:>8.3f} ms {r['scroll_max_ms']:>8.3f} ms")
+
+    # Plano = la lista más grande no cuesta mucho más que la más chica
+    virtual = [r for r in results if r['mode'] == "virtual" and 'error' not in r]
+    if len(virtual) >= 2:
+        small, large = virtual[0], virtual[-1]
+        flat = large['widgets'] == small['widgets'] and large['build_ms'] < small['build_ms'] * 2 + 50
+        print(f"\nVirtual: {small['games']} -> {large['games']} juegos, widgets "
+              f"{small['widgets']} -> {large['widgets']}, construcción {small['build_ms']:.0f} -> "
+              f"{large['build_ms']:.0f} ms: {'plano' if flat else 'NO plano'}")
+        return 0 if flat else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,155 +1,129 @@
 """
-PCSX2 Optimizer - Aplica configuraciones óptimas de gráficos
+PCSX2 Optimizer - Aplica configuraciones óptimas de gráficos y speedhacks a PCSX2.ini
+
+Sin --apply solo muestra el diff. Cada escritura queda en el historial de
+config/ini_snapshots, así que cualquier cambio se puede deshacer con --rollback.
+
+Uso:
+    python tools/optimize_pcsx2.py --game SLUS_203.12
+    python tools/optimize_pcsx2.py --preset calidad --apply
+    python tools/optimize_pcsx2.py --per-game --apply
+    python tools/optimize_pcsx2.py --per-game --preset rendimiento --apply
+    python tools/optimize_pcsx2.py --history
+    python tools/optimize_pcsx2.py --rollback [CAMBIO]
 """
-import os
+import argparse
 import sys
+from datetime import datetime
 from pathlib import Path
-import subprocess
 
-
-def get_pcsx2_settings_path():
-    """Encuentra la carpeta de configuración de PCSX2"""
-    possible_paths = [
-        Path(os.environ.get('APPDATA', '')) / "PCSX2" / "inis",
-        Path(os.environ.get('LOCALAPPDATA', '')) / "PCSX2" / "inis", 
-        Path.home() / "Documents" / "PCSX2" / "inis",
-    ]
-    
-    for path in possible_paths:
-        if path.exists():
-            return path
-    return None
-
-
-def print_optimization_guide():
-    """Imprime guía de optimización para PCSX2"""
-    
-    guide = """
-╔══════════════════════════════════════════════════════════════════╗
-║         🎮 GUÍA DE OPTIMIZACIÓN PCSX2 - CRASH OF THE TITANS       ║
-╠══════════════════════════════════════════════════════════════════╣
-
-Para la MEJOR CALIDAD VISUAL y RENDIMIENTO, configura esto en PCSX2:
-
-════════════════════════════════════════════════════════════════════
-  📺 CONFIGURACIÓN DE GRÁFICOS (Settings → Graphics)
-════════════════════════════════════════════════════════════════════
-
-  TAB: Rendering
-  ─────────────────
-  • Renderer:           Vulkan (mejor rendimiento) o Direct3D 12
-  • Internal Resolution: 4x Native (~1440p) o 6x Native (4K)
-                        *Si el juego va lento, baja a 3x Native
-
-  TAB: Texture Replacement  
-  ─────────────────
-  • Anisotropic Filtering: 16x
-  • Texture Filtering:     Bilinear (PS2)
-
-  TAB: Rendering (Opciones adicionales)
-  ─────────────────
-  • FXAA:                  ✓ Activado (suaviza bordes)
-  • Shader Texture Filtering Accuracy: Minimum (más rápido)
-
-════════════════════════════════════════════════════════════════════
-  ⚡ SPEEDHACKS (Settings → Emulation Settings → Speedhacks)
-════════════════════════════════════════════════════════════════════
-
-  • EE Cyclerate:          0 (Default)
-  • EE Cycle Skipping:     0 (Disabled)
-  • MTVU (Multi-Threaded): ✓ Activado (¡MUY IMPORTANTE!)
-  • Instant VU1:           ✓ Activado
-
-════════════════════════════════════════════════════════════════════
-  🎮 CONFIGURACIÓN DEL MANDO PS5 DUALSENSE
-════════════════════════════════════════════════════════════════════
-
-  1. Ve a: Settings → Controllers → Controller Port 1
-  
-  2. Haz clic en "Automatic Mapping"
-     → Selecciona "DualSense Wireless Controller"
-  
-  3. Verifica el mapeo:
-     ┌─────────────────┬─────────────────┐
-     │   DUALSENSE     │      PS2        │
-     ├─────────────────┼─────────────────┤
-     │   ✕ (Cross)     │   ✕ (Cross)     │
-     │   ○ (Circle)    │   ○ (Circle)    │
-     │   □ (Square)    │   □ (Square)    │
-     │   △ (Triangle)  │   △ (Triangle)  │
-     │   L1/R1         │   L1/R1         │
-     │   L2/R2         │   L2/R2         │
-     │   L3/R3         │   L3/R3         │
-     │   Left Stick    │   Left Stick    │
-     │   Right Stick   │   Right Stick   │
-     │   D-Pad         │   D-Pad         │
-     │   Options       │   Start         │
-     │   Create        │   Select        │
-     │   PS Button     │   (No usado)    │
-     │   Touchpad      │   (No usado)    │
-     └─────────────────┴─────────────────┘
-  
-  4. Ajusta "Dead Zone" de los sticks:
-     → Left Stick Dead Zone: 10-15%
-     → Right Stick Dead Zone: 10-15%
-     (Esto evita drift y movimientos no deseados)
-
-════════════════════════════════════════════════════════════════════
-  🔧 CONFIGURACIÓN ESPECÍFICA PARA CRASH OF THE TITANS
-════════════════════════════════════════════════════════════════════
-
-  • El juego es PAL (50fps). Para forzar 60fps:
-    Settings → Emulation Settings → GS → Frame Rate: 60
-    (Puede acelerar el juego un poco)
-  
-  • Si hay glitches visuales:
-    Settings → Graphics → Rendering → 
-    Hardware Fixes → Half Pixel Offset: Special (Texture)
-
-════════════════════════════════════════════════════════════════════
-  ✅ RESUMEN DE CONFIGURACIÓN ÓPTIMA
-════════════════════════════════════════════════════════════════════
-
-  | Configuración          | Valor Recomendado        |
-  |------------------------|--------------------------|
-  | Renderer               | Vulkan                   |
-  | Internal Resolution    | 4x Native (1440p)        |
-  | Anisotropic Filtering  | 16x                      |
-  | FXAA                   | Activado                 |
-  | MTVU                   | Activado                 |
-  | Instant VU1            | Activado                 |
-  | Controller             | DualSense (Auto-mapped)  |
-  | Dead Zone              | 10-15%                   |
-
-╚══════════════════════════════════════════════════════════════════╝
-
-¡Después de aplicar estos ajustes, el juego se verá increíble! 🎮✨
-"""
-    print(guide)
-    return guide
-
-
-def open_pcsx2_settings():
-    """Abre PCSX2 directamente en configuración"""
-    pcsx2_paths = [
-        Path("C:/Program Files/PCSX2/pcsx2-qt.exe"),
-        Path("C:/Program Files (x86)/PCSX2/pcsx2-qt.exe"),
-    ]
-    
-    for path in pcsx2_paths:
-        if path.exists():
-            print(f"\n🚀 Abriendo PCSX2...")
-            subprocess.Popen([str(path)])
-            print("   → Ve a Settings → Graphics para configurar\n")
-            return True
-    
-    print("❌ PCSX2 no encontrado")
-    return False
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.emulator import EmulatorManager
+from core.game_info import GameInfo
+from core.pcsx2_profile import (
+    PRESETS, ProfileApplier, find_game_settings, format_changes, game_settings_serial,
+    get_preset, unified_diff
+)
+
+
+def per_game_targets(emulator, game_info, games, preset: dict = None):
+    """
+    INI por juego -> configuración, para los juegos indicados o todos.
+    Con `preset` todos reciben ese perfil (sin juegos indicados: todos los
+    INI de gamesettings); sin él, cada uno el suyo de GameInfo.
+    """
+    config_dir = emulator.pcsx2_config_dir
+    if not config_dir:
+        return {}
+    if preset is not None and not games:
+        folder = Path(config_dir) / "gamesettings"
+        return {str(path): preset for path in sorted(folder.glob("*.ini"))} if folder.exists() else {}
+    if not games:
+        folder = Path(config_dir) / "gamesettings"
+        games = sorted(game_info.database) + sorted(game_info.custom_configs)
+        if folder.exists():
+            # Solo los juegos que ya tienen INI por juego
+            present = {p.name.split('_')[0] for p in folder.glob("*.ini")}
+            games = [g for g in dict.fromkeys(games) if game_settings_serial(g) in present]
+    targets = {}
+    for game_id in games:
+        for ini_path in find_game_settings(config_dir, game_id):
+            targets[str(ini_path)] = preset if preset is not None else game_info.get_optimal_config(game_id)
+    return targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aplica perfiles de configuración a PCSX2")
+    parser.add_argument("--game", action="append", default=[], help="ID del juego (perfil de GameInfo)")
+    parser.add_argument("--preset", choices=sorted(PRESETS), help="Perfil con nombre")
+    parser.add_argument("--ini", help="PCSX2.ini a modificar (por defecto el de la instalación)")
+    parser.add_argument("--apply", action="store_true", help="Escribir los cambios (por defecto solo diff)")
+    parser.add_argument("--per-game", action="store_true",
+                        help="Aplicar a los INI por juego (gamesettings) en lugar del global")
+    parser.add_argument("--history", action="store_true", help="Listar cambios registrados")
+    parser.add_argument("--rollback", nargs="?", const=-1, type=int, metavar="CAMBIO",
+                        help="Deshacer un cambio (por defecto el último)")
+    args = parser.parse_args()
+
+    emulator = EmulatorManager()
+    game_info = GameInfo()
+    applier = ProfileApplier()
+    ini_path = Path(args.ini) if args.ini else emulator.get_ini_path()
+
+    if args.history or args.rollback is not None:
+        if not ini_path:
+            print("No se encontró PCSX2.ini (usa --ini)")
+            return 1
+        if args.rollback is not None:
+            entry_id = None if args.rollback == -1 else args.rollback
+            return 0 if emulator.ini_snapshots.restore(ini_path, entry_id) else 1
+        for entry in emulator.ini_snapshots.timeline(ini_path):
+            when = datetime.fromtimestamp(entry['time']).strftime('%Y-%m-%d %H:%M:%S')
+            before = entry['before'][:8] if entry['before'] else "--------"
+            print(f"  #{entry['id']:<4} {when}  {before} -> {entry['after'][:8]}  {entry['label']}")
+        stats = emulator.ini_snapshots.get_stats()
+        print(f"\n{stats['changes']} cambios, {stats['states']} estados distintos "
+              f"({stats['size_bytes'] / 1024:.0f} KB)")
+        return 0
+
+    if args.per_game:
+        preset = get_preset(args.preset) if args.preset else None
+        targets = per_game_targets(emulator, game_info, args.game, preset)
+        if not targets:
+            print("No hay INI por juego que actualizar")
+            return 1
+        label = f"optimize_pcsx2 (por juego, perfil {args.preset})" if preset else "optimize_pcsx2 (por juego)"
+        results = applier.apply_batch(ini_path, targets, label=label,
+                                      dry_run=not args.apply)
+        for path, changes in results.items():
+            print(f"{Path(path).name}: {len(changes)} cambios")
+            if changes:
+                print(format_changes(changes))
+        if not args.apply:
+            print("\nUsa --apply para escribir los cambios")
+        return 0
+
+    if args.preset:
+        config, label = get_preset(args.preset), f"perfil {args.preset}"
+    elif args.game:
+        config, label = game_info.get_optimal_config(args.game[0]), f"juego {args.game[0]}"
+    else:
+        parser.error("indica --game o --preset")
+    if not ini_path:
+        print("No se encontró PCSX2.ini (usa --ini)")
+        return 1
+
+    before, after, changes = applier.preview(ini_path, config)
+    if not changes:
+        print(f"{ini_path.name} ya tiene el {label}")
+        return 0
+    print(unified_diff(before, after, ini_path.name))
+    if args.apply:
+        applier.apply(ini_path, config, label=f"optimize_pcsx2: {label}")
+    else:
+        print("Usa --apply para escribir los cambios")
+    return 0
 
 
 if __name__ == "__main__":
-    print_optimization_guide()
-    
-    response = input("\n¿Quieres abrir PCSX2 ahora para configurar? (s/n): ")
-    if response.lower() in ['s', 'si', 'yes', 'y']:
-        open_pcsx2_settings()
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Startup Report - Tiempo de arranque del launcher y presupuesto del primer pintado
+
+Arranca main.py con `python -X importtime ... --startup-report` (la
+ventana se cierra sola cuando termina de inicializarse), muestra el
+tiempo de cada fase y los imports más lentos, y sale con código 1 si el
+primer pintado supera el presupuesto. Necesita un display: en un
+servidor usar Xvfb.
+
+Uso:
+    python tools/startup_report.py
+    python tools/startup_report.py --runs 5 --budget 300
+    xvfb-run -a python tools/startup_report.py --json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.startup_timing import FIRST_PAINT_BUDGET_MS, STARTUP_PHASES, slowest_imports
+
+MAIN = Path(__file__).parent.parent / "main.py"
+REPORT_PREFIX = "STARTUP_REPORT "
+
+
+def run_once(timeout: float) -> dict:
+    """Un arranque completo: informe del launcher + imports + tiempo desde el spawn"""
+    spawned = time.time()
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", str(MAIN), "--startup-report"],
+        capture_output=True, text=True, timeout=timeout, check=False,
+        cwd=MAIN.parent, stdin=subprocess.DEVNULL
+    )
+    report = None
+    for line in output.stdout.splitlines():
+        if line.startswith(REPORT_PREFIX):
+            report = json.loads(line[len(REPORT_PREFIX):])
+    if report is None:
+        errors = [line for line in output.stderr.splitlines() if not line.startswith("import time:")]
+        return {'error': errors[-1:] or [f"código de salida {output.returncode}"]}
+    # Incluye el arranque del intérprete, que main.py no puede medir
+    report['spawn_to_start_ms'] = round((report['started_wall'] - spawned) * 1000, 1)
+    report['imports'] = slowest_imports(output.stderr, top=10)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de arranque del launcher")
+    parser.add_argument("--runs", type=int, default=3, help="Arranques a medir (se toma la mediana)")
+    parser.add_argument("--budget", type=float, default=FIRST_PAINT_BUDGET_MS,
+                        help="Presupuesto del primer pintado (ms)")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--json", action="store_true", help="Imprimir los resultados como JSON")
+    args = parser.parse_args()
+
+    if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+        print("No hay display: ejecutar con xvfb-run -a python tools/startup_report.py")
+        return 1
+
+    runs = [run_once(args.timeout) for _ in range(args.runs)]
+    failed = [run for run in runs if 'error' in run]
+    runs = [run for run in runs if 'error' not in run]
+    if not runs:
+        print(f"El launcher no terminó de arrancar: {' '.join(failed[0]['error'])}")
+        return 1
+
+    phases = {phase: statistics.median(run['phases_ms'][phase] for run in runs)
+              for phase, _ in STARTUP_PHASES if all(phase in run['phases_ms'] for run in runs)}
+    first_paint = phases.get('first_paint')
+    over = first_paint is None or first_paint > args.budget
+    if args.json:
+        print(json.dumps({'runs': runs, 'median_ms': phases, 'budget_ms': args.budget,
+                          'over_budget': over}, indent=2))
+        return 1 if over else 0
+
+    spawn = statistics.median(run['spawn_to_start_ms'] for run in runs)
+    print(f"Mediana de {len(runs)} arranque(s) (ms desde el inicio de main.py):")
+    print(f"  (arranque del intérprete antes de main.py: {spawn:.1f} ms)")
+    for phase, label in STARTUP_PHASES:
+        if phase in phases:
+            print(f"  {label:<16} {phases[phase]:>8.1f}")
+    print("\nPaquetes más lentos de importar (último arranque):")
+    for module, ms in runs[-1]['imports']:
+        print(f"  {module:<40} {ms:>8.1f} ms")
+    if failed:
+        print(f"\n{len(failed)} arranque(s) fallaron")
+    verdict = "EXCEDIDO" if over else "ok"
+    print(f"\nPrimer pintado: {first_paint} ms, presupuesto {args.budget:.0f} ms: {verdict}")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())